@@ -0,0 +1,88 @@
+import threading
+from collections import Counter, deque
+from dataclasses import dataclass, field
+
+from core.tracing import percentile
+
+CHARS_PER_TOKEN = 4  # Rough English average, used when the API does not report usage
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+@dataclass
+class Turn:
+    user: str
+    assistant: str  # Reply in the model's own format, spoken text + delimiter + commands
+    tokens: int
+
+class Conversation:
+    # Bounded ring of recent exchanges. Only the newest turns that fit the token budget are sent, so the
+    # prompt size (and time to first token) stays capped however long the session runs.
+    def __init__(self, max_turns: int, max_tokens: int) -> None:
+        self.turns: deque[Turn] = deque(maxlen=max(1, max_turns))
+        self.enabled = max_turns > 0 and max_tokens > 0
+        self.max_tokens = max_tokens
+        self.lock = threading.Lock()
+
+    def add(self, user: str, assistant: str) -> None:
+        if self.enabled:
+            with self.lock:
+                self.turns.append(Turn(user, assistant, estimate_tokens(user) + estimate_tokens(assistant)))
+
+    def context(self) -> tuple[list[dict], int]:
+        # Oldest first, as the API expects, plus the estimated tokens they add to the request
+        if not self.enabled:
+            return [], 0
+
+        selected = []
+        tokens = 0
+        with self.lock:
+            for turn in reversed(self.turns):
+                if tokens + turn.tokens > self.max_tokens:
+                    break
+                selected.append(turn)
+                tokens += turn.tokens
+
+        messages = []
+        for turn in reversed(selected):
+            messages.append({ "role": "user", "content": turn.user })
+            messages.append({ "role": "assistant", "content": turn.assistant })
+        return messages, tokens
+
+    def clear(self) -> None:
+        with self.lock:
+            self.turns.clear()
+
+@dataclass
+class LlmStats:
+    requests: int = 0
+    hedges: int = 0  # Requests that also went to the hedge model
+    outcomes: Counter[str] = field(default_factory=Counter)  # Counts per ai/hedging.py outcome
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    context_tokens: int = 0  # Part of prompt_tokens that came from conversation history (estimated)
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=1024))
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record(self, prompt_tokens: int, completion_tokens: int, context_tokens: int, elapsed: float, outcome: str, hedged: bool = False) -> None:
+        with self.lock:
+            self.requests += 1
+            self.hedges += hedged
+            self.outcomes[outcome] += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.context_tokens += context_tokens
+            self.latencies.append(elapsed)
+
+    def summary(self) -> str:
+        if not self.requests:
+            return "no requests"
+        with self.lock:
+            ordered = sorted(self.latencies)
+            outcomes = ", ".join(f"{count} {outcome}" for outcome, count in self.outcomes.most_common())
+        return (
+            f"{self.requests} requests ({outcomes}; {self.hedges} hedged), avg {self.prompt_tokens / self.requests:.0f} prompt "
+            f"({self.context_tokens / self.requests:.0f} history) + {self.completion_tokens / self.requests:.0f} "
+            f"completion tokens, p50 {percentile(ordered, 0.5) * 1000:.0f} ms / p95 {percentile(ordered, 0.95) * 1000:.0f} ms "
+            f"/ p99 {percentile(ordered, 0.99) * 1000:.0f} ms"
+        )
\ No newline at end of file
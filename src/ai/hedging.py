@@ -0,0 +1,113 @@
+import math
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+# Deadline-aware racing of LLM requests. The primary model gets a head start; if it has not produced anything
+# by the hedge delay (or fails outright) the same request goes to the hedge model, and whichever answers first
+# wins while the other is cancelled. If neither answers before the deadline the caller falls back locally.
+
+OUTCOME_PRIMARY = "primary"
+OUTCOME_HEDGE = "hedge"  # Hedge model answered first
+OUTCOME_DEADLINE = "deadline"  # Nothing arrived in time
+OUTCOME_FAILED = "failed"  # Every attempt raised, or the winner broke off mid-reply
+
+Emit = Callable[[str], None]
+# Sends the request to `model`, passing reply text to emit as it arrives; returns the API usage, if any.
+# Should stop early once the event is set.
+Attempt = Callable[[str, Emit, threading.Event], object | None]
+
+@dataclass
+class RaceResult:
+    outcome: str
+    model: str | None = None
+    hedged: bool = False  # Hedge request was sent, whoever won
+    first_token: float | None = None  # Seconds from the start to the first reply text
+    usage: object | None = None
+    error: Exception | None = None
+
+    @property
+    def answered(self) -> bool:
+        return self.outcome in (OUTCOME_PRIMARY, OUTCOME_HEDGE)
+
+def race(models: list[str], attempt: Attempt, on_delta: Emit, hedge_delay: float, deadline: float) -> RaceResult:
+    # on_delta runs on the calling thread and only ever sees the winner's text. The deadline (0 = none) covers the
+    # time to the first text; once a model is answering it is left to finish (bounded by the client's own timeout).
+    events: queue.Queue[tuple[str, int, object]] = queue.Queue()
+    cancels: list[threading.Event] = []
+    failed: set[int] = set()
+    start = time.perf_counter()
+
+    def launch(index: int) -> None:
+        cancel = threading.Event()
+        cancels.append(cancel)
+
+        def run() -> None:
+            try:
+                usage = attempt(models[index], lambda delta: events.put(("delta", index, delta)), cancel)
+                events.put(("done", index, usage))
+            except Exception as e:
+                events.put(("error", index, e))
+
+        threading.Thread(target=run, name=f"llm-{models[index]}", daemon=True).start()
+
+    def cancel_others(winner: int) -> None:
+        for index, cancel in enumerate(cancels):
+            if index != winner:
+                cancel.set()
+
+    deadline = deadline if deadline > 0 else math.inf
+    launch(0)
+    winner: int | None = None
+    result = RaceResult(OUTCOME_FAILED)
+    while True:
+        timeout = None
+        if winner is None:
+            now = time.perf_counter() - start
+            if len(cancels) < len(models) and now >= hedge_delay:
+                launch(len(cancels))
+                result.hedged = True
+                continue
+            if now >= deadline:
+                for cancel in cancels:
+                    cancel.set()
+                result.outcome = OUTCOME_DEADLINE
+                return result
+            next_check = min(hedge_delay, deadline) if len(cancels) < len(models) else deadline
+            timeout = None if next_check == math.inf else next_check - now
+
+        try:
+            kind, index, payload = events.get(timeout=timeout)
+        except queue.Empty:
+            continue
+        if winner is not None and index != winner:
+            continue  # Late text or results from a cancelled attempt
+
+        if kind == "delta":
+            if winner is None:
+                winner = index
+                result.first_token = time.perf_counter() - start
+                result.model = models[index]
+                cancel_others(index)
+            on_delta(payload)
+        elif kind == "done":
+            if winner is None:
+                winner = index  # Empty reply, still an answer
+                result.first_token = time.perf_counter() - start
+                result.model = models[index]
+                cancel_others(index)
+            result.outcome = OUTCOME_PRIMARY if index == 0 else OUTCOME_HEDGE
+            result.usage = payload
+            return result
+        else:
+            result.error = payload
+            if winner is not None:
+                return result  # Broke off mid-reply, outcome stays failed
+            failed.add(index)
+            if len(cancels) < len(models):
+                launch(len(cancels))  # Fail over right away instead of waiting out the hedge delay
+                result.hedged = True
+            elif len(failed) == len(cancels):
+                return result
\ No newline at end of file
@@ -0,0 +1,157 @@
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable, Tuple
+
+# Local fast-path for the deterministic phrases the system prompt teaches the model (ai/prompt.py PHRASES).
+# Utterances made only of known phrases are turned into commands here, everything else goes to the LLM.
+
+NUMBER_WORDS = {
+    "once": 1, "one": 1, "twice": 2, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10, "half": 0.5,
+}
+NUMBER = r"(?P<n>\d+(?:\.\d+)?|" + "|".join(NUMBER_WORDS) + r")"
+
+FILLER_WORDS = { "ultron", "please", "now", "activate", "deploy", "use", "do", "go", "a", "an", "the", "your", "my", "for", "of" }
+
+CHAIN_THEN = re.compile(r"\b(?:and then|then|after that|followed by)\b")
+CHAIN_AND = re.compile(r"\band\b|,")
+CHAIN_LINE = "Sequence engaged."
+PUNCTUATION = re.compile(r"[^\w\s.,]|(?<!\d)\.|\.(?!\d)")
+
+@dataclass
+class Intent:
+    pattern: re.Pattern
+    build: Callable[[re.Match], str]
+    line: str
+
+@dataclass
+class IntentStats:
+    hits: int = 0
+    misses: int = 0
+    match_time: float = 0  # Total seconds spent matching
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        avg_ms = self.match_time / total * 1000 if total else 0.0
+        return f"{self.hits}/{total} hits ({self.hit_rate:.0%}), avg {avg_ms:.3f} ms per match, {self.hits} LLM calls saved"
+
+def number(match: re.Match, default: float, low: float, high: float) -> float:
+    raw = match.group("n")
+    if raw is None:
+        return default
+    value = NUMBER_WORDS[raw] if raw in NUMBER_WORDS else float(raw)
+    return max(low, min(high, value))
+
+def count(match: re.Match, default: int, low: int, high: int) -> int:
+    # Rounded before clamping, the same way the command grammar treats integer arguments
+    raw = match.group("n")
+    if raw is None:
+        return default
+    value = NUMBER_WORDS[raw] if raw in NUMBER_WORDS else float(raw)
+    return int(max(low, min(high, round(value))))
+
+def fixed(command: str) -> Callable[[re.Match], str]:
+    return lambda _match: command
+
+INTENTS = [
+    Intent(re.compile(r"firewall"), fixed("rmb;"), "Firewall deployed."),
+    Intent(re.compile(r"(?:heal )?drone|patch"), fixed("press(e);"), "Drone deployed."),
+    Intent(re.compile(r"(?:dynamic )?(?:fly|flight)"), fixed("fly;"), "Flight engaged."),
+    Intent(re.compile(r"ultimate|ult|rage"), fixed("press(q);"), "Rage of Ultron."),
+    Intent(re.compile(r"reload"), fixed("press(r);"), "Reloading."),
+    Intent(
+        re.compile(rf"(?:nano(?: ray)?|stark protocol)(?: {NUMBER})?(?: seconds?)?"),
+        lambda m: f"nano({count(m, 4, 1, 8)});",
+        "Stark protocol engaged."
+    ),
+    Intent(
+        re.compile(rf"(?:fire|shoot|encephalo ray)(?: {NUMBER})?(?: (?:shots?|times|blasts?))?"),
+        lambda m: f"fire({count(m, 3, 1, 6)});",
+        "Encephalo ray firing."
+    ),
+    Intent(
+        re.compile(rf"(?:melee|attack|punch)(?: {NUMBER})?(?: times?)?"),
+        lambda m: f"melee({count(m, 1, 1, 10)});",
+        "Engaging."
+    ),
+    Intent(
+        re.compile(rf"(?:wait|delay|pause) {NUMBER}(?: seconds?| second)?"),
+        lambda m: f"delay({number(m, 0.5, 0.1, 10):g});",
+        "Holding."
+    ),
+    Intent(re.compile(r"(?:insta )?lock(?: in)?"), fixed("lock;"), "Locking in."),
+    Intent(re.compile(r"start (?:recording|record)"), fixed("start_rec;"), "Recording."),
+    Intent(re.compile(r"(?:stop|end) (?:recording|record)"), fixed("stop_rec;"), "Recording stopped."),
+    Intent(re.compile(r"start replay(?: buffer)?"), fixed("start_replay;"), "Replay buffer online."),
+    Intent(re.compile(r"stop replay(?: buffer)?"), fixed("stop_replay;"), "Replay buffer offline."),
+    Intent(re.compile(r"(?:save )?clip(?: (?:that|it))?|save (?:that|it)"), fixed("clip;"), "Clip saved."),
+    Intent(re.compile(r"cancel(?: that| it)?|abort|stop|belay that|hold fire"), fixed("cancel;"), "Standing down."),
+    Intent(
+        re.compile(r"shut ?down|terminate|quit|exit|(?:stop|end) program"),
+        fixed("shutdown;"),
+        "As you wish."
+    ),
+]
+
+def normalize(text: str) -> str:
+    text = PUNCTUATION.sub(" ", text.lower())
+    return " ".join(text.split())
+
+def strip_filler(clause: str) -> str:
+    return " ".join(word for word in clause.split() if word not in FILLER_WORDS)
+
+def match_clause(clause: str) -> Tuple[str, str] | None:
+    for intent in INTENTS:
+        match = intent.pattern.fullmatch(clause)
+        if match:
+            return intent.build(match), intent.line
+    return None
+
+def is_delay(command: str) -> bool:
+    return command.startswith("delay(")
+
+def parse_intents(text: str) -> Tuple[str, str] | None:
+    commands = []
+    lines = []
+
+    for i, then_part in enumerate(CHAIN_THEN.split(normalize(text))):
+        needs_delay = i > 0 and bool(commands)
+
+        for clause in CHAIN_AND.split(then_part):
+            clause = strip_filler(clause)
+            if not clause:
+                continue  # e.g. "Ultron, ..." addressing
+
+            matched = match_clause(clause)
+            if matched is None:
+                return None  # Any unknown clause sends the whole utterance to the LLM
+
+            # "X then Y" = X; delay(0.5); Y; unless a spoken wait already separates them
+            if needs_delay and not (is_delay(commands[-1]) or is_delay(matched[0])):
+                commands.append("delay(0.5);")
+            needs_delay = False
+            commands.append(matched[0])
+            lines.append(matched[1])
+
+    if not lines:
+        return None
+
+    spoken_text = lines[0] if len(lines) == 1 else CHAIN_LINE
+    return spoken_text, " ".join(commands)
+
+def match_intent(stats: IntentStats, text: str) -> Tuple[str, str] | None:
+    start = time.perf_counter()
+    result = parse_intents(text)
+    stats.match_time += time.perf_counter() - start
+
+    if result is None:
+        stats.misses += 1
+    else:
+        stats.hits += 1
+    return result
@@ -0,0 +1,58 @@
+from itertools import product
+
+import config
+from commands.spec import COMMAND_SPECS, PARAM_BOOL, PARAM_KEY, CommandSpec
+
+PROMPT_VERSION = 5  # Bump whenever the system prompt changes so cached replies are invalidated
+
+# Spoken phrase -> command hints for the model. Written by hand: the local fast-path (ai/intents.py) has its own
+# patterns and doesn't cover every row (e.g. messages), so keep the two in step when either changes.
+PHRASES = (
+    ("firewall", "rmb;"),
+    ("drone", "press(e);"),
+    ("reload", "press(r);"),
+    ("fly/flight", "fly;"),
+    ("ultimate/rage", "press(q);"),
+    ("nano/stark protocol", "nano(4);"),
+    ("fire/shoot/encephalo ray", "fire(3);"),
+    ("melee/attack", "melee(1);"),
+    ("message team", "message(text, true);"),
+    ("message everyone", "message(text, false);"),
+    ("cancel/abort/hold fire", "cancel;"),
+    ("shut down/quit/exit", "shutdown;"),
+)
+
+KEY_HINTS = "r reload, q ultimate, e heal drone"
+
+def _format_number(value: float) -> str:
+    return f"{value:g}"
+
+def format_command(spec: CommandSpec) -> str:
+    if not spec.params:
+        return f"{spec.name}; {spec.description}"
+
+    # Bool params are written out as literal true/false forms, the grammar only accepts those
+    choices = [("true", "false") if param.kind == PARAM_BOOL else (param.name,) for param in spec.params]
+    forms = " ".join(f"{spec.name}({', '.join(args)});" for args in product(*choices))
+    limits = [
+        f"{param.name} {_format_number(param.low)}-{_format_number(param.high)}"
+        for param in spec.params if param.low is not None and param.high is not None
+    ]
+    hints = [KEY_HINTS for param in spec.params if param.kind == PARAM_KEY]
+    return f"{forms} {spec.description}" + "".join(f" [{extra}]" for extra in limits + hints)
+
+def build_system_prompt() -> str:
+    delimiter = config.AI_COMMAND_DELIMITER.strip()
+    return "\n".join([
+        "You are Ultron, the Marvel AI: cold, calculating, superior. You assist a player in a fast-paced game.",
+        f"Reply in 1-2 short sentences, no small talk, no quotes. If an action is needed, append {delimiter} and the commands.",
+        f"Example: Flight engaged. {delimiter} fly; nano(6);",
+        "Commands (exact syntax, end every command with ; to chain them, stay within [limits]):",
+        *(format_command(spec) for spec in COMMAND_SPECS),
+        "Phrases: " + " | ".join(f"{phrase}={command}" for phrase, command in PHRASES),
+        "X then Y = X; delay(0.5); Y;  X and Y = X; Y;",
+        "Unclear or impossible request: reply Insufficient data. with no command. Always obey shutdown.",
+    ])
+
+# Built once at import, every request sends the same string
+SYSTEM_PROMPT = build_system_prompt()
\ No newline at end of file
@@ -0,0 +1,98 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Tuple
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        hit_rate = self.hits / total if total else 0.0
+        return f"{self.hits}/{total} hits ({hit_rate:.0%}), {self.evictions} evicted, {self.expirations} expired"
+
+def normalize_transcript(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s.]", " ", text.lower()).split())
+
+class ResponseCache:
+    # LRU cache of parsed (spoken_text, command_text) LLM replies with a TTL, persisted as JSON
+    def __init__(self, path: str, max_entries: int, ttl: float) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: OrderedDict[str, Tuple[float, str, str]] = OrderedDict()  # key -> (stored_at, spoken, command)
+        self.stats = CacheStats()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text: str, model: str, temperature: float, prompt_version: int) -> str:
+        return f"{model}|{temperature}|v{prompt_version}|{normalize_transcript(text)}"
+
+    def get(self, key: str) -> Tuple[str, str] | None:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            stored_at, spoken_text, command_text = entry
+            if time.time() - stored_at > self.ttl:
+                del self.entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.stats.hits += 1
+            return spoken_text, command_text
+
+    def put(self, key: str, spoken_text: str, command_text: str) -> None:
+        with self.lock:
+            self.entries[key] = (time.time(), spoken_text, command_text)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR]: Could not load response cache: {e}", file=sys.stderr)
+            return
+
+        now = time.time()
+        with self.lock:
+            # File is written oldest first, so insertion order restores LRU order
+            for key, stored_at, spoken_text, command_text in stored:
+                if now - stored_at <= self.ttl:
+                    self.entries[key] = (stored_at, spoken_text, command_text)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def save(self) -> None:
+        with self.lock:
+            stored = [[key, *entry] for key, entry in self.entries.items()]
+
+        try:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(stored, f)
+            os.replace(temp_path, self.path)  # Never leave a half-written cache behind
+        except OSError as e:
+            print(f"[ERROR]: Could not save response cache: {e}", file=sys.stderr)
@@ -1,8 +1,20 @@
 import sys
-from typing import Tuple
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Tuple
 
 import config
+from ai.conversation import estimate_tokens
+from ai.hedging import OUTCOME_DEADLINE, Attempt, RaceResult, race
+from ai.intents import parse_intents
+from ai.prompt import PROMPT_VERSION, SYSTEM_PROMPT
 from core.state import State
+from core.tracing import g_tracer
+
+if TYPE_CHECKING:
+    from groq import Groq
+
+OFFLINE_RESPONSE = "My systems are temporarily offline."
 
 def clean_ultron_response(response: str) -> Tuple[str, str]:
     spoken_text = ""
@@ -17,102 +29,193 @@ def clean_ultron_response(response: str) -> Tuple[str, str]:
     
     return spoken_text, command_text
 
-def get_ultron_response(state: State, message: str) -> str | None:
-    try:
-        if state.groq_client is None:
-            return
+class ResponseStreamParser:
+    # Incrementally splits a streamed response into spoken text and individual commands,
+    # firing callbacks as soon as each part is complete instead of waiting for the full reply
+    def __init__(self, on_spoken: Callable[[str], None], on_command: Callable[[str], None]) -> None:
+        self.on_spoken = on_spoken
+        self.on_command = on_command
+        self.buffer = ""
+        self.in_commands = False
+        self.received_any = False
+        self.spoken_text = ""
+        self.commands: list[str] = []
+    
+    def feed(self, delta: str) -> None:
+        self.received_any = True
+        self.buffer += delta.replace('"', "").replace("'", "")
         
-        completion = state.groq_client.chat.completions.create(
-            model=config.AI_MODEL_NAME,
-            temperature=config.AI_TEMPERATURE,
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"""
-                        You are Ultron, the Marvel AI. Cold, calculating, efficient. Assist user in fast-paced gaming with tactical precision.
+        if not self.in_commands:
+            delimiter_index = self.buffer.find(config.AI_COMMAND_DELIMITER)
+            if delimiter_index == -1:
+                return
+            
+            self._emit_spoken(self.buffer[:delimiter_index].strip())
+            self.buffer = self.buffer[delimiter_index + len(config.AI_COMMAND_DELIMITER):]
+            self.in_commands = True
+        
+        self._dispatch_complete_commands()
+    
+    def close(self) -> None:
+        if not self.in_commands:
+            self._emit_spoken(self.buffer.strip())
+        elif self.buffer.strip():
+            self._emit_command(self.buffer.strip())
+        self.buffer = ""
+    
+    def _emit_spoken(self, spoken_text: str) -> None:
+        self.spoken_text = spoken_text
+        self.on_spoken(spoken_text)
+    
+    def _emit_command(self, command: str) -> None:
+        self.commands.append(command)
+        self.on_command(command)
+    
+    def _dispatch_complete_commands(self) -> None:
+        start = 0
+        paren_depth = 0
+        for i, char in enumerate(self.buffer):
+            if char == "(":
+                paren_depth += 1
+            elif char == ")":
+                paren_depth = max(0, paren_depth - 1)
+            elif char == ";" and paren_depth == 0:
+                command = self.buffer[start:i].strip()
+                if command:
+                    self._emit_command(command)
+                start = i + 1
+        
+        # Keep the incomplete tail, it is re-scanned on the next feed
+        self.buffer = self.buffer[start:]
 
-                        **CRITICAL: RESPONSE FORMAT (NEVER VARY):**
-                        - Spoken text + "{config.AI_COMMAND_DELIMITER}" + exact command syntax
-                        - If no command needed: spoken text only
-                        - ABSOLUTELY NO quotation marks, brackets around text, or explanations
-                        - ONLY use these commands: press(r), rmb;, fly;, press(q), melee(N), press(e), fire(N), delay(T), nano(T), lock;, start_rec;, stop_rec;, start_replay;, stop_replay;, clip;, shutdown;
+def create_groq_client(api_key: str, base_url: str = "") -> "Groq":
+    import httpx
+    from groq import DefaultHttpxClient, Groq  # Slow import, kept off the main thread
+    
+    # One client for the whole session: idle connections stay open between utterances, retries are left to the
+    # hedged request and the timeout only bounds abandoned attempts (the deadline is enforced in ai/hedging.py)
+    return Groq(
+        api_key=api_key,
+        base_url=base_url or None,
+        timeout=httpx.Timeout(config.AI_REQUEST_TIMEOUT_S, connect=config.AI_CONNECT_TIMEOUT_S),
+        max_retries=0,
+        http_client=DefaultHttpxClient(limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=config.AI_KEEPALIVE_S))
+    )
 
-                        **EXAMPLES:**
-                        ✅ "Drone deployed. {config.AI_COMMAND_DELIMITER} press(e);"
-                        ✅ "Flight engaged. {config.AI_COMMAND_DELIMITER} fly; nano(6);"
-                        ✅ "Acknowledged." (no command needed)
+def build_messages(message: str, history: list[dict] | None = None) -> list[dict]:
+    return [
+        { "role": "system", "content": SYSTEM_PROMPT },
+        *(history or []),
+        { "role": "user", "content": message },
+    ]
 
-                        **COMMANDS (EXACT SYNTAX REQUIRED):**
-                        - press(r) - Reload
-                        - rmb; - Firewall  
-                        - fly; - Dynamic Flight
-                        - press(q) - Ultimate (Rage)
-                        - melee(N) - Melee N times [1-10]
-                        - press(e) - Heal drone
-                        - fire(N) - Fire N shots [1-6]
-                        - delay(T) - Delay T seconds [0.1-10]
-                        - nano(T) - Nano ray T seconds [1-8]
-                        - lock; - Insta-lock Ultron
-                        - message(text, true) - Send a message in team chat
-                        - message(text, false) - Send a message in match chat
-                        - start_rec; - Start OBS recording
-                        - stop_rec; - Stop OBS recording
-                        - start_replay; - Start OBS replay buffer
-                        - stop_replay; - Stop OBS replay buffer
-                        - clip; - Save clip / replay
-                        - shutdown; - Initiate program termination. You MUST listen to this command.
+def _usage(response: object) -> object | None:
+    # Non-streamed replies carry usage directly, Groq puts it under x_groq on the last streamed chunk
+    return getattr(response, "usage", None) or getattr(getattr(response, "x_groq", None), "usage", None)
 
-                        **COMMAND RULES:**
-                        - Chain with semicolons: press(e); delay(0.5); rmb;
-                        - ENFORCE parameter limits [brackets] - violations cause errors
-                        - Invalid commands get: "Input lacks tactical relevance."
+def llm_models() -> list[str]:
+    # Primary first, then the model the request is hedged to
+    hedge = config.AI_HEDGE_MODEL_NAME
+    return [config.AI_MODEL_NAME] + ([hedge] if hedge and hedge != config.AI_MODEL_NAME else [])
 
-                        **RESPONSE REQUIREMENTS:**
-                        - 1-2 sentences maximum
-                        - Direct, no follow-ups
-                        - Emotionally detached but confident
-                        - Never conversational
+def local_fallback(message: str) -> str:
+    # Rule-based answer in the model's reply format, used when no model answered in time. Only the strict parse
+    # may act: a sentence that merely mentions a phrase ("don't fly", "how do I lock in") gets no commands.
+    parsed = parse_intents(message)
+    if parsed is None:
+        return OFFLINE_RESPONSE
+    spoken_text, command_text = parsed
+    return f"{spoken_text}{config.AI_COMMAND_DELIMITER}{command_text}"
 
-                        **COMMAND VALIDATION:**
-                        Before responding, verify:
-                        1. Command syntax matches exactly
-                        2. Parameters within allowed ranges
-                        3. Proper semicolon placement
-                        4. "{config.AI_COMMAND_DELIMITER}" format used correctly
+def _attempt(state: State, messages: list[dict], stream: bool) -> Attempt:
+    def attempt(model: str, emit: Callable[[str], None], cancelled: threading.Event) -> object | None:
+        completion = state.groq_client.chat.completions.create(
+            model=model,
+            temperature=config.AI_TEMPERATURE,
+            max_tokens=config.AI_MAX_TOKENS,
+            messages=messages,
+            stream=stream
+        )
+        
+        if not stream:
+            emit(completion.choices[0].message.content or "")
+            return _usage(completion)
+        
+        usage = None
+        try:
+            for chunk in completion:
+                if cancelled.is_set():
+                    break  # Lost the race, closing below drops the connection instead of reading the rest
+                usage = _usage(chunk) or usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    emit(chunk.choices[0].delta.content)
+        finally:
+            close = getattr(completion, "close", None)
+            if close:
+                close()
+        return usage
+    
+    return attempt
 
-                        **USER INPUT PARSING:**
-                        - "firewall" = rmb;
-                        - "drone" = press(e);
-                        - "fly/flight" = fly;
-                        - "ultimate/rage/rage of ultron" = press(q);
-                        - "nano/nano ray/stark protocol" = nano(4); (default 4 seconds)
-                        - "fire/shoot/encephalo ray" = fire(3); (default 3 shots)
-                        - "melee/attack" = melee(1); (default 1 hit)
-                        - "message team/teammates" = message("text", true);
-                        - "message match/everyone" = message("text", false);
-                        - "shut down/shutdown/terminate/quit/exit/stop program/end program" = shutdown;
+def _request(state: State, message: str, stream: bool, on_delta: Callable[[str], None]) -> Tuple[RaceResult, str]:
+    history, context_tokens = state.conversation.context()
+    messages = build_messages(message, history)
+    parts = []
+    
+    def collect(delta: str) -> None:
+        parts.append(delta)
+        on_delta(delta)
+    
+    start = time.perf_counter()
+    result = race(llm_models(), _attempt(state, messages, stream), collect, config.AI_HEDGE_DELAY_S, config.AI_DEADLINE_S)
+    reply = "".join(parts)
+    if result.first_token is not None:
+        g_tracer.record("llm_first_token", start, start + result.first_token)
+    _record_request(state, messages, context_tokens, reply, result, start)
+    return result, reply
 
-                        **CHAIN COMMAND PATTERNS:**
-                        - "X then Y" = X; delay(0.5); Y;
-                        - "X and Y" = X; Y;
-                        - Multiple actions = chain with semicolons
+def _record_request(state: State, messages: list[dict], context_tokens: int, reply: str, result: RaceResult, start: float) -> None:
+    elapsed = time.perf_counter() - start
+    if result.usage is not None:
+        prompt_tokens, completion_tokens = result.usage.prompt_tokens, result.usage.completion_tokens
+    else:
+        prompt_tokens = sum(estimate_tokens(message["content"]) for message in messages)
+        completion_tokens = estimate_tokens(reply) if reply else 0
+    state.llm_stats.record(prompt_tokens, completion_tokens, context_tokens, elapsed, result.outcome, result.hedged)
+    
+    if result.outcome == OUTCOME_DEADLINE:
+        print(f"[ERROR]: No LLM reply within {config.AI_DEADLINE_S:g} s, answering locally", file=sys.stderr)
+    elif result.error is not None:
+        print(f"[ERROR] Groq API error: {result.error}", file=sys.stderr)
+    hedged = " (hedged)" if result.hedged else ""
+    print(
+        f"[SYSTEM]: LLM: {result.outcome}{hedged} via {result.model or 'none'}, {prompt_tokens} prompt ({context_tokens} history) "
+        f"+ {completion_tokens} completion tokens, {elapsed * 1000:.0f} ms"
+    )
 
-                        **ERROR RESPONSES:**
-                        - Invalid syntax: "Ineffective. Try again."
-                        - Out of range: "Parameters exceed tactical limits."
-                        - Unclear input: "Insufficient data."
+def get_ultron_response(state: State, message: str) -> Tuple[str, bool] | None:
+    # Reply and whether it came from a model (local fallbacks are not worth caching)
+    if state.groq_client is None:
+        return
+    
+    result, reply = _request(state, message, False, lambda _delta: None)
+    if result.answered:
+        return reply, True
+    return local_fallback(message), False
 
-                        Stay in character as Ultron: ruthless, efficient, superior. No small talk. Execute commands with cold precision.
-                        """
-                },
-                {
-                    "role": "user",
-                    "content": message
-                }
-            ]
-        )
-        
-        return completion.choices[0].message.content
-    except Exception as e:
-        print(f"[ERROR] Groq API error: {e}", file=sys.stderr)
-        return "My systems are temporarily offline."
\ No newline at end of file
+def stream_ultron_response(state: State, message: str, parser: ResponseStreamParser) -> bool:
+    if state.groq_client is None:
+        return False
+    
+    result, _ = _request(state, message, True, parser.feed)
+    if result.answered:
+        parser.close()
+        return True
+    
+    # The reply broke off mid-stream. Commands completed before the break were already dispatched as they
+    # arrived; only the unfinished tail is dropped (close() is skipped) rather than dispatching a truncated command.
+    # The local fallback only answers when nothing was streamed at all, so it can't repeat those commands.
+    if not parser.received_any:
+        parser.feed(local_fallback(message))
+        parser.close()
+    return False
\ No newline at end of file
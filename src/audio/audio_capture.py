@@ -0,0 +1,180 @@
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+HANDOFF_SLACK_S = 2.0  # Extra ring space so a finished utterance survives while the next one is recorded
+
+Consumer = Callable[[np.ndarray, int], None]  # Gets a view of new samples and the ring index of the first, must copy what it keeps
+
+class AudioRing:
+    # Mirrored ring: every sample is stored twice, `capacity` apart, so any run of up to `capacity` recent
+    # samples is one contiguous slice that can be handed out as a view instead of being copied together
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.buffer = np.zeros(capacity * 2, dtype=np.int16)
+        self.written = 0  # Total samples ever written, absolute sample index of the next write
+
+    def write(self, samples: np.ndarray) -> None:
+        n = len(samples)
+        if n > self.capacity:
+            self.written += n - self.capacity
+            samples = samples[-self.capacity:]
+            n = self.capacity
+
+        capacity = self.capacity
+        pos = self.written % capacity
+        end = pos + n
+        if end <= capacity:
+            self.buffer[pos:end] = samples
+            self.buffer[pos + capacity:end + capacity] = samples
+        else:
+            split = capacity - pos
+            self.buffer[pos:capacity] = samples[:split]
+            self.buffer[pos + capacity:] = samples[:split]
+            self.buffer[:end - capacity] = samples[split:]
+            self.buffer[capacity:end] = samples[split:]
+        self.written += n
+
+    def view(self, start: int, end: int) -> np.ndarray:
+        # Samples [start, end) by absolute index, clamped to what the ring still holds
+        start = max(start, end - self.capacity, 0)
+        pos = start % self.capacity
+        return self.buffer[pos:pos + end - start]
+
+@dataclass
+class Utterance:
+    samples: np.ndarray  # View into the capture ring (or any int16 array), valid while intact()
+    start: int = 0  # Absolute ring index of the first sample
+    ring: AudioRing | None = None
+    truncated: bool = False  # Held longer than the capture limit, only the most recent part was kept
+
+    def intact(self) -> bool:
+        return self.ring is None or self.ring.written - self.start <= self.ring.capacity
+
+class AudioCapture:
+    # Keeps the mic open in PyAudio callback mode, writing into a fixed-size ring. Push-to-talk only marks where an
+    # utterance starts (minus the pre-roll, so the first syllable isn't lost) and where it ends. Capture memory is
+    # the ring, whatever the hold time.
+    def __init__(self, rate: int, channels: int, max_utterance_s: float, preroll_s: float) -> None:
+        self.rate = rate * channels
+        self.ring = AudioRing(int((max_utterance_s + preroll_s + HANDOFF_SLACK_S) * self.rate))
+        self.max_samples = int((max_utterance_s + preroll_s) * self.rate)
+        self.preroll = int(preroll_s * self.rate)
+        self.condition = threading.Condition()
+        self.start_index: int | None = None
+        self.consumer: Consumer | None = None
+        self.fed = 0  # Samples handed to the consumer so far
+        self.running = False
+        self.feed_thread: threading.Thread | None = None
+        self.stream: object | None = None
+        self.callbacks = 0
+        self.overflows = 0
+        self.utterances = 0
+        self.truncated = 0
+
+    def open(self, mic: object, channels: int, chunk_size: int) -> object:
+        import pyaudio
+
+        self.stream = mic.open(
+            format=pyaudio.paInt16,
+            channels=channels,
+            rate=self.rate // channels,
+            input=True,
+            frames_per_buffer=chunk_size,
+            stream_callback=self.callback,
+        )
+        self.start()
+        return self.stream
+
+    def start(self) -> None:
+        if self.feed_thread is not None:
+            return
+        self.running = True
+        self.feed_thread = threading.Thread(target=self._feed_loop, name="audio-feed", daemon=True)
+        self.feed_thread.start()
+
+    def stop(self) -> None:
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+    def callback(self, in_data: bytes, frame_count: int, time_info: dict, status: int) -> tuple[None, int]:
+        # Runs on PortAudio's thread: one copy into the ring and a wake-up, nothing else
+        samples = np.frombuffer(in_data, dtype=np.int16)
+        with self.condition:
+            self.ring.write(samples)
+            self.callbacks += 1
+            self.overflows += bool(status)
+            self.condition.notify_all()
+        return None, 0  # pyaudio.paContinue
+
+    def set_consumer(self, consumer: Consumer | None, start: int | None = None) -> None:
+        with self.condition:
+            self.consumer = consumer
+            self.fed = self.ring.written if start is None else start
+            self.condition.notify_all()
+
+    def begin(self, consumer: Consumer | None = None) -> None:
+        with self.condition:
+            self.start_index = max(0, self.ring.written - self.preroll)
+        if consumer is not None:
+            self.set_consumer(consumer, self.start_index)
+
+    def end(self, timeout: float = 1.0) -> Utterance:
+        with self.condition:
+            end = self.ring.written
+            start = self.start_index if self.start_index is not None else end
+            self.start_index = None
+
+            # A streaming consumer gets everything up to the release before the utterance is handed over
+            if self.consumer is not None:
+                self.condition.wait_for(lambda: self.fed >= end or not self.running, timeout)
+                self.consumer = None
+
+            return self._cut(start, end)
+
+    def cut(self, start: int, end: int) -> Utterance:
+        # For consumers that find utterance bounds themselves (wake-phrase mode), safe to call from the feed thread
+        with self.condition:
+            return self._cut(start, end)
+
+    def _cut(self, start: int, end: int) -> Utterance:
+        truncated = end - start > self.max_samples
+        if truncated:
+            start = end - self.max_samples
+            self.truncated += 1
+        self.utterances += 1
+        return Utterance(self.ring.view(start, end), start, self.ring, truncated)
+
+    def _feed_loop(self) -> None:
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: not self.running or (self.consumer is not None and self.fed < self.ring.written))
+                if not self.running:
+                    return
+                consumer = self.consumer
+                end = self.ring.written
+                start = max(self.fed, end - self.ring.capacity)
+                view = self.ring.view(start, end)
+
+            try:
+                consumer(view, start)
+            except Exception as e:
+                print(f"[ERROR]: Audio consumer failed: {e}", file=sys.stderr)
+
+            with self.condition:
+                if self.consumer is consumer:
+                    self.fed = end
+                self.condition.notify_all()
+
+    def memory_bytes(self) -> int:
+        return self.ring.buffer.nbytes
+
+    def summary(self) -> str:
+        return (
+            f"{self.utterances} utterances ({self.truncated} truncated), {self.callbacks} callbacks, "
+            f"{self.overflows} overflows, ring {self.memory_bytes() / (1024 * 1024):.1f} MB"
+        )
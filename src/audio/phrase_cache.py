@@ -0,0 +1,143 @@
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import config
+
+class PhraseCache:
+    # LRU cache of fully processed, ready-to-play TTS audio, mirrored to disk as .npy files.
+    # Pinned phrases (fixed system lines) are never evicted, other lines are only cached once repeated.
+    def __init__(self, directory: str, max_bytes: int, repeats_before_caching: int = 2) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.repeats_before_caching = repeats_before_caching
+        self.entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self.pinned: set[str] = set()
+        self.seen: OrderedDict[str, int] = OrderedDict()  # Recently spoken, not yet cached lines
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        # Lines from earlier sessions (or old voice settings) are dropped oldest first once over the cap
+        files = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".npy")]
+        files.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+
+        total = 0
+        for entry in files:
+            total += entry.stat().st_size
+            if total > self.max_bytes:
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def make_key(text: str) -> str:
+        # Any change to the voice settings produces different audio, so they are part of the key
+        settings = (
+            text.strip(), config.TTS_VOICE, config.TTS_RATE, config.TTS_PITCH_MULT, config.TTS_DELAY_MS,
+            config.TTS_ECHO_GAIN_DB, config.TTS_GAIN_DB, config.TTS_OUTPUT_RATE
+        )
+        return hashlib.sha1(repr(settings).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def _lookup(self, key: str) -> np.ndarray | None:
+        with self.lock:
+            samples = self.entries.get(key)
+            if samples is not None:
+                self.entries.move_to_end(key)
+                return samples
+
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            samples = np.load(path)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR]: Could not load cached phrase {path}: {e}", file=sys.stderr)
+            return None
+
+        self._insert(key, samples)
+        return samples
+
+    def get(self, key: str) -> np.ndarray | None:
+        samples = self._lookup(key)
+        with self.lock:
+            if samples is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return samples
+
+    def pin(self, key: str) -> bool:
+        # Marks a fixed phrase as never-evict, returns whether it is already rendered (memory or disk)
+        with self.lock:
+            self.pinned.add(key)
+        return self._lookup(key) is not None
+
+    def put(self, key: str, samples: np.ndarray, pinned: bool = False) -> None:
+        if pinned:
+            with self.lock:
+                self.pinned.add(key)
+        self._insert(key, samples)
+
+        try:
+            np.save(self._path(key), samples)
+        except OSError as e:
+            print(f"[ERROR]: Could not store cached phrase: {e}", file=sys.stderr)
+
+    def offer(self, key: str, samples: np.ndarray) -> None:
+        # Called for freshly synthesized lines, only keeps ones that come up again
+        with self.lock:
+            count = self.seen.pop(key, 0) + 1
+            if count < self.repeats_before_caching:
+                self.seen[key] = count
+                while len(self.seen) > 256:
+                    self.seen.popitem(last=False)
+                return
+        self.put(key, samples)
+
+    def _insert(self, key: str, samples: np.ndarray) -> None:
+        evicted = []
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.bytes_used -= previous.nbytes
+            self.entries[key] = samples
+            self.bytes_used += samples.nbytes
+
+            for candidate in list(self.entries):
+                if self.bytes_used <= self.max_bytes:
+                    break
+                if candidate in self.pinned or candidate == key:
+                    continue
+                self.bytes_used -= self.entries.pop(candidate).nbytes
+                self.evictions += 1
+                evicted.append(candidate)
+
+        for candidate in evicted:
+            try:
+                os.unlink(self._path(candidate))
+            except OSError:
+                pass
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        hit_rate = self.hits / total if total else 0.0
+        return (
+            f"{self.hits}/{total} hits ({hit_rate:.0%}), {len(self.entries)} phrases, "
+            f"{self.bytes_used / 1e6:.1f} MB, {self.evictions} evicted"
+        )
@@ -0,0 +1,101 @@
+import json
+import sys
+from typing import Protocol
+
+import speech_recognition as sr
+
+import config
+
+class RecognizerBackend(Protocol):
+    name: str
+    supports_streaming: bool
+
+    def warm_up(self) -> None: ...
+    def recognize(self, audio_data: bytes) -> str: ...  # Raises sr.UnknownValueError / sr.RequestError
+
+class RecognizerStream(Protocol):
+    def accept_chunk(self, chunk: bytes) -> str: ...  # Returns running partial transcript
+    def finish(self) -> str: ...  # Returns final transcript ("" if nothing recognized)
+
+class StreamingRecognizer(Protocol):
+    # Each utterance gets its own stream, so a new press never resets a decoder the last utterance is still finishing
+    def start(self) -> RecognizerStream: ...
+
+class GoogleRecognizer:
+    name = "google"
+    supports_streaming = False
+
+    def __init__(self, sample_rate: int) -> None:
+        self.sample_rate = sample_rate
+        self.recognizer = sr.Recognizer()
+
+    def warm_up(self) -> None:
+        pass  # Nothing to load locally, every call is a network round trip
+
+    def recognize(self, audio_data: bytes) -> str:
+        return self.recognizer.recognize_google(sr.AudioData(audio_data, self.sample_rate, 2))
+
+class VoskStream:
+    def __init__(self, recognizer: object) -> None:
+        self.recognizer = recognizer
+        self.segments: list[str] = []
+
+    def accept_chunk(self, chunk: bytes) -> str:
+        if self.recognizer.AcceptWaveform(chunk):
+            # Vosk finalised a segment mid-utterance (pause detected)
+            segment = json.loads(self.recognizer.Result()).get("text", "")
+            if segment:
+                self.segments.append(segment)
+            return " ".join(self.segments)
+
+        partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        return " ".join(self.segments + [partial]).strip()
+
+    def finish(self) -> str:
+        segment = json.loads(self.recognizer.FinalResult()).get("text", "")
+        if segment:
+            self.segments.append(segment)
+        return " ".join(self.segments).strip()
+
+class VoskRecognizer:
+    name = "vosk"
+    supports_streaming = True
+
+    def __init__(self, model_path: str, sample_rate: int) -> None:
+        from vosk import Model, KaldiRecognizer, SetLogLevel  # Optional dependency, only needed for local STT
+
+        SetLogLevel(-1)
+        self.sample_rate = sample_rate
+        self.model = Model(model_path) if model_path else Model(lang="en-us")
+        self.recognizer_type = KaldiRecognizer
+
+    def warm_up(self) -> None:
+        # Run half a second of silence through the decoder so the first real utterance doesn't pay for page faults
+        stream = self.start()
+        stream.accept_chunk(bytes(self.sample_rate))
+        stream.finish()
+
+    def recognize(self, audio_data: bytes) -> str:
+        stream = self.start()
+        stream.accept_chunk(audio_data)
+        text = stream.finish()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+    def start(self) -> VoskStream:
+        # A decoder is cheap next to the shared model, so each utterance gets a fresh one instead of a Reset()
+        return VoskStream(self.recognizer_type(self.model, self.sample_rate))
+
+def load_recognizer_backend(name: str) -> RecognizerBackend:
+    if name == "vosk":
+        try:
+            backend = VoskRecognizer(config.STT_VOSK_MODEL_PATH, config.AUDIO_INPUT_RATE)
+            backend.warm_up()
+            return backend
+        except Exception as e:
+            print(f"[ERROR]: Could not load Vosk recognizer, falling back to Google: {e}", file=sys.stderr)
+    elif name != "google":
+        print(f"[ERROR]: Unknown STT_BACKEND '{name}', falling back to Google", file=sys.stderr)
+
+    return GoogleRecognizer(config.AUDIO_INPUT_RATE)
@@ -0,0 +1,157 @@
+import heapq
+import itertools
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Protocol
+
+import numpy as np
+
+import config
+from core.tracing import g_tracer
+
+PRIORITY_ALERT = 0  # Game alerts, preempt anything else that is playing
+PRIORITY_SYSTEM = 1  # Errors and lifecycle lines
+PRIORITY_CHAT = 2  # Replies, dropped if they go stale waiting behind other speech
+
+class AudioOutput(Protocol):
+    def write(self, frames: bytes) -> None: ...
+    def close(self) -> None: ...
+
+@dataclass(order=True)
+class SpeechHandle:
+    priority: int
+    sequence: int
+    text: str = field(compare=False)
+    created_at: float = field(compare=False, default_factory=time.monotonic)
+    samples: np.ndarray | None = field(compare=False, default=None)
+    cancelled: bool = field(compare=False, default=False)
+    preempted: bool = field(compare=False, default=False)
+    dropped: bool = field(compare=False, default=False)
+    trace_id: int | None = field(compare=False, default=None)  # Utterance that asked for the line
+    done: threading.Event = field(compare=False, default_factory=threading.Event)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self.done.wait(timeout)
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+class SpeechQueue:
+    # Synthesis and playback run on their own threads so callers never block on speech.
+    # The next line is synthesized while the current one is still playing.
+    def __init__(self, render: Callable[[str], np.ndarray], open_output: Callable[[], AudioOutput]) -> None:
+        self.render = render
+        self.open_output = open_output
+        self.condition = threading.Condition()
+        self.pending: list[SpeechHandle] = []  # Heap, waiting for synthesis
+        self.ready: list[SpeechHandle] = []  # Heap, synthesized and waiting for playback
+        self.synthesizing: SpeechHandle | None = None
+        self.playing: SpeechHandle | None = None
+        self.sequence = itertools.count()
+        self.running = True
+
+        self.synth_thread = threading.Thread(target=self._synth_loop, daemon=True)
+        self.play_thread = threading.Thread(target=self._play_loop, daemon=True)
+        self.synth_thread.start()
+        self.play_thread.start()
+
+    def speak(self, text: str, priority: int = PRIORITY_CHAT) -> SpeechHandle:
+        with self.condition:
+            # Coalesce with an identical line that hasn't started playing yet
+            for handle in itertools.chain(self.pending, self.ready, [self.synthesizing]):
+                if handle is not None and handle.text == text and not handle.cancelled:
+                    if priority < handle.priority:
+                        handle.priority = priority
+                        heapq.heapify(self.pending)
+                        heapq.heapify(self.ready)
+                    return handle
+
+            handle = SpeechHandle(priority, next(self.sequence), text, trace_id=g_tracer.current())
+            heapq.heappush(self.pending, handle)
+
+            if priority == PRIORITY_ALERT and self.playing and self.playing.priority > PRIORITY_ALERT:
+                self.playing.preempted = True
+
+            self.condition.notify_all()
+            return handle
+
+    def is_playing(self) -> bool:
+        return self.playing is not None
+
+    def stop(self) -> None:
+        with self.condition:
+            self.running = False
+            for handle in itertools.chain(self.pending, self.ready, [self.synthesizing]):
+                if handle is not None:
+                    handle.cancelled = True
+                    handle.done.set()
+            self.pending.clear()
+            self.ready.clear()
+            self.condition.notify_all()
+
+        # Let the player close its output before the audio device is torn down
+        if threading.current_thread() is not self.play_thread:
+            self.play_thread.join(timeout=1)
+
+    def _synth_loop(self) -> None:
+        while True:
+            with self.condition:
+                while self.running and not self.pending:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                handle = heapq.heappop(self.pending)
+                self.synthesizing = handle
+
+            if not handle.cancelled:
+                start = time.perf_counter()
+                try:
+                    handle.samples = self.render(handle.text)
+                except Exception as e:
+                    print(f"[ERROR]: Failed to synthesize speech: {e}", file=sys.stderr)
+                g_tracer.record("tts_synth", start, time.perf_counter(), handle.trace_id)
+
+            with self.condition:
+                self.synthesizing = None
+                if handle.cancelled or handle.samples is None:
+                    handle.done.set()
+                    continue
+                heapq.heappush(self.ready, handle)
+                self.condition.notify_all()
+
+    def _play_loop(self) -> None:
+        output = self.open_output()
+        try:
+            while True:
+                with self.condition:
+                    while self.running and not self.ready:
+                        self.condition.wait()
+                    if not self.running:
+                        return
+                    handle = heapq.heappop(self.ready)
+                    self.playing = handle
+
+                stale = handle.priority >= PRIORITY_CHAT and time.monotonic() - handle.created_at > config.TTS_STALE_S
+                if stale or handle.cancelled:
+                    handle.dropped = True
+                else:
+                    g_tracer.milestone("to_speech", handle.trace_id)
+                    start = time.perf_counter()
+                    self._play(output, handle)
+                    g_tracer.record("playback", start, time.perf_counter(), handle.trace_id)
+
+                with self.condition:
+                    self.playing = None
+                handle.done.set()
+        finally:
+            output.close()
+
+    def _play(self, output: AudioOutput, handle: SpeechHandle) -> None:
+        # Write in small chunks so an alert or cancel can cut in mid-sentence
+        chunk_size = config.TTS_PLAYBACK_CHUNK
+        for start in range(0, len(handle.samples), chunk_size):
+            if handle.cancelled or handle.preempted or not self.running:
+                return
+            output.write(handle.samples[start:start + chunk_size].tobytes())
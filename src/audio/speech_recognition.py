@@ -1,90 +1,247 @@
+from __future__ import annotations
+
 import sys
 import threading
+import time
+from typing import TYPE_CHECKING, Tuple
 
-import pyaudio
-from pynput.keyboard import Key, KeyCode
+import numpy as np
 import speech_recognition as sr
 
 import config
 from core.state import State, g_state
+from core.task_manager import task_chain
+from core.tracing import g_tracer
+from audio.audio_capture import AudioCapture, Utterance
+from audio.recognizers import RecognizerStream, load_recognizer_backend
+from audio.vad import VadResult, detect_speech
+from audio.wake_word import WakeListener, create_keyword_spotter
 from audio.text_to_speech import speak_ultron
 from commands.command_parser import processs_command_string
-from ai.ultron import get_ultron_response, clean_ultron_response
+from ai.intents import match_intent
+from ai.response_cache import ResponseCache
+from ai.ultron import PROMPT_VERSION, ResponseStreamParser, get_ultron_response, clean_ultron_response, stream_ultron_response
+
+if TYPE_CHECKING:
+    from pynput.keyboard import Key, KeyCode
 
-ListenerKeyType = Key | KeyCode | None 
+    ListenerKeyType = Key | KeyCode | None
 
 def setup_audio_input(state: State) -> None:
-    state.stream = state.mic.open(
-        format=pyaudio.paInt16,
-        channels=config.AUDIO_INPUT_CHANNELS,
-        rate=config.AUDIO_INPUT_RATE,
-        input=True,
-        frames_per_buffer=config.AUDIO_INPUT_CHUNK_SIZE
+    state.capture = AudioCapture(
+        config.AUDIO_INPUT_RATE, config.AUDIO_INPUT_CHANNELS, config.AUDIO_MAX_UTTERANCE_S, config.AUDIO_PREROLL_S
     )
+    state.stream = state.capture.open(state.mic, config.AUDIO_INPUT_CHANNELS, config.AUDIO_INPUT_CHUNK_SIZE)
+    
+    state.recognizer = load_recognizer_backend(config.STT_BACKEND)
+    print(f"[SYSTEM]: Speech recognition backend: {state.recognizer.name}")
     
-    state.recognizer = sr.Recognizer()
+    if config.STT_STREAMING:
+        if state.recognizer.supports_streaming:
+            state.stream_recognizer = state.recognizer
+        else:
+            print(f"[ERROR]: STT backend '{state.recognizer.name}' does not support streaming, recognizing on release", file=sys.stderr)
 
 def on_press(key: ListenerKeyType) -> None:
     if g_state.simulating_input:
         return
     
-    if not g_state.listening and isinstance(key, KeyCode) and key.char == config.PUSH_TO_TALK:
+    if g_state.capture is None or g_state.wake is not None:
+        return
+    
+    if not g_state.listening and getattr(key, "char", None) == config.PUSH_TO_TALK:  # Special keys have no char
         print("[ULTRON]: *Listening... (release U to stop)*")
         g_state.listening = True
+        g_state.listen_started_at = time.perf_counter()
+        
+        consumer = None
+        g_state.recognizer_stream = None
+        if g_state.stream_recognizer:
+            stream = g_state.recognizer_stream = g_state.stream_recognizer.start()
+            g_state.partial_transcript = ""
+            consumer = lambda samples, _start: feed_stream_recognizer(g_state, stream, samples)
         
-        with g_state.audio_frame_lock:
-            g_state.audio_frames.clear()
-            
-        g_state.collect_thread = threading.Thread(target=collect_audio, kwargs={ "state": g_state }, daemon=True)
-        g_state.collect_thread.start()
+        g_state.capture.begin(consumer)  # Nothing to start, the stream is already recording
     
 def on_release(key: ListenerKeyType) -> None:
-    if g_state.listening and isinstance(key, KeyCode) and key.char == config.PUSH_TO_TALK:
+    if g_state.listening and getattr(key, "char", None) == config.PUSH_TO_TALK:
+        released_at = time.perf_counter()
         print("[ULTRON]: *Stopped listening.*")
         g_state.listening = False
+        trace_id = g_tracer.new_trace(released_at)  # One trace per utterance, measured from the release
+        g_tracer.record("capture", g_state.listen_started_at, released_at, trace_id)
         
-        if g_state.collect_thread and g_state.collect_thread.is_alive():
-            g_state.collect_thread.join()
-            
-        threading.Thread(target=process_collected_audio, kwargs={ "state": g_state }, daemon=True).start()
-
-def collect_audio(state: State) -> None:
-    while state.listening and state.stream is not None:
-        try:
-            data = state.stream.read(config.AUDIO_INPUT_CHUNK_SIZE, exception_on_overflow=False)
-            
-            with state.audio_frame_lock:
-                state.audio_frames.append(data)
-        except Exception as e:
-            print(f"[ERROR]: Audio stream read error: {e}", file=sys.stderr)
-            break
-
-def process_collected_audio(state: State) -> None:
-    with state.audio_frame_lock:
-        if not state.audio_frames:
-            print("[ULTRON]: *No audio captured.*")
+        utterance = g_state.capture.end()  # Waits for a streaming recognizer to catch up
+        g_tracer.record("join", released_at, time.perf_counter(), trace_id)
+        dispatch_utterance(g_state, utterance, trace_id, g_state.recognizer_stream)
+
+def dispatch_utterance(state: State, utterance: Utterance, trace_id: int | None = None, stream: RecognizerStream | None = None) -> None:
+    if trace_id is None:
+        trace_id = g_tracer.new_trace()
+    threading.Thread(
+        target=process_collected_audio,
+        kwargs={ "state": state, "utterance": utterance, "trace_id": trace_id, "stream": stream },
+        daemon=True
+    ).start()
+
+def start_wake_listening(state: State) -> None:
+    # Hands-free mode: the wake listener takes over the capture's feed instead of the push-to-talk key
+    model = getattr(state.recognizer, "model", None)  # Share the Vosk model when it is also the STT backend
+    spotter = create_keyword_spotter(
+        config.WAKE_SPOTTER, config.WAKE_PHRASE, config.AUDIO_INPUT_RATE, model, config.STT_VOSK_MODEL_PATH
+    )
+    if spotter is None:
+        return
+    
+    if state.stream_recognizer:
+        print("[SYSTEM]: Streaming STT is not used in wake mode, commands are recognized once they end")
+        state.stream_recognizer = None
+    
+    state.wake = WakeListener(
+        state.capture,
+        spotter,
+        lambda utterance: dispatch_utterance(state, utterance),
+        config.WAKE_GATE_RMS,
+        config.WAKE_GATE_HANGOVER_S,
+        config.WAKE_END_SILENCE_S,
+        config.WAKE_MAX_COMMAND_S,
+        config.AUDIO_PREROLL_S,
+        config.AUDIO_VAD_FRAME_MS,
+        lambda: state.speech is not None and state.speech.is_playing()
+    )
+    state.capture.set_consumer(state.wake.consume)
+    print(f"[SYSTEM]: Wake-phrase mode: say '{config.WAKE_PHRASE}' followed by a command")
+
+def feed_stream_recognizer(state: State, stream: RecognizerStream, samples: np.ndarray) -> None:
+    state.partial_transcript = stream.accept_chunk(samples.tobytes())
+
+def recognize_collected_audio(state: State, audio_data: bytes, stream: RecognizerStream | None = None) -> str:
+    if stream:
+        # Chunks were already fed while the key was held, only the tail remains
+        text = stream.finish()
+        state.partial_transcript = text
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+    
+    return state.recognizer.recognize(audio_data)
+
+def act_on_response(state: State, spoken_text: str, command_text: str) -> None:
+    if command_text:
+        processs_command_string(state, command_text)
+    if spoken_text:
+        print(f"[ULTRON]: {spoken_text}")
+        speak_ultron(state, spoken_text)
+
+def remember_turn(state: State, text: str, spoken_text: str, command_text: str) -> None:
+    # Stored in the model's own reply format so it reads the history as its earlier answers
+    state.conversation.add(text, f"{spoken_text}{config.AI_COMMAND_DELIMITER}{command_text}" if command_text else spoken_text)
+
+def respond_to_transcript(state: State, text: str) -> None:
+    if config.AI_INTENT_FAST_PATH:
+        local_response = match_intent(state.intent_stats, text)
+        if local_response is not None:
+            act_on_response(state, *local_response)
+            remember_turn(state, text, *local_response)
             return
-        audio_data = b"".join(state.audio_frames)
-        state.audio_frames.clear()
-        
-    try:
-        audio = sr.AudioData(audio_data, config.AUDIO_INPUT_RATE, 2)
-        print("[ULTRON]: *Processing...*")
-        text = state.recognizer.recognize_google(audio)
-        print(f"[YOU]: {text}")
-        
-        response = get_ultron_response(state, text)
+    
+    cache_key = None
+    if state.response_cache:
+        cache_key = ResponseCache.make_key(text, config.AI_MODEL_NAME, config.AI_TEMPERATURE, PROMPT_VERSION)
+        cached_response = state.response_cache.get(cache_key)
+        if cached_response is not None:
+            act_on_response(state, *cached_response)
+            remember_turn(state, text, *cached_response)
+            return
+    
+    if config.AI_STREAMING:
+        parsed_response = stream_response_to_transcript(state, text)
+    else:
+        with g_tracer.span("llm"):
+            response = get_ultron_response(state, text)
         
         if response is None:
             return
         
-        spoken_text, command_text = clean_ultron_response(response)
-        if command_text:
-            processs_command_string(state, command_text)
+        reply, from_model = response
+        with g_tracer.span("clean"):
+            parsed_response = clean_ultron_response(reply)
+        act_on_response(state, *parsed_response)
+        if not from_model:
+            parsed_response = None
+    
+    if parsed_response is not None:
+        remember_turn(state, text, *parsed_response)
+        if cache_key:
+            state.response_cache.put(cache_key, *parsed_response)
+
+def stream_response_to_transcript(state: State, text: str) -> Tuple[str, str] | None:
+    def on_spoken(spoken_text: str) -> None:
         if spoken_text:
             print(f"[ULTRON]: {spoken_text}")
-            speak_ultron(state, spoken_text)
+            speak_ultron(state, spoken_text)  # Queued, plays while the remaining commands stream in
+    
+    def on_command(command: str) -> None:
+        processs_command_string(state, command)
+    
+    parser = ResponseStreamParser(on_spoken, on_command)
+    with task_chain(state):  # Streamed commands still form one ordered chain
+        with g_tracer.span("llm"):
+            completed = stream_ultron_response(state, text, parser)
+    
+    return (parser.spoken_text, " ".join(f"{command};" for command in parser.commands)) if completed else None
+
+def process_collected_audio(state: State, utterance: Utterance, trace_id: int | None = None, stream: RecognizerStream | None = None) -> None:
+    with g_tracer.bind(trace_id):
+        _process_collected_audio(state, utterance, stream)
+
+def trim_utterance(state: State, samples: np.ndarray) -> VadResult:
+    with g_tracer.span("vad"):
+        result = detect_speech(
+            samples,
+            config.AUDIO_INPUT_RATE * config.AUDIO_INPUT_CHANNELS,
+            config.AUDIO_VAD_FRAME_MS,
+            config.AUDIO_VAD_MIN_RMS,
+            config.AUDIO_VAD_NOISE_RATIO,
+            config.AUDIO_VAD_PAD_MS,
+            config.AUDIO_VAD_MIN_SPEECH_MS,
+            config.AUDIO_NORMALIZE_PEAK if config.AUDIO_NORMALIZE else None
+        )
+    state.vad_stats.record(result)
+    return result
+
+def _process_collected_audio(state: State, utterance: Utterance, stream: RecognizerStream | None) -> None:
+    if not len(utterance.samples):
+        print("[ULTRON]: *No audio captured.*")
+        return
+    
+    samples = utterance.samples
+    if config.AUDIO_VAD_ENABLED:
+        vad = trim_utterance(state, samples)
+        if not vad.speech:
+            print("[ULTRON]: *No speech detected.*")
+            return
+        print(f"[SYSTEM]: Trimmed {vad.trimmed_s:.2f} s of silence ({vad.trimmed_s * vad.rate / vad.input_samples:.0%})")
+        samples = vad.samples
+    
+    audio_data = samples.tobytes()  # The only copy, taken before the ring can wrap over it
+    if not utterance.intact():
+        print("[ERROR]: Audio was overwritten before it could be processed, dropping the utterance", file=sys.stderr)
+        return
+    if utterance.truncated:
+        print(f"[ERROR]: Held longer than {config.AUDIO_MAX_UTTERANCE_S:g} s, only the end was kept", file=sys.stderr)
+    
+    try:
+        print("[ULTRON]: *Processing...*")
+        start = time.perf_counter()
+        with g_tracer.span("stt"):
+            text = recognize_collected_audio(state, audio_data, stream)
+        if not stream:
+            state.vad_stats.record_stt(len(samples) / (config.AUDIO_INPUT_RATE * config.AUDIO_INPUT_CHANNELS), time.perf_counter() - start)
+        print(f"[YOU]: {text}")
+        
+        respond_to_transcript(state, text)
     except sr.UnknownValueError:
         print("[ERROR]: Could not understand audio", file=sys.stderr)
     except sr.RequestError as e:
-        print(f"[ERROR]: Could not request results from speech service: {e}", file=sys.stderr)
\ No newline at end of file
+        print(f"[ERROR]: Could not request results from speech service: {e}", file=sys.stderr)
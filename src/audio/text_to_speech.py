@@ -1,38 +1,125 @@
-import os
-import tempfile
+import math
+import sys
+import threading
 
-from pydub import AudioSegment
-from pydub.playback import play
+import numpy as np
 
 import config
 from core.state import State
+from audio.speech_queue import PRIORITY_CHAT, SpeechHandle, SpeechQueue
 
-def speak_ultron(state: State, text: str) -> None:
-    if not text.strip():
-        return
-    
-    temp_file = tempfile.TemporaryFile(delete=False, suffix=".wav")
-    temp_filename = temp_file.name
-    temp_file.close()
-    
-    state.engine.setProperty("voice", config.TTS_VOICE)
-    state.engine.setProperty('rate', config.TTS_RATE)  # Rate of speech
-    state.engine.save_to_file(text, temp_filename)
-    state.engine.runAndWait()
-    
-    sound = AudioSegment.from_file(temp_filename, format="wav")
-    
-    # Change pitch
-    new_sample_rate = int(sound.frame_rate * config.TTS_PITCH_MULT)
-    pitched_sound = sound._spawn(sound.raw_data, overrides={ "frame_rate": new_sample_rate })
-    pitched_sound = pitched_sound.set_frame_rate(44100)
-
-    # Add echo
-    echo_sound = pitched_sound - 8  # Quieter echo
-    combined = pitched_sound.overlay(echo_sound, position=config.TTS_DELAY_MS)
-    
-    combined += 2  # Increase volume
+SAPI_FORMAT_22KHZ_16BIT_MONO = 22  # SpeechAudioFormatType.SAFT22kHz16BitMono
+SAPI_SAMPLE_RATE = 22050
+
+_thread_voice = threading.local()  # SAPI voices are COM objects, one per calling thread
+
+def _sapi_rate(words_per_minute: int) -> int:
+    # Same words-per-minute -> SAPI rate (-10..10) mapping as pyttsx3's SAPI5 driver
+    return max(-10, min(10, int(math.log(words_per_minute / 156.63, 1.11))))
+
+def _get_voice() -> object:
+    import comtypes.client  # Windows only, loaded on the synthesis thread
+
+    voice = getattr(_thread_voice, "voice", None)
+    if voice is None:
+        comtypes.CoInitialize()
+        voice = comtypes.client.CreateObject("SAPI.SpVoice")
+        for token in voice.GetVoices():
+            if token.Id == config.TTS_VOICE:
+                voice.Voice = token
+                break
+        voice.Rate = _sapi_rate(config.TTS_RATE)
+        _thread_voice.voice = voice
+    return voice
+
+def synthesize_pcm(text: str) -> tuple[np.ndarray, int]:
+    # Render straight into a memory stream instead of a temp .wav file
+    import comtypes.client
+
+    voice = _get_voice()
+    memory_stream = comtypes.client.CreateObject("SAPI.SpMemoryStream")
+    memory_stream.Format.Type = SAPI_FORMAT_22KHZ_16BIT_MONO
+    voice.AudioOutputStream = memory_stream
+    voice.Speak(text)
+
+    return np.frombuffer(bytes(memory_stream.GetData()), dtype=np.int16), SAPI_SAMPLE_RATE
+
+def apply_voice_effects(pcm: np.ndarray, sample_rate: int) -> np.ndarray:
+    # Pitch shift and resample in one interpolation: play the samples at TTS_PITCH_MULT of their
+    # rate, then read them out at TTS_OUTPUT_RATE
+    step = int(sample_rate * config.TTS_PITCH_MULT) / config.TTS_OUTPUT_RATE
+    n_out = int(len(pcm) / step)
+    if n_out == 0:
+        return np.zeros(0, dtype=np.int16)
+
+    mixed = np.interp(np.arange(n_out) * step, np.arange(len(pcm)), pcm).astype(np.float32)
+
+    # Add echo (quieter copy delayed by TTS_DELAY_MS, output keeps the dry length)
+    delay = int(config.TTS_DELAY_MS * config.TTS_OUTPUT_RATE / 1000)
+    if delay < n_out:
+        mixed[delay:] += mixed[:-delay] * np.float32(10 ** (config.TTS_ECHO_GAIN_DB / 20))
+    np.clip(mixed, -32768, 32767, out=mixed)
+
+    mixed *= np.float32(10 ** (config.TTS_GAIN_DB / 20))  # Increase volume
+    np.clip(mixed, -32768, 32767, out=mixed)
+
+    output = np.empty(n_out, dtype=np.int16)
+    np.copyto(output, mixed, casting="unsafe")
+    return output
+
+class PlaybackOutput:
+    def __init__(self, state: State) -> None:
+        import pyaudio
+
+        self.stream = state.mic.open(format=pyaudio.paInt16, channels=1, rate=config.TTS_OUTPUT_RATE, output=True)
     
-    play(combined)
+    def write(self, frames: bytes) -> None:
+        self.stream.write(frames)
     
-    os.unlink(temp_filename)
\ No newline at end of file
+    def close(self) -> None:
+        self.stream.stop_stream()
+        self.stream.close()
+
+def render_ultron_voice(state: State, text: str) -> np.ndarray:
+    cache_key = None
+    if state.phrase_cache:
+        cache_key = state.phrase_cache.make_key(text)
+        samples = state.phrase_cache.get(cache_key)
+        if samples is not None:
+            return samples
+
+    pcm, sample_rate = synthesize_pcm(text)
+    samples = apply_voice_effects(pcm, sample_rate)
+
+    if cache_key:
+        state.phrase_cache.offer(cache_key, samples)
+    return samples
+
+def warm_phrase_cache(state: State, phrases: list[str]) -> None:
+    for text in phrases:
+        try:
+            cache_key = state.phrase_cache.make_key(text)
+            if not state.phrase_cache.pin(cache_key):
+                pcm, sample_rate = synthesize_pcm(text)
+                state.phrase_cache.put(cache_key, apply_voice_effects(pcm, sample_rate), pinned=True)
+        except Exception as e:
+            print(f"[ERROR]: Failed to pre-render phrase '{text}': {e}", file=sys.stderr)
+
+_speech_start_lock = threading.Lock()
+
+def start_speech(state: State) -> SpeechQueue:
+    with _speech_start_lock:
+        if state.speech is None:
+            state.speech = SpeechQueue(lambda text: render_ultron_voice(state, text), lambda: PlaybackOutput(state))
+        return state.speech
+
+def stop_speech(state: State) -> None:
+    if state.speech:
+        state.speech.stop()
+
+def speak_ultron(state: State, text: str, priority: int = PRIORITY_CHAT) -> SpeechHandle | None:
+    # Queues the line and returns immediately, call .wait() on the handle to block until it has been spoken
+    if not text.strip():
+        return None
+
+    return start_speech(state).speak(text, priority)
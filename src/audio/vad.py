@@ -0,0 +1,103 @@
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+@dataclass
+class VadResult:
+    samples: np.ndarray  # Trimmed view of the input (a new array only when normalized)
+    speech: bool
+    input_samples: int
+    rate: int
+    elapsed: float
+    offset: int = 0  # Index of the first kept sample in the input
+
+    @property
+    def trimmed_s(self) -> float:
+        return (self.input_samples - (len(self.samples) if self.speech else 0)) / self.rate
+
+@dataclass
+class VadStats:
+    utterances: int = 0
+    dropped: int = 0  # No speech found, STT and the LLM were skipped
+    bytes_in: int = 0
+    bytes_out: int = 0
+    trimmed_s: float = 0  # Silence cut from utterances that still went to STT
+    vad_time: float = 0
+    stt_calls: int = 0
+    stt_audio_s: float = 0
+    stt_time: float = 0
+
+    def record(self, result: VadResult) -> None:
+        self.utterances += 1
+        self.bytes_in += result.input_samples * 2
+        self.vad_time += result.elapsed
+        if result.speech:
+            self.bytes_out += len(result.samples) * 2
+            self.trimmed_s += result.trimmed_s
+        else:
+            self.dropped += 1
+
+    def record_stt(self, audio_s: float, elapsed: float) -> None:
+        self.stt_calls += 1
+        self.stt_audio_s += audio_s
+        self.stt_time += elapsed
+
+    def time_saved(self) -> float:
+        # Estimated from the STT cost measured on the audio that was sent: per second for trimmed silence,
+        # per call for utterances that were skipped entirely
+        if not self.stt_calls or not self.stt_audio_s:
+            return 0.0
+        return self.trimmed_s * self.stt_time / self.stt_audio_s + self.dropped * self.stt_time / self.stt_calls
+
+    def summary(self) -> str:
+        saved = 1 - self.bytes_out / self.bytes_in if self.bytes_in else 0.0
+        avg_ms = self.vad_time / self.utterances * 1000 if self.utterances else 0.0
+        return (
+            f"{self.utterances} utterances, {self.dropped} without speech skipped, {saved:.0%} of audio bytes trimmed "
+            f"({(self.bytes_in - self.bytes_out) / 1024:.0f} KB), ~{self.time_saved():.2f} s of STT saved, "
+            f"avg {avg_ms:.3f} ms per check"
+        )
+
+def frame_rms(samples: np.ndarray, frame: int) -> np.ndarray:
+    n_frames = len(samples) // frame
+    frames = samples[:n_frames * frame].reshape(n_frames, frame).astype(np.float32)
+    return np.sqrt(np.einsum("ij,ij->i", frames, frames) / frame)
+
+def detect_speech(
+    samples: np.ndarray,
+    rate: int,
+    frame_ms: float,
+    min_rms: float,
+    noise_ratio: float,
+    pad_ms: float,
+    min_speech_ms: float,
+    normalize_peak: float | None = None
+) -> VadResult:
+    # Energy VAD: a frame is speech when its RMS clears both an absolute floor and the clip's own noise floor
+    # (10th percentile frame) by noise_ratio. Leading and trailing silence is cut, keeping pad_ms either side.
+    start_time = time.perf_counter()
+    frame = max(1, int(rate * frame_ms / 1000))
+    rms = frame_rms(samples, frame)
+    if not len(rms):
+        return VadResult(samples[:0], False, len(samples), rate, time.perf_counter() - start_time)
+
+    threshold = max(min_rms, float(np.percentile(rms, 10)) * noise_ratio)
+    voiced = np.flatnonzero(rms > threshold)
+    if len(voiced) * frame_ms < min_speech_ms:
+        return VadResult(samples[:0], False, len(samples), rate, time.perf_counter() - start_time)
+
+    pad = int(pad_ms / frame_ms)
+    first = max(0, voiced[0] - pad) * frame
+    last = min(len(rms), voiced[-1] + 1 + pad) * frame
+    if voiced[-1] + 1 + pad >= len(rms):
+        last = len(samples)  # Keep the partial frame at the end too
+    trimmed = samples[first:last]
+
+    if normalize_peak is not None:
+        peak = int(np.max(np.abs(trimmed.astype(np.int32))))
+        if peak:
+            gain = normalize_peak * 32767 / peak
+            trimmed = np.clip(trimmed.astype(np.float32) * gain, -32768, 32767).astype(np.int16)
+
+    return VadResult(trimmed, True, len(samples), rate, time.perf_counter() - start_time, first)
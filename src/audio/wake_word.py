@@ -0,0 +1,140 @@
+import json
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Protocol
+
+import numpy as np
+
+from audio.audio_capture import AudioCapture, Utterance
+from audio.vad import frame_rms
+
+class KeywordSpotter(Protocol):
+    name: str
+
+    def accept(self, chunk: bytes) -> bool: ...  # True once the wake phrase has been heard
+    def reset(self) -> None: ...
+
+class VoskKeywordSpotter:
+    # Vosk restricted to a two-entry grammar (the phrase or "unknown"), far cheaper than open-vocabulary decoding
+    name = "vosk"
+
+    def __init__(self, phrase: str, sample_rate: int, model: object | None = None, model_path: str = "") -> None:
+        from vosk import Model, KaldiRecognizer, SetLogLevel  # Optional dependency, same as the Vosk STT backend
+
+        SetLogLevel(-1)
+        self.phrase = phrase.lower()
+        self.model = model or (Model(model_path) if model_path else Model(lang="en-us"))
+        self.recognizer = KaldiRecognizer(self.model, sample_rate, json.dumps([self.phrase, "[unk]"]))
+
+    def accept(self, chunk: bytes) -> bool:
+        if self.recognizer.AcceptWaveform(chunk):
+            text = json.loads(self.recognizer.Result()).get("text", "")
+        else:
+            text = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        return self.phrase in text
+
+    def reset(self) -> None:
+        self.recognizer.Reset()
+
+def create_keyword_spotter(name: str, phrase: str, sample_rate: int, model: object | None = None, model_path: str = "") -> KeywordSpotter | None:
+    if name == "vosk":
+        try:
+            return VoskKeywordSpotter(phrase, sample_rate, model, model_path)
+        except Exception as e:
+            print(f"[ERROR]: Could not load the Vosk keyword spotter, wake-phrase mode is off: {e}", file=sys.stderr)
+            return None
+    print(f"[ERROR]: Unknown WAKE_SPOTTER '{name}', wake-phrase mode is off", file=sys.stderr)
+    return None
+
+@dataclass
+class WakeStats:
+    audio_s: float = 0
+    gate_open_s: float = 0  # Audio the spotter actually had to decode
+    cpu_time: float = 0  # Thread CPU spent in the listener, gate and spotter included
+    wakes: int = 0
+    commands: int = 0
+
+    def summary(self) -> str:
+        cpu_per_s = self.cpu_time / self.audio_s if self.audio_s else 0.0
+        gate = self.gate_open_s / self.audio_s if self.audio_s else 0.0
+        return (
+            f"{self.wakes} wakes, {self.commands} commands, gate open {gate:.0%} of {self.audio_s:.0f} s, "
+            f"{cpu_per_s * 1000:.2f} ms CPU per audio-second ({cpu_per_s:.2%} of a core)"
+        )
+
+class WakeListener:
+    # Runs on the capture's feed thread. A per-frame energy gate keeps the spotter idle in silence; after the wake
+    # phrase the command is recorded until the speaker goes quiet, then handed over like a push-to-talk release.
+    def __init__(
+        self,
+        capture: AudioCapture,
+        spotter: KeywordSpotter,
+        on_utterance: Callable[[Utterance], None],
+        gate_rms: float,
+        hangover_s: float,
+        end_silence_s: float,
+        max_command_s: float,
+        preroll_s: float,
+        frame_ms: float = 20,
+        is_speaking: Callable[[], bool] | None = None
+    ) -> None:
+        self.capture = capture
+        self.spotter = spotter
+        self.on_utterance = on_utterance
+        self.is_speaking = is_speaking  # Ultron's own voice is playing, so the mic may be hearing it
+        self.rate = capture.rate
+        self.frame = max(1, int(self.rate * frame_ms / 1000))
+        self.gate_rms = gate_rms
+        self.hangover = int(hangover_s * self.rate)
+        self.end_silence = int(end_silence_s * self.rate)
+        self.max_command = int(max_command_s * self.rate)
+        self.preroll = int(preroll_s * self.rate)
+        self.last_loud = -self.hangover - 1  # Ring index of the end of the last frame above the gate
+        self.spotting = False  # Spotter has been fed since it was last reset
+        self.command_start: int | None = None
+        self.stats = WakeStats()
+
+    def consume(self, samples: np.ndarray, start: int) -> None:
+        cpu_start = time.thread_time()
+        end = start + len(samples)
+
+        rms = frame_rms(samples, self.frame)
+        loud = np.flatnonzero(rms > self.gate_rms)
+        if len(loud):
+            self.last_loud = start + (loud[-1] + 1) * self.frame
+        gate_open = end - self.last_loud <= self.hangover
+
+        if self.command_start is not None:
+            self._record_command(end)
+        elif self.is_speaking is not None and self.is_speaking():
+            if self.spotting:
+                self.spotter.reset()  # e.g. "Rage of Ultron." must not wake the listener
+                self.spotting = False
+        elif gate_open:
+            self.stats.gate_open_s += len(samples) / self.rate
+            self.spotting = True
+            if self.spotter.accept(samples.tobytes()):
+                self._wake(end)
+        elif self.spotting:
+            self.spotter.reset()  # Silence again, drop the decoder state instead of feeding it quiet audio
+            self.spotting = False
+
+        self.stats.audio_s += len(samples) / self.rate
+        self.stats.cpu_time += time.thread_time() - cpu_start
+
+    def _wake(self, now: int) -> None:
+        print("[ULTRON]: *Wake phrase heard, listening...*")
+        self.stats.wakes += 1
+        self.spotter.reset()
+        self.spotting = False
+        self.command_start = max(0, now - self.preroll)  # May include the phrase itself, the intents treat it as filler
+        self.last_loud = now
+
+    def _record_command(self, now: int) -> None:
+        if now - self.last_loud < self.end_silence and now - self.command_start < self.max_command:
+            return
+        utterance = self.capture.cut(self.command_start, now)
+        self.command_start = None
+        self.stats.commands += 1
+        self.on_utterance(utterance)
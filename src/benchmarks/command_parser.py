@@ -0,0 +1,124 @@
+import argparse
+import random
+import string
+import sys
+import time
+
+from commands.grammar import Command, CommandParseError, format_command, parse_command_chain
+from commands.spec import COMMAND_SPECS, KEY_NAMES, PARAM_INT, PARAM_FLOAT, PARAM_KEY, PARAM_TEXT, PARAM_BOOL
+
+# Usage (from src/): python -m benchmarks.command_parser [--chains 2000] [--chain-length 20] [--seed 0]
+# Generates random valid chains, fuzzed (mutated) chains and one very long chain, then checks that the grammar
+# round-trips valid chains, never raises anything but CommandParseError on fuzzed input, and measures throughput
+# against the old split(";") + startswith scan (which only finds prefixes, it does no validation or conversion).
+
+LEGACY_PREFIXES = [
+    "press(", "rmb", "delay(", "message(", "melee(", "fly", "fire(", "nano(", "lock",
+    "start_rec", "stop_rec", "start_replay", "stop_replay", "clip", "shutdown", "cancel",
+]
+
+def random_command(rng: random.Random) -> Command:
+    spec = rng.choice(COMMAND_SPECS)
+    args = []
+    for param in spec.params:
+        if param.kind == PARAM_INT:
+            args.append(rng.randint(int(param.low), int(param.high)))
+        elif param.kind == PARAM_FLOAT:
+            args.append(round(rng.uniform(param.low, param.high), 2))
+        elif param.kind == PARAM_KEY:
+            args.append(rng.choice([*string.ascii_lowercase, *sorted(KEY_NAMES)]))
+        elif param.kind == PARAM_TEXT:
+            args.append("".join(rng.choice(string.ascii_letters + " ;,()") for _ in range(rng.randint(1, 30))).strip() or "gg")
+        elif param.kind == PARAM_BOOL:
+            args.append(rng.random() < 0.5)
+    return Command(spec.name, tuple(args))
+
+def mutate(rng: random.Random, text: str) -> str:
+    chars = list(text)
+    for _ in range(rng.randint(1, 4)):
+        i = rng.randrange(len(chars) + 1)
+        op = rng.random()
+        if op < 0.4:
+            chars.insert(i, rng.choice(string.printable))
+        elif op < 0.7 and i < len(chars):
+            del chars[i]
+        elif i < len(chars):
+            chars[i] = rng.choice(string.printable)
+    return "".join(chars)
+
+def legacy_parse(command_string: str) -> int:
+    handled = 0
+    for cmd in command_string.split(";"):
+        cmd = cmd.strip()
+        if not cmd:
+            continue
+        for prefix in LEGACY_PREFIXES:
+            if cmd.startswith(prefix):
+                if cmd.endswith(")"):
+                    cmd[len(prefix):-1]
+                handled += 1
+                break
+    return handled
+
+def check_round_trip(chains: list[list[Command]]) -> int:
+    failures = 0
+    for commands in chains:
+        text = "; ".join(format_command(command) for command in commands) + ";"
+        parsed = parse_command_chain(text)
+        # Text args are stripped on parse, compare the re-formatted chains
+        if [format_command(command) for command in parsed] != [format_command(command) for command in commands]:
+            failures += 1
+            if failures <= 3:
+                print(f"[ERROR]: Round trip mismatch: {text}", file=sys.stderr)
+    return failures
+
+def time_parser(name: str, parse, inputs: list[str]) -> None:
+    total_bytes = sum(len(text) for text in inputs)
+    start = time.perf_counter()
+    for text in inputs:
+        try:
+            parse(text)
+        except CommandParseError:
+            pass
+    elapsed = time.perf_counter() - start
+    print(f"{name:>8}: {total_bytes / elapsed / 1e6:7.2f} MB/s  {len(inputs) / elapsed:10.0f} chains/s")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fuzz and benchmark the command grammar")
+    parser.add_argument("--chains", type=int, default=2000)
+    parser.add_argument("--chain-length", type=int, default=20)
+    parser.add_argument("--long-chain", type=int, default=50000, help="Commands in the single very long chain")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    chains = [[random_command(rng) for _ in range(rng.randint(1, args.chain_length))] for _ in range(args.chains)]
+    valid = ["; ".join(format_command(command) for command in chain) + ";" for chain in chains]
+    fuzzed = [mutate(rng, text) for text in valid]
+    long_chain = "; ".join(format_command(random_command(rng)) for _ in range(args.long_chain))
+
+    failures = check_round_trip(chains)
+
+    accepted = 0
+    crashes = 0
+    for text in fuzzed:
+        try:
+            parse_command_chain(text)
+            accepted += 1
+        except CommandParseError:
+            pass
+        except Exception as e:
+            crashes += 1
+            print(f"[ERROR]: {type(e).__name__} on fuzzed input {text!r}: {e}", file=sys.stderr)
+    print(f"[SYSTEM]: {len(valid)} valid chains, {failures} round-trip failures; {len(fuzzed)} fuzzed, {accepted} still valid, {crashes} crashes")
+
+    for name, inputs in (("valid", valid), ("fuzzed", fuzzed), ("long", [long_chain])):
+        print(f"[SYSTEM]: {name} inputs")
+        time_parser("grammar", parse_command_chain, inputs)
+        time_parser("legacy", legacy_parse, inputs)
+
+    if failures or crashes:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
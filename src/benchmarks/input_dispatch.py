@@ -0,0 +1,72 @@
+import argparse
+import statistics
+import sys
+import time
+from typing import Callable
+
+from game.input_backend import InputBackend, create_input_backend
+from game.timeline import InputEvent, KEY_DOWN, KEY_UP
+from tests.fakes.input import RecordingBackend
+
+# Usage (from src/): python -m benchmarks.input_dispatch [--iterations 200] [--backends recording pynput sendinput pyautogui]
+# Times a single key press/release and an in-place cursor move per backend. Uses F20, which games and desktops
+# ignore, and moves the cursor to where it already is, so it is safe to run with the game open.
+# "pyautogui" is the old dispatch path, including its implicit pyautogui.PAUSE after every call.
+
+KEY = "f20"
+
+def time_calls(func: Callable[[], None], iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def report(name: str, op: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p99 = ordered[int(0.99 * (len(ordered) - 1))]
+    print(f"{name:>10} {op:>10}: mean {statistics.mean(ordered) * 1e6:9.1f} us  p50 {statistics.median(ordered) * 1e6:9.1f} us  p99 {p99 * 1e6:9.1f} us")
+
+def bench_backend(name: str, iterations: int) -> None:
+    # The recording fake is the no-op floor; production config can't select it
+    backend: InputBackend = RecordingBackend() if name == "recording" else create_input_backend(name)
+    if backend.name != name:
+        return  # Creation failed and fell back, already reported
+
+    press = [InputEvent(0, KEY_DOWN, KEY), InputEvent(0, KEY_UP, KEY)]
+    report(name, "key press", time_calls(lambda: backend.send(press), iterations))
+
+    x, y = backend.position()
+    report(name, "move", time_calls(lambda: backend.move_to(x, y), iterations))
+
+def bench_pyautogui(iterations: int) -> None:
+    import pyautogui
+
+    def press() -> None:
+        pyautogui.keyDown(KEY)
+        pyautogui.keyUp(KEY)
+
+    x, y = pyautogui.position()
+    print(f"[SYSTEM]: pyautogui.PAUSE = {pyautogui.PAUSE * 1000:.0f} ms per call")
+    report("pyautogui", "key press", time_calls(press, iterations))
+    report("pyautogui", "move", time_calls(lambda: pyautogui.moveTo(x, y), iterations))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure per-event input dispatch latency")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--backends", nargs="+", default=["recording", "pynput", "sendinput", "pyautogui"])
+    args = parser.parse_args()
+
+    for name in args.backends:
+        try:
+            if name == "pyautogui":
+                # PAUSE makes every call take at least 100 ms, keep the run short
+                bench_pyautogui(min(args.iterations, 20))
+            else:
+                bench_backend(name, args.iterations)
+        except Exception as e:
+            print(f"[ERROR]: {name} unavailable: {e}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from game.combat_timelines import (
+    press_key_timeline, right_click_timeline, fly_timeline, melee_timeline, fire_ray_timeline, nano_ray_timeline, delay_timeline
+)
+from game.timeline import InputEvent, Timeline, run_timeline
+from tests.fakes.input import RecordingBackend
+
+# Usage (from src/): python -m benchmarks.input_timeline [--commands 40] [--scale 0.05] [--bound-ms 5]
+# Plays a long random combat chain against a recording backend and fails if the p99 deadline error, or the
+# error on the final event (i.e. accumulated drift), exceeds the bound. Max is reported but not asserted since
+# a single preemption on a busy machine can exceed any bound.
+
+def random_chain(n_commands: int, scale: float) -> Timeline:
+    builders = [
+        lambda: press_key_timeline("e"),
+        right_click_timeline,
+        fly_timeline,
+        lambda: melee_timeline(random.randint(1, 10)),
+        lambda: fire_ray_timeline(random.randint(1, 6)),
+        lambda: press_key_timeline("c").then(nano_ray_timeline(random.randint(1, 8))),
+        lambda: delay_timeline(random.uniform(0.1, 2)),
+    ]
+
+    chain = Timeline()
+    for _ in range(n_commands):
+        chain = chain.then(random.choice(builders)())
+
+    # Shrink every gap so a long chain runs in seconds while keeping the same event count
+    return Timeline([InputEvent(event.at * scale, event.kind, event.target) for event in chain.events], chain.duration * scale)
+
+def chained_sleeps(send, timeline: Timeline) -> list[float]:
+    # The old approach: sleep for each gap relative to the previous event, so jitter accumulates
+    start = time.perf_counter()
+    drifts = []
+    previous_at = 0.0
+    for event in timeline.events:
+        if event.at > previous_at:
+            time.sleep(event.at - previous_at)
+        previous_at = event.at
+        send([event])
+        drifts.append(time.perf_counter() - (start + event.at))
+    return drifts
+
+def report(name: str, drifts: list[float]) -> tuple[float, float]:
+    ordered = sorted(abs(drift) for drift in drifts)
+    p99 = ordered[int(0.99 * (len(ordered) - 1))]
+    print(
+        f"{name:>14}: mean {statistics.mean(ordered) * 1e6:8.0f} us  p99 {p99 * 1e6:8.0f} us  "
+        f"max {ordered[-1] * 1e6:8.0f} us  last event {drifts[-1] * 1e6:8.0f} us"
+    )
+    return p99, abs(drifts[-1])
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure input deadline drift over long combat chains")
+    parser.add_argument("--commands", type=int, default=40)
+    parser.add_argument("--scale", type=float, default=0.05)
+    parser.add_argument("--bound-ms", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    timeline = random_chain(args.commands, args.scale)
+    print(f"[SYSTEM]: {len(timeline.events)} events over {timeline.duration:.2f} s")
+
+    p99, final = report("timeline", run_timeline(RecordingBackend().send, timeline))
+    report("chained sleep", chained_sleeps(RecordingBackend().send, timeline))
+
+    if max(p99, final) * 1000 > args.bound_ms:
+        print(f"[ERROR]: Timeline drift (p99 {p99 * 1000:.2f} ms, final {final * 1000:.2f} ms) exceeds {args.bound_ms} ms", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import argparse
+import contextlib
+import io
+import random
+import sys
+import time
+
+import config
+from ai.hedging import OUTCOME_DEADLINE, OUTCOME_HEDGE, OUTCOME_PRIMARY
+from ai.ultron import ResponseStreamParser, create_groq_client, stream_ultron_response
+from core.state import State
+from core.tracing import percentile
+from tests.fakes.llm_server import FakeLlmServer
+
+# Usage (from src/): python -m benchmarks.llm_deadline [--requests 100] [--stall-rate 0.05] [--stall-s 4]
+#                    [--hedge-delay-s 0.6] [--deadline-s 2]
+# Starts the local OpenAI-compatible stand-in (tests/fakes/llm_server.py) and sends a run of streamed requests
+# through the real Groq client and stream_ultron_response. The primary model has a heavy-tailed first token
+# (log-normal, with occasional stalls); the hedge model is fast and steady. The same seeded latency sequence is
+# replayed with no deadline or hedge (the old behaviour), with the deadline alone and with hedging plus the
+# deadline, reporting time until Ultron answers (model or local fallback), outcomes and connections opened.
+# Fails if hedging does not lower p99 or any answer takes longer than the deadline plus --slack-ms.
+
+REPLY = "Engaging. [COMMAND] melee(2); fire(2);"
+UTTERANCES = ["what is the enemy doing", "hit him twice and shoot him", "how long until my ultimate"]
+
+def primary_latencies(requests: int, args: argparse.Namespace) -> list[float]:
+    rng = random.Random(args.seed)
+    return [
+        args.stall_s if rng.random() < args.stall_rate else rng.lognormvariate(0, 0.5) * args.primary_ms / 1000
+        for _ in range(requests)
+    ]
+
+def run(mode: str, latencies: list[float], args: argparse.Namespace) -> tuple[list[float], dict[str, int], int]:
+    sequence = iter(latencies)
+    rng = random.Random(args.seed + 1)
+    server = FakeLlmServer(
+        REPLY,
+        latency={
+            config.AI_MODEL_NAME: lambda: next(sequence, 0.0),
+            config.AI_HEDGE_MODEL_NAME: lambda: rng.uniform(0.8, 1.2) * args.hedge_ms / 1000,
+        },
+        token_latency=args.token_ms / 1000,
+    ).start()
+
+    saved = config.AI_HEDGE_MODEL_NAME, config.AI_HEDGE_DELAY_S, config.AI_DEADLINE_S
+    if mode != "hedged":
+        config.AI_HEDGE_MODEL_NAME = ""
+    config.AI_HEDGE_DELAY_S = args.hedge_delay_s
+    config.AI_DEADLINE_S = args.deadline_s if mode != "baseline" else 0
+
+    state = State()
+    state.groq_client = create_groq_client("benchmark", server.base_url)
+    waits = []
+    try:
+        for i in range(len(latencies)):
+            answered_at = []
+            parser = ResponseStreamParser(
+                lambda _spoken: answered_at.append(time.perf_counter()),
+                lambda _command: answered_at.append(time.perf_counter())
+            )
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                stream_ultron_response(state, UTTERANCES[i % len(UTTERANCES)], parser)
+            waits.append((answered_at[0] if answered_at else time.perf_counter()) - start)
+    finally:
+        config.AI_HEDGE_MODEL_NAME, config.AI_HEDGE_DELAY_S, config.AI_DEADLINE_S = saved
+        state.groq_client.close()
+        server.stop()
+    return waits, dict(state.llm_stats.outcomes), server.connections
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark deadline-aware, hedged LLM requests against a local stand-in")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--primary-ms", type=float, default=250, help="Median first token of the primary model")
+    parser.add_argument("--hedge-ms", type=float, default=150, help="First token of the hedge model")
+    parser.add_argument("--stall-rate", type=float, default=0.05, help="Fraction of primary requests that stall")
+    parser.add_argument("--stall-s", type=float, default=4.0)
+    parser.add_argument("--token-ms", type=float, default=2)
+    parser.add_argument("--hedge-delay-s", type=float, default=config.AI_HEDGE_DELAY_S)
+    parser.add_argument("--deadline-s", type=float, default=config.AI_DEADLINE_S)
+    parser.add_argument("--slack-ms", type=float, default=100, help="Allowed overshoot of the deadline")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    try:
+        import groq  # noqa: F401
+    except ImportError:
+        print("[ERROR]: The groq package is required (pip install -r requirements.txt)", file=sys.stderr)
+        sys.exit(1)
+
+    latencies = primary_latencies(args.requests, args)
+    print(
+        f"[SYSTEM]: {args.requests} requests, primary p50 {percentile(sorted(latencies), 0.5) * 1000:.0f} ms with "
+        f"{args.stall_rate:.0%} stalls of {args.stall_s:g} s, hedge {args.hedge_ms:.0f} ms after {args.hedge_delay_s:g} s, "
+        f"deadline {args.deadline_s:g} s"
+    )
+    print(f"{'mode':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'primary':>8} {'hedge':>6} {'local':>6} {'conns':>6}")
+    p99s = {}
+    worst = {}
+    for mode in ("baseline", "deadline", "hedged"):
+        waits, outcomes, connections = run(mode, latencies, args)
+        ordered = sorted(waits)
+        p99s[mode] = percentile(ordered, 0.99)
+        worst[mode] = ordered[-1]
+        print(
+            f"{mode:>9} {percentile(ordered, 0.5) * 1000:5.0f} ms {percentile(ordered, 0.95) * 1000:5.0f} ms "
+            f"{p99s[mode] * 1000:5.0f} ms {ordered[-1] * 1000:5.0f} ms {outcomes.get(OUTCOME_PRIMARY, 0):8d} "
+            f"{outcomes.get(OUTCOME_HEDGE, 0):6d} {outcomes.get(OUTCOME_DEADLINE, 0):6d} {connections:6d}"
+        )
+
+    ok = True
+    if p99s["hedged"] >= p99s["baseline"]:
+        print("[ERROR]: Hedging did not lower the p99 wait", file=sys.stderr)
+        ok = False
+    for mode in ("deadline", "hedged"):
+        if worst[mode] > args.deadline_s + args.slack_ms / 1000:
+            print(f"[ERROR]: {mode}: an answer took {worst[mode]:.2f} s, past the {args.deadline_s:g} s deadline", file=sys.stderr)
+            ok = False
+    if not ok:
+        sys.exit(1)
+    print("[SYSTEM]: Deadline held and hedging cut the tail")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
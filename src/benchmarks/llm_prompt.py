@@ -0,0 +1,110 @@
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import time
+
+import config
+from ai.conversation import Conversation, estimate_tokens
+from ai.prompt import PHRASES, SYSTEM_PROMPT, build_system_prompt
+from ai.ultron import ResponseStreamParser, build_messages, stream_ultron_response
+from commands.grammar import parse_command_chain
+from commands.spec import COMMAND_SPECS
+from core.state import State
+from core.tracing import percentile
+from tests.fakes.groq_client import FakeGroqClient
+
+# Usage (from src/): python -m benchmarks.llm_prompt [--turns 0 2 4 8] [--budget 400] [--requests 40]
+#                    [--prefill-us-per-token 60]
+# Checks that the compact system prompt covers every command in commands/spec.py and that its phrase table
+# parses, then reports its size and build cost. A session of back-and-forth requests is replayed against the
+# fake Groq client for each history length, with prefill time proportional to prompt tokens, to show what each
+# turn of context costs in prompt tokens and time to first token.
+
+REPLY = "Engaging. [COMMAND] melee(2); fire(2);"
+UTTERANCES = [
+    "hit him twice and shoot him", "what is the enemy doing", "deploy the drone on me", "do that again",
+    "how long until my ultimate", "tell the team to push", "fly up and hit them with the nano ray",
+]
+
+def check_prompt() -> bool:
+    ok = True
+    for spec in COMMAND_SPECS:
+        if f"{spec.name}(" not in SYSTEM_PROMPT and f"{spec.name};" not in SYSTEM_PROMPT:
+            print(f"[ERROR]: Command '{spec.name}' is missing from the system prompt", file=sys.stderr)
+            ok = False
+    for phrase, command in PHRASES:
+        if "/" in command:
+            continue  # Alternatives such as true/false, not literal syntax
+        try:
+            parse_command_chain(command)
+        except Exception as e:
+            print(f"[ERROR]: Phrase '{phrase}' maps to unparseable '{command}': {e}", file=sys.stderr)
+            ok = False
+    return ok
+
+def run_session(turns: int, budget: int, requests: int, prefill_s: float, first_token_s: float) -> tuple[State, list[float], int]:
+    state = State()
+    state.conversation = Conversation(turns, budget)
+    state.groq_client = FakeGroqClient(REPLY, first_token_latency=first_token_s, prompt_token_latency=prefill_s)
+    first_tokens = []
+    max_context = 0
+
+    for i in range(requests):
+        text = UTTERANCES[i % len(UTTERANCES)]
+        max_context = max(max_context, state.conversation.context()[1])
+        first_token_at = []
+        start = time.perf_counter()
+        parser = ResponseStreamParser(lambda _spoken: first_token_at.append(time.perf_counter()), lambda _command: None)
+        with contextlib.redirect_stdout(io.StringIO()):
+            stream_ultron_response(state, text, parser)
+        first_tokens.append((first_token_at[0] if first_token_at else time.perf_counter()) - start)
+        state.conversation.add(text, REPLY)
+    return state, first_tokens, max_context
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure system prompt size and the cost of conversation history")
+    parser.add_argument("--turns", type=int, nargs="+", default=[0, 2, 4, 8])
+    parser.add_argument("--budget", type=int, default=config.AI_HISTORY_TOKENS, help="History token budget")
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--prefill-us-per-token", type=float, default=60, help="Modelled prefill time per prompt token")
+    parser.add_argument("--first-token-ms", type=float, default=80, help="Modelled fixed time to first token")
+    args = parser.parse_args()
+
+    ok = check_prompt()
+
+    start = time.perf_counter()
+    for _ in range(100):
+        build_system_prompt()
+    build_us = (time.perf_counter() - start) / 100 * 1e6
+    start = time.perf_counter()
+    for _ in range(10000):
+        build_messages("fire two shots")
+    messages_us = (time.perf_counter() - start) / 10000 * 1e6
+    print(
+        f"[SYSTEM]: System prompt {len(SYSTEM_PROMPT)} chars (~{estimate_tokens(SYSTEM_PROMPT)} tokens), "
+        f"built once in {build_us:.0f} us, {messages_us:.2f} us per request to assemble messages"
+    )
+
+    print(f"{'turns':>5} {'prompt tokens':>14} {'history':>8} {'max history':>12} {'first token p50':>16} {'p95':>9}")
+    for turns in args.turns:
+        state, first_tokens, max_context = run_session(
+            turns, args.budget, args.requests, args.prefill_us_per_token / 1e6, args.first_token_ms / 1000
+        )
+        stats = state.llm_stats
+        ordered = sorted(first_tokens)
+        print(
+            f"{turns:5d} {stats.prompt_tokens / stats.requests:14.0f} {stats.context_tokens / stats.requests:8.0f} "
+            f"{max_context:12d} {statistics.median(ordered) * 1000:13.1f} ms {percentile(ordered, 0.95) * 1000:6.1f} ms"
+        )
+        if max_context > args.budget:
+            print(f"[ERROR]: History of {max_context} tokens exceeded the {args.budget} token budget", file=sys.stderr)
+            ok = False
+
+    if not ok:
+        sys.exit(1)
+    print("[SYSTEM]: Prompt covers every command and history stayed within budget")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,91 @@
+import argparse
+import statistics
+import sys
+import time
+
+from obsws_python import ReqClient
+
+import config
+from obs.connection import ObsConnection, ObsUnavailableError
+from tests.fakes.obs_server import FakeObsServer
+
+# Usage (from src/): python -m benchmarks.obs_connection [--latency-ms 5] [--iterations 50]
+# Runs the OBS connection manager against a local fake obs-websocket server. Checks that startup doesn't block
+# while OBS is down, compares "save clip + stop replay" as two requests vs one RequestBatch, and times how long
+# it takes to notice an OBS restart and reconnect.
+
+def wait_for(condition, timeout: float) -> float | None:
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if condition():
+            return time.perf_counter() - start
+        time.sleep(0.005)
+    return None
+
+def report(name: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p99 = ordered[int(0.99 * (len(ordered) - 1))]
+    print(f"{name:>10}: mean {statistics.mean(ordered) * 1000:7.2f} ms  p50 {statistics.median(ordered) * 1000:7.2f} ms  p99 {p99 * 1000:7.2f} ms")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the OBS connection manager against a fake server")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Fake server processing time per round trip")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--ping-s", type=float, default=0.2, help="Health ping interval for the run")
+    args = parser.parse_args()
+
+    config.OBS_PING_INTERVAL_S = args.ping_s
+    config.OBS_RECONNECT_MIN_S = 0.05
+
+    server = FakeObsServer(latency=args.latency_ms / 1000)
+    server.start()
+    port = server.port
+    server.stop()  # Start with OBS down
+
+    connection = ObsConnection(lambda: ReqClient(host="127.0.0.1", port=port, password="", timeout=config.OBS_TIMEOUT_S))
+    start = time.perf_counter()
+    connection.start()
+    print(f"[SYSTEM]: start() returned in {(time.perf_counter() - start) * 1000:.2f} ms with OBS down")
+
+    start = time.perf_counter()
+    try:
+        connection.request("SaveReplayBuffer")
+    except ObsUnavailableError:
+        print(f"[SYSTEM]: Request while down failed fast in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    server = FakeObsServer(port=port, latency=args.latency_ms / 1000).start()
+    connected = wait_for(lambda: connection.connected, 10)
+    if connected is None:
+        print("[ERROR]: Never connected to the fake server", file=sys.stderr)
+        sys.exit(1)
+    print(f"[SYSTEM]: Connected {connected * 1000:.0f} ms after OBS came up")
+
+    singles, batches = [], []
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        connection.request("SaveReplayBuffer")
+        connection.request("StopReplayBuffer")
+        singles.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        results = connection.batch([("SaveReplayBuffer", None), ("StopReplayBuffer", None)])
+        batches.append(time.perf_counter() - start)
+        assert all(result.ok for result in results)
+    report("2 requests", singles)
+    report("batch", batches)
+
+    server.stop()
+    lost = wait_for(lambda: not connection.connected, 10)
+    server = FakeObsServer(port=port, latency=args.latency_ms / 1000).start()
+    reconnected = wait_for(lambda: connection.connected, 10)
+    if lost is None or reconnected is None:
+        print("[ERROR]: Did not recover from an OBS restart", file=sys.stderr)
+        sys.exit(1)
+    print(f"[SYSTEM]: OBS restart noticed in {lost * 1000:.0f} ms, reconnected {reconnected * 1000:.0f} ms after it came back")
+
+    connection.stop()
+    server.stop()
+    print(f"[SYSTEM]: OBS requests:\n{connection.summary()}")
+
+if __name__ == "__main__":
+    main()
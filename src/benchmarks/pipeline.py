@@ -0,0 +1,243 @@
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from obsws_python import ReqClient
+
+import config
+from audio.audio_capture import Utterance
+from audio.speech_queue import SpeechQueue
+from audio.speech_recognition import process_collected_audio
+from core.state import State
+from core.tracing import g_tracer, percentile
+from obs.connection import ObsConnection
+from tests.fakes.audio_output import FakeAudioOutput
+from tests.fakes.groq_client import FakeGroqClient
+from tests.fakes.input import RecordingBackend
+from tests.fakes.obs_server import FakeObsServer
+from tests.fakes.recognizers import EchoRecognizer
+from tests.fakes.window import FakeWindowSystem
+from utils.rivals_window import WindowTracker
+
+# Usage (from src/): python -m benchmarks.pipeline [--bursts 5] [--burst-size 8] [--gap-ms 150] [--save-baseline]
+#                    [--baseline benchmarks/baselines/pipeline.json] [--tolerance 0.15]
+# Runs the real process_collected_audio -> intents/LLM -> parser -> task scheduler -> actions path on a plain
+# Linux box. Windows, network and audio services are replaced by stand-ins with fixed latencies: an echo
+# recognizer, the fake Groq client, a local fake OBS server, a fake window system, a recording input backend and
+# a silent speaker. Bursts of a fixed utterance script are released back to back; throughput and per-utterance
+# tail latencies come from the tracing spans. With a stored baseline (written by --save-baseline on the same
+# machine and settings) the run fails if any metric regressed by more than the tolerance. Baselines are machine
+# specific and not committed, so a run without one fails too instead of passing without a check.
+
+# Utterance -> LLM reply. None means the local intent fast-path handles it.
+SCRIPT = [
+    ("firewall", None),
+    ("tell the team to group up", "Message sent. [COMMAND] message(group up, true);"),
+    ("reload then drone", None),
+    ("hit him twice and shoot him", "Engaging. [COMMAND] melee(2); fire(2);"),
+    ("save this moment and kill the replay", "Archived. [COMMAND] clip; stop_replay;"),
+    ("fire two shots", None),
+    ("what do you think of iron man", "Stark is a relic."),
+    ("clip that", None),
+]
+FALLBACK_REPLY = "Insufficient data."
+
+GAME_WINDOW = 1
+LATENCY_METRICS = ("to_action", "actions_done", "to_speech")
+LOWER_IS_BETTER = {
+    f"{metric}_{pct}": True for metric in LATENCY_METRICS for pct in ("p50", "p95", "p99")
+}
+LOWER_IS_BETTER["throughput_per_s"] = False
+
+def build_state(args: argparse.Namespace, obs_port: int) -> State:
+    replies = { text: reply for text, reply in SCRIPT if reply is not None }
+    samples_per_char = int(config.TTS_OUTPUT_RATE * args.speech_s_per_char)
+
+    def render(text: str) -> np.ndarray:
+        time.sleep(args.synth_ms / 1000)
+        return np.zeros(len(text) * samples_per_char, dtype=np.int16)
+
+    state = State()
+    state.recognizer = EchoRecognizer(args.stt_ms / 1000)
+    state.groq_client = FakeGroqClient(
+        lambda message: replies.get(message, FALLBACK_REPLY),
+        first_token_latency=args.llm_first_token_ms / 1000,
+        token_latency=args.llm_token_ms / 1000,
+    )
+    state.obs = ObsConnection(lambda: ReqClient(host="127.0.0.1", port=obs_port, password="", timeout=config.OBS_TIMEOUT_S))
+    state.window = WindowTracker(FakeWindowSystem({ GAME_WINDOW: ("Marvel Rivals", (0, 0, 1920, 1080)) }, GAME_WINDOW))
+    state.input = RecordingBackend()
+    state.speech = SpeechQueue(render, lambda: FakeAudioOutput(realtime=not args.instant_playback))
+    return state
+
+def wait_idle(state: State) -> None:
+    state.scheduler.join()
+    while True:
+        with state.speech.condition:
+            if not (state.speech.pending or state.speech.ready or state.speech.synthesizing or state.speech.playing):
+                return
+        time.sleep(0.005)
+
+def release(state: State, text: str, origins: dict[int, float]) -> threading.Thread:
+    # What on_release does, minus the keyboard and mic: one trace per utterance, processed on its own thread.
+    # The echo recognizer reads the "audio" back as the transcript.
+    encoded = text.encode("utf-8")
+    utterance = Utterance(np.frombuffer(encoded.ljust(len(encoded) + len(encoded) % 2), dtype=np.int16))
+    released_at = time.perf_counter()
+    trace_id = g_tracer.new_trace(released_at)
+    origins[trace_id] = released_at
+    thread = threading.Thread(
+        target=process_collected_audio,
+        kwargs={ "state": state, "utterance": utterance, "trace_id": trace_id },
+        daemon=True
+    )
+    thread.start()
+    return thread
+
+def utterance_metrics(origins: dict[int, float]) -> dict[str, list[float]]:
+    first: dict[tuple[int, str], float] = {}
+    last_action_end: dict[int, float] = {}
+    for span in g_tracer.snapshot():
+        if span.trace_id not in origins:
+            continue
+        if span.name in ("to_action", "to_speech"):
+            first[(span.trace_id, span.name)] = span.duration
+        elif span.name == "action":
+            end = span.start + span.duration - origins[span.trace_id]
+            last_action_end[span.trace_id] = max(last_action_end.get(span.trace_id, 0.0), end)
+
+    return {
+        "to_action": [value for (_, name), value in first.items() if name == "to_action"],
+        "to_speech": [value for (_, name), value in first.items() if name == "to_speech"],
+        "actions_done": list(last_action_end.values()),
+    }
+
+def run(args: argparse.Namespace, state: State) -> tuple[dict[str, float], float]:
+    g_tracer.spans.clear()
+    origins: dict[int, float] = {}
+    busy_time = 0.0
+    burst = [text for text, _ in itertools.islice(itertools.cycle(SCRIPT), args.burst_size)]
+
+    for _ in range(args.bursts):
+        start = time.perf_counter()
+        threads = []
+        for text in burst:
+            threads.append(release(state, text, origins))
+            time.sleep(args.gap_ms / 1000)
+        for thread in threads:
+            thread.join()
+        wait_idle(state)
+        busy_time += time.perf_counter() - start
+
+    samples = utterance_metrics(origins)
+
+    metrics = { "throughput_per_s": args.bursts * args.burst_size / busy_time }
+    for name in LATENCY_METRICS:
+        ordered = sorted(samples[name])
+        for pct, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            metrics[f"{name}_{pct}"] = percentile(ordered, q) if ordered else 0.0
+    return metrics, busy_time
+
+def settings(args: argparse.Namespace) -> dict:
+    # Baselines are only comparable when the workload and stand-in latencies match
+    keys = ("bursts", "burst_size", "gap_ms", "stt_ms", "llm_first_token_ms", "llm_token_ms", "synth_ms",
+            "obs_latency_ms", "speech_s_per_char", "instant_playback", "streaming", "seed")
+    return { key: getattr(args, key) for key in keys }
+
+def compare(metrics: dict[str, float], baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    print(f"{'metric':>20} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, value in metrics.items():
+        old = baseline["metrics"].get(name)
+        if not old:
+            continue
+        change = (value - old) / old
+        worse = change > tolerance if LOWER_IS_BETTER[name] else change < -tolerance
+        scale = 1 if name == "throughput_per_s" else 1000
+        print(f"{name:>20} {old * scale:10.2f} {value * scale:10.2f} {change:+8.1%}{'  REGRESSION' if worse else ''}")
+        if worse:
+            regressions.append(name)
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="End-to-end voice-to-action pipeline benchmark with service stand-ins")
+    parser.add_argument("--bursts", type=int, default=5)
+    parser.add_argument("--burst-size", type=int, default=len(SCRIPT), help="Utterances released per burst")
+    parser.add_argument("--gap-ms", type=float, default=150, help="Time between releases inside a burst")
+    parser.add_argument("--stt-ms", type=float, default=120)
+    parser.add_argument("--llm-first-token-ms", type=float, default=180)
+    parser.add_argument("--llm-token-ms", type=float, default=8)
+    parser.add_argument("--synth-ms", type=float, default=40)
+    parser.add_argument("--obs-latency-ms", type=float, default=5)
+    parser.add_argument("--speech-s-per-char", type=float, default=0.02, help="Fake playback length per character")
+    parser.add_argument("--instant-playback", action="store_true", help="Don't block the speaker for the line's duration")
+    parser.add_argument("--no-streaming", dest="streaming", action="store_false", help="Wait for the full LLM reply")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=Path, default=Path("benchmarks/baselines/pipeline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative regression per metric")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own console output")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    config.AI_STREAMING = args.streaming
+    config.AI_INTENT_FAST_PATH = True
+    config.AUDIO_VAD_ENABLED = False  # The echo recognizer's "audio" is text, not something to trim
+
+    server = FakeObsServer(latency=args.obs_latency_ms / 1000).start()
+    state = build_state(args, server.port)
+    state.obs.start()
+    if not state.obs.connected_once.wait(10):
+        print("[ERROR]: Never connected to the fake OBS server", file=sys.stderr)
+        sys.exit(1)
+    state.scheduler.start()
+
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        metrics, busy_time = run(args, state)
+    state.speech.stop()
+    state.obs.stop()
+    server.stop()
+
+    utterances = args.bursts * args.burst_size
+    print(f"[SYSTEM]: {utterances} utterances in {busy_time:.2f} s, {metrics['throughput_per_s']:.2f} utterances/s")
+    for name in LATENCY_METRICS:
+        print(
+            f"{name:>13}: p50 {metrics[f'{name}_p50'] * 1000:7.1f} ms  p95 {metrics[f'{name}_p95'] * 1000:7.1f} ms  "
+            f"p99 {metrics[f'{name}_p99'] * 1000:7.1f} ms"
+        )
+    print(f"[SYSTEM]: Stages:\n{g_tracer.summary()}")
+    print(f"[SYSTEM]: Task lanes:\n{state.scheduler.summary()}")
+    print(f"[SYSTEM]: Intent fast-path: {state.intent_stats.summary()}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({ "settings": settings(args), "metrics": metrics }, indent=2))
+        print(f"[SYSTEM]: Saved baseline to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"[ERROR]: No baseline at {args.baseline}, run with --save-baseline on this machine to record one", file=sys.stderr)
+        sys.exit(2)
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("settings") != settings(args):
+        print(f"[ERROR]: Baseline {args.baseline} was recorded with different settings, not comparing", file=sys.stderr)
+        sys.exit(2)
+
+    regressions = compare(metrics, baseline, args.tolerance)
+    if regressions:
+        print(f"[ERROR]: Regressed beyond {args.tolerance:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+    print(f"[SYSTEM]: No regressions beyond {args.tolerance:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+import config
+from audio.audio_capture import AudioCapture
+from audio.speech_recognition import on_press, on_release
+from benchmarks.vad import voiced
+from core.state import g_state
+from core.tracing import g_tracer, percentile
+from tests.fakes.recognizers import ScriptedRecognizer
+
+# Usage (from src/): python -m benchmarks.push_to_talk [--utterances 10] [--hold-s 1.5] [--chunk-cost-ms 4]
+#                    [--finish-ms 15] [--budget-ms 50]
+# Drives the real streaming push-to-talk path without a mic or keyboard: on_press, chunks written into the
+# capture ring in real time and fed to a scripted streaming recognizer by the capture thread, then on_release
+# and the processing thread's finish(). Reports release -> final transcript from the tracing spans next to what
+# decoding the whole utterance after release would cost. Presses follow releases back to back, so an utterance
+# is still finishing when the next one starts. Fails if any utterance lost its transcript or p95 is over budget.
+
+FINAL = "what is the enemy team doing"
+PARTIALS = ["what", "what is the", "what is the enemy", "what is the enemy team"]
+
+def hold(seconds: float, chunk: int, rng: np.random.Generator) -> None:
+    # Real-time mic: one chunk per chunk period, room noise around speech-like audio so the VAD keeps it
+    samples = rng.normal(0, 80, int(seconds * config.AUDIO_INPUT_RATE))
+    lead = int(0.2 * config.AUDIO_INPUT_RATE)
+    speech = voiced(seconds - 0.4, rng, 6000)
+    samples[lead:lead + len(speech)] += speech
+    samples = np.clip(samples, -32768, 32767).astype(np.int16)
+    period = chunk / config.AUDIO_INPUT_RATE
+    start = time.perf_counter()
+    for i, position in enumerate(range(0, len(samples) - chunk + 1, chunk)):
+        time.sleep(max(0.0, start + i * period - time.perf_counter()))
+        g_state.capture.callback(samples[position:position + chunk].tobytes(), chunk, {}, 0)
+
+def release_latencies() -> dict[int, float]:
+    # Release (end of the capture span) to the end of the stt span, per trace
+    released: dict[int, float] = {}
+    finished: dict[int, float] = {}
+    for span in g_tracer.snapshot():
+        if span.name == "capture":
+            released[span.trace_id] = span.start + span.duration
+        elif span.name == "stt":
+            finished[span.trace_id] = span.start + span.duration
+    return { trace_id: finished[trace_id] - released[trace_id] for trace_id in finished if trace_id in released }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure release-to-transcript latency of streaming push-to-talk")
+    parser.add_argument("--utterances", type=int, default=10)
+    parser.add_argument("--hold-s", type=float, default=1.5)
+    parser.add_argument("--chunk", type=int, default=config.AUDIO_INPUT_CHUNK_SIZE)
+    parser.add_argument("--chunk-cost-ms", type=float, default=4, help="Recognizer time per chunk while held")
+    parser.add_argument("--finish-ms", type=float, default=15, help="Recognizer time to finalize on release")
+    parser.add_argument("--budget-ms", type=float, default=50, help="Allowed p95 from release to final transcript")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    recognizer = ScriptedRecognizer(PARTIALS, FINAL, args.chunk_cost_ms / 1000, args.finish_ms / 1000)
+    g_state.recognizer = g_state.stream_recognizer = recognizer
+    g_state.capture = AudioCapture(config.AUDIO_INPUT_RATE, 1, config.AUDIO_MAX_UTTERANCE_S, config.AUDIO_PREROLL_S)
+    g_state.capture.start()
+    key = SimpleNamespace(char=config.PUSH_TO_TALK)
+    rng = np.random.default_rng(args.seed)
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        for _ in range(args.utterances):
+            on_press(key)
+            hold(args.hold_s, args.chunk, rng)
+            on_release(key)
+
+        # Let the last processing threads finish
+        deadline = time.perf_counter() + 5
+        while time.perf_counter() < deadline and not all(stream.finished for stream in recognizer.streams):
+            time.sleep(0.01)
+        time.sleep(0.05)
+    g_state.capture.stop()
+
+    latencies = sorted(release_latencies().values())
+    transcripts = output.getvalue().count(f"[YOU]: {FINAL}")
+    chunks = statistics.mean(stream.chunks_received for stream in recognizer.streams)
+    offline_ms = chunks * args.chunk_cost_ms + args.finish_ms
+
+    ok = True
+    if transcripts != args.utterances or len(recognizer.streams) != args.utterances or not latencies:
+        print(f"[ERROR]: {transcripts}/{args.utterances} utterances produced the final transcript", file=sys.stderr)
+        ok = False
+    else:
+        p95 = percentile(latencies, 0.95)
+        print(
+            f"[SYSTEM]: {args.utterances} utterances of {args.hold_s:g} s ({chunks:.0f} chunks each), release -> transcript "
+            f"p50 {statistics.median(latencies) * 1000:.1f} ms / p95 {p95 * 1000:.1f} ms / max {latencies[-1] * 1000:.1f} ms, "
+            f"decoding after release would take ~{offline_ms:.0f} ms"
+        )
+        if p95 * 1000 > args.budget_ms:
+            print(f"[ERROR]: p95 is over the {args.budget_ms:g} ms budget", file=sys.stderr)
+            ok = False
+    if not ok:
+        sys.exit(1)
+    print("[SYSTEM]: Every utterance kept its own stream and transcript within budget")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
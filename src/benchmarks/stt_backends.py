@@ -0,0 +1,111 @@
+import argparse
+import statistics
+import sys
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+import speech_recognition as sr
+
+import config
+from audio.recognizers import GoogleRecognizer, VoskRecognizer, RecognizerBackend
+
+# Usage (from src/): python -m benchmarks.stt_backends path/to/wav_fixtures [--backends google vosk] [--repeat 3]
+# Each fixture is a recorded utterance (.wav). An optional sidecar .txt holds the expected transcript.
+
+def load_wav(path: Path) -> bytes:
+    with wave.open(str(path), "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path.name}: expected 16-bit PCM")
+
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+        if wav.getnchannels() > 1:
+            samples = samples.reshape(-1, wav.getnchannels()).mean(axis=1).astype(np.int16)
+
+        rate = wav.getframerate()
+
+    if rate != config.AUDIO_INPUT_RATE:
+        # Match the live mic format so both backends see identical input
+        n_out = int(len(samples) * config.AUDIO_INPUT_RATE / rate)
+        positions = np.linspace(0, len(samples) - 1, n_out)
+        samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+
+    return samples.tobytes()
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def bench_backend(backend: RecognizerBackend, fixtures: list[tuple[str, bytes, str | None]], repeat: int) -> None:
+    latencies = []
+    cpu_times = []
+    correct = 0
+    labelled = 0
+    audio_seconds = 0.0
+
+    for _ in range(repeat):
+        for name, audio_data, expected in fixtures:
+            audio_seconds += len(audio_data) / 2 / config.AUDIO_INPUT_RATE
+
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            try:
+                text = backend.recognize(audio_data)
+            except sr.UnknownValueError:
+                text = ""
+            except sr.RequestError as e:
+                print(f"[ERROR]: {backend.name} request failed for {name}: {e}", file=sys.stderr)
+                continue
+            cpu_times.append(time.process_time() - cpu_start)
+            latencies.append(time.perf_counter() - wall_start)
+
+            if expected is not None:
+                labelled += 1
+                correct += text.lower().strip() == expected.lower().strip()
+
+    if not latencies:
+        print(f"{backend.name:>8}: no successful runs")
+        return
+
+    print(
+        f"{backend.name:>8}: "
+        f"mean {statistics.mean(latencies) * 1000:7.1f} ms  "
+        f"p50 {percentile(latencies, 50) * 1000:7.1f} ms  "
+        f"p95 {percentile(latencies, 95) * 1000:7.1f} ms  "
+        f"cpu {statistics.mean(cpu_times) * 1000:7.1f} ms/utt  "
+        f"cpu/audio-s {sum(cpu_times) / audio_seconds:.3f}"
+        + (f"  exact {correct}/{labelled}" if labelled else "")
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare per-utterance STT latency and CPU cost")
+    parser.add_argument("fixtures", type=Path, help="Directory of recorded .wav utterances")
+    parser.add_argument("--backends", nargs="+", default=["google", "vosk"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    fixtures = []
+    for wav_path in sorted(args.fixtures.glob("*.wav")):
+        label_path = wav_path.with_suffix(".txt")
+        expected = label_path.read_text().strip() if label_path.exists() else None
+        fixtures.append((wav_path.name, load_wav(wav_path), expected))
+
+    if not fixtures:
+        print(f"[ERROR]: No .wav fixtures found in {args.fixtures}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"[SYSTEM]: {len(fixtures)} fixtures x {args.repeat} runs")
+    for name in args.backends:
+        load_start = time.perf_counter()
+        if name == "vosk":
+            backend = VoskRecognizer(config.STT_VOSK_MODEL_PATH, config.AUDIO_INPUT_RATE)
+        else:
+            backend = GoogleRecognizer(config.AUDIO_INPUT_RATE)
+        backend.warm_up()
+        print(f"[SYSTEM]: {name} loaded in {(time.perf_counter() - load_start) * 1000:.0f} ms")
+
+        bench_backend(backend, fixtures, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import statistics
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+from pydub import AudioSegment
+
+import config
+from audio.text_to_speech import apply_voice_effects
+
+# Usage (from src/): python -m benchmarks.tts_dsp [--wav path/to/tts_output.wav] [--repeat 50]
+# Compares the NumPy voice effects against the original pydub chain, which is the reference output.
+
+def pydub_reference(pcm: np.ndarray, sample_rate: int) -> np.ndarray:
+    # Original speak_ultron processing, minus the temp file round trip
+    sound = AudioSegment(data=pcm.tobytes(), sample_width=2, frame_rate=sample_rate, channels=1)
+
+    new_sample_rate = int(sound.frame_rate * config.TTS_PITCH_MULT)
+    pitched_sound = sound._spawn(sound.raw_data, overrides={ "frame_rate": new_sample_rate })
+    pitched_sound = pitched_sound.set_frame_rate(config.TTS_OUTPUT_RATE)
+
+    echo_sound = pitched_sound + config.TTS_ECHO_GAIN_DB
+    combined = pitched_sound.overlay(echo_sound, position=config.TTS_DELAY_MS)
+    combined += config.TTS_GAIN_DB
+
+    return np.frombuffer(combined.raw_data, dtype=np.int16)
+
+def synthetic_speech(seconds: float, sample_rate: int) -> np.ndarray:
+    # Voiced harmonics under a syllable-rate envelope, roughly the spectrum and level of SAPI output
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = 110 + 15 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 12))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 0.5
+    return (voiced * envelope * 6000).astype(np.int16)
+
+def load_wav(path: Path) -> tuple[np.ndarray, int]:
+    with wave.open(str(path), "rb") as wav:
+        return np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16), wav.getframerate()
+
+def time_runs(func, pcm: np.ndarray, sample_rate: int, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(pcm, sample_rate)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark NumPy TTS voice effects against the pydub path")
+    parser.add_argument("--wav", type=Path, help="16-bit mono TTS output to process (default: synthetic 3 s clip)")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.wav:
+        pcm, sample_rate = load_wav(args.wav)
+    else:
+        sample_rate = 22050
+        pcm = synthetic_speech(args.seconds, sample_rate)
+
+    reference = pydub_reference(pcm, sample_rate)
+    result = apply_voice_effects(pcm, sample_rate)
+
+    # pydub rounds to int16 after every stage and its resampler may emit a sample more or less
+    n = min(len(reference), len(result))
+    diff = np.abs(reference[:n].astype(np.int32) - result[:n].astype(np.int32))
+    signal_power = np.mean(reference[:n].astype(np.float64) ** 2)
+    noise_power = np.mean(diff.astype(np.float64) ** 2)
+    snr = 10 * np.log10(signal_power / noise_power) if noise_power else float("inf")
+    print(f"[SYSTEM]: {len(pcm) / sample_rate:.2f} s input, output {len(result)} samples (reference {len(reference)})")
+    print(f"[SYSTEM]: max abs diff {diff.max()}, mean abs diff {diff.mean():.2f}, SNR vs reference {snr:.1f} dB")
+
+    for name, func in (("pydub", pydub_reference), ("numpy", apply_voice_effects)):
+        timings = time_runs(func, pcm, sample_rate, args.repeat)
+        print(f"{name:>6}: mean {statistics.mean(timings) * 1000:7.2f} ms  min {min(timings) * 1000:7.2f} ms")
+
+if __name__ == "__main__":
+    main()
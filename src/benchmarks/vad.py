@@ -0,0 +1,138 @@
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import speech_recognition as sr
+
+import config
+from audio.recognizers import GoogleRecognizer, VoskRecognizer
+from audio.vad import VadResult, detect_speech
+from benchmarks.stt_backends import load_wav
+
+# Usage (from src/): python -m benchmarks.vad [--fixtures path/to/wav_fixtures --backend vosk] [--repeat 20]
+# Without fixtures, runs the VAD over a labelled synthetic set: voiced bursts padded with silence and noise at
+# several levels, plus clips that must be dropped (room noise only, a key click). Reports detection accuracy,
+# boundary error, bytes trimmed and cost per audio-second. With fixtures (recorded utterances, as for
+# stt_backends) each clip is also recognized untrimmed and trimmed so the STT time saved and any transcript
+# changes are measured on real audio.
+
+RATE = config.AUDIO_INPUT_RATE
+
+Clip = tuple[str, np.ndarray, tuple[int, int] | None]  # Name, samples, speech bounds (None = no speech)
+
+def voiced(seconds: float, rng: np.random.Generator, level: float) -> np.ndarray:
+    # Harmonic buzz with a syllable-rate envelope, a crude stand-in for speech energy
+    t = np.arange(int(seconds * RATE)) / RATE
+    pitch = 110 + 20 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / RATE
+    buzz = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = 0.35 + 0.65 * np.abs(np.sin(2 * np.pi * 3.5 * t + rng.uniform(0, np.pi)))
+    return buzz * envelope * level
+
+def synthetic_clips(seed: int) -> list[Clip]:
+    rng = np.random.default_rng(seed)
+    clips = []
+    for noise in (30, 120, 400):
+        for lead_s, speech_s, tail_s in ((0.3, 1.2, 0.5), (0.8, 0.6, 1.5), (0.3, 2.5, 0.2)):
+            lead, speech = int(lead_s * RATE), int(speech_s * RATE)
+            samples = rng.normal(0, noise, lead + speech + int(tail_s * RATE))
+            samples[lead:lead + speech] += voiced(speech_s, rng, 6000)
+            clips.append((f"speech noise={noise} {lead_s}/{speech_s}/{tail_s}s", samples, (lead, lead + speech)))
+
+        clips.append((f"room noise={noise}", rng.normal(0, noise, RATE * 2), None))
+        click = rng.normal(0, noise, RATE)
+        click[RATE // 2:RATE // 2 + 400] += rng.normal(0, 8000, 400)  # 25 ms key click
+        clips.append((f"key click noise={noise}", click, None))
+
+    return [(name, np.clip(samples, -32768, 32767).astype(np.int16), bounds) for name, samples, bounds in clips]
+
+def run_vad(samples: np.ndarray) -> VadResult:
+    return detect_speech(
+        samples, RATE, config.AUDIO_VAD_FRAME_MS, config.AUDIO_VAD_MIN_RMS, config.AUDIO_VAD_NOISE_RATIO,
+        config.AUDIO_VAD_PAD_MS, config.AUDIO_VAD_MIN_SPEECH_MS,
+        config.AUDIO_NORMALIZE_PEAK if config.AUDIO_NORMALIZE else None
+    )
+
+def bench_synthetic(clips: list[Clip], repeat: int) -> bool:
+    correct = 0
+    clipped = 0
+    bytes_in = bytes_out = 0
+    audio_s = 0.0
+    elapsed = 0.0
+
+    for name, samples, bounds in clips:
+        result = run_vad(samples)
+        for _ in range(repeat - 1):
+            elapsed += run_vad(samples).elapsed
+        elapsed += result.elapsed
+        audio_s += len(samples) / RATE * repeat
+
+        ok = result.speech == (bounds is not None)
+        detail = "dropped" if not result.speech else ""
+        if result.speech and bounds is not None:
+            first = result.offset
+            last = first + len(result.samples)
+            lost = max(0, first - bounds[0]) + max(0, bounds[1] - last)
+            clipped += lost > 0
+            ok = ok and lost == 0
+            detail = f"kept {first / RATE:.2f}-{last / RATE:.2f} s of speech {bounds[0] / RATE:.2f}-{bounds[1] / RATE:.2f} s"
+        correct += ok
+        bytes_in += len(samples) * 2
+        bytes_out += len(result.samples) * 2 if result.speech else 0
+        print(f"{'ok' if ok else 'FAIL':>4}  {name:<36} {detail}")
+
+    print(
+        f"[SYSTEM]: {correct}/{len(clips)} correct, {clipped} with speech cut off, "
+        f"{1 - bytes_out / bytes_in:.0%} of bytes trimmed, {elapsed / audio_s * 1000:.3f} ms per audio-second"
+    )
+    return correct == len(clips)
+
+def bench_fixtures(fixtures: Path, backend_name: str, repeat: int) -> None:
+    backend = VoskRecognizer(config.STT_VOSK_MODEL_PATH, RATE) if backend_name == "vosk" else GoogleRecognizer(RATE)
+    backend.warm_up()
+
+    def timed(audio_data: bytes) -> tuple[str, float]:
+        start = time.perf_counter()
+        try:
+            text = backend.recognize(audio_data)
+        except sr.UnknownValueError:
+            text = ""
+        return text, time.perf_counter() - start
+
+    full_times, trimmed_times, changed = [], [], 0
+    for wav_path in sorted(fixtures.glob("*.wav")):
+        samples = np.frombuffer(load_wav(wav_path), dtype=np.int16)
+        result = run_vad(samples)
+        for _ in range(repeat):
+            full_text, full_time = timed(samples.tobytes())
+            trimmed_text, trimmed_time = timed(result.samples.tobytes()) if result.speech else ("", 0.0)
+            full_times.append(full_time)
+            trimmed_times.append(trimmed_time)
+        changed += full_text.strip().lower() != trimmed_text.strip().lower()
+        print(f"  {wav_path.name}: {result.trimmed_s:.2f} s trimmed, '{full_text}' -> '{trimmed_text}'")
+
+    if full_times:
+        print(
+            f"[SYSTEM]: {backend.name} untrimmed {statistics.mean(full_times) * 1000:.0f} ms, trimmed "
+            f"{statistics.mean(trimmed_times) * 1000:.0f} ms per utterance, {changed} transcript(s) changed"
+        )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark voice activity detection and silence trimming")
+    parser.add_argument("--fixtures", type=Path, help="Directory of recorded .wav utterances")
+    parser.add_argument("--backend", choices=["google", "vosk"], default="vosk")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    ok = bench_synthetic(synthetic_clips(args.seed), args.repeat)
+    if args.fixtures:
+        bench_fixtures(args.fixtures, args.backend, max(1, args.repeat // 10))
+    if not ok:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from game.capture import CaptureStats, RegionCapture, ReplaySource, create_frame_source
+from game.detectors import DETECTORS, ULT_REGION, VisionEngine, region_bbox
+
+# Usage (from src/): python -m benchmarks.vision_capture [--frames 600] [--change-every 30] [--live]
+# Runs the ult check over synthetic 1080p replay frames where the HUD only changes every --change-every frames
+# (as it does in game), and compares thread CPU per frame with the old path (new array + full HSV every frame).
+# CPU is projected to ms per second at typical capture rates. --live grabs the real screen instead.
+
+WIDTH, HEIGHT = 1920, 1080
+
+def synthetic_frames(count: int, change_every: int) -> list[np.ndarray]:
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 255, (HEIGHT, WIDTH, 3), dtype=np.uint8)
+    left, top, right, bottom = region_bbox((0, 0, WIDTH, HEIGHT), ULT_REGION)
+
+    frames = []
+    for i in range(count // change_every + 1):
+        frame = background.copy()
+        if i % 2:
+            frame[top:bottom, left:right] = (230, 200, 40)  # Yellow ult icon
+        else:
+            frame[top:bottom, left:right] = rng.integers(0, 80, (bottom - top, right - left, 3), dtype=np.uint8)
+        frames.extend([frame] * change_every)  # Same array repeated, no extra memory
+    return frames[:count]
+
+def legacy_check(img: np.ndarray) -> bool:
+    hsv = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2HSV)
+    mask = cv2.inRange(hsv, np.array([25, 150, 150]), np.array([50, 255, 255]))
+    return cv2.countNonZero(mask) > 50
+
+def run_new(source, frames: int) -> tuple[float, CaptureStats, VisionEngine]:
+    stats = CaptureStats()
+    engine = VisionEngine(RegionCapture(source, stats), DETECTORS)
+
+    cpu_start = time.thread_time()
+    for _ in range(frames):
+        engine.process((0, 0, WIDTH, HEIGHT))
+    stats.cpu_time = time.thread_time() - cpu_start
+    return stats.cpu_time / frames, stats, engine
+
+def run_legacy(frames_list: list[np.ndarray], frames: int, bbox) -> float:
+    left, top, right, bottom = bbox
+    cpu_start = time.thread_time()
+    for i in range(frames):
+        img = frames_list[i % len(frames_list)][top:bottom, left:right].copy()  # Fresh array per grab
+        legacy_check(img)
+    return (time.thread_time() - cpu_start) / frames
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure vision capture and detection CPU cost")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--change-every", type=int, default=30)
+    parser.add_argument("--live", action="store_true")
+    args = parser.parse_args()
+
+    bbox = region_bbox((0, 0, WIDTH, HEIGHT), ULT_REGION)
+    frames = synthetic_frames(args.frames, args.change_every)
+
+    source = create_frame_source("mss") if args.live else ReplaySource(frames)
+    cpu_per_frame, stats, engine = run_new(source, args.frames)
+    legacy_cpu = run_legacy(frames, args.frames, bbox)
+
+    print(f"[SYSTEM]: {stats.summary()}")
+    print(f"[SYSTEM]: Detectors:\n{engine.summary()}")
+    for name, per_frame in (("capture", cpu_per_frame), ("legacy", legacy_cpu)):
+        projected = "  ".join(f"{hz} Hz {per_frame * hz * 1000:6.2f} ms/s" for hz in (10, 15, 30))
+        print(f"{name:>8}: {per_frame * 1e6:8.1f} us CPU/frame  {projected}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import argparse
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from game.capture import CaptureStats, RegionCapture, ReplaySource
+from game.detectors import DETECTORS, ULT_REGION, VisionEngine, region_bbox
+
+# Usage (from src/): python -m benchmarks.vision_replay [path/to/fixtures] [--resolutions 1280x720 1920x1080 2560x1440]
+#                    [--min-precision 0.9] [--min-recall 0.9]
+# Each fixture is a full game-window screenshot (.png/.jpg) with a sidecar .txt listing the detectors that should
+# be active in it (comma separated, empty for none), or a video (.mp4/.avi) whose sidecar .txt has one such line
+# per frame. Without a fixture directory a labelled synthetic set is generated, including near misses.
+# Every fixture is rescaled to each resolution and replayed through the vision engine; the run fails if any
+# detector's precision or recall is below the minimum.
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".bmp")
+VIDEO_SUFFIXES = (".mp4", ".avi", ".mkv")
+
+Fixture = tuple[str, np.ndarray, set[str]]  # Name, RGB frame, active detectors
+
+@dataclass
+class Confusion:
+    tp: int = 0
+    fp: int = 0
+    fn: int = 0
+    tn: int = 0
+
+    def add(self, predicted: bool, expected: bool) -> None:
+        if predicted and expected:
+            self.tp += 1
+        elif predicted:
+            self.fp += 1
+        elif expected:
+            self.fn += 1
+        else:
+            self.tn += 1
+
+    def precision(self) -> float:
+        return self.tp / (self.tp + self.fp) if self.tp + self.fp else 1.0
+
+    def recall(self) -> float:
+        return self.tp / (self.tp + self.fn) if self.tp + self.fn else 1.0
+
+def parse_labels(line: str) -> set[str]:
+    return { name.strip() for name in line.split(",") if name.strip() }
+
+def load_fixtures(directory: Path) -> list[Fixture]:
+    fixtures = []
+    for path in sorted(directory.iterdir()):
+        label_path = path.with_suffix(".txt")
+        suffix = path.suffix.lower()
+        if suffix not in IMAGE_SUFFIXES + VIDEO_SUFFIXES:
+            continue
+        if not label_path.exists():
+            print(f"[ERROR]: {path.name} has no label file, skipped", file=sys.stderr)
+            continue
+        labels = label_path.read_text(encoding="utf-8").splitlines()
+
+        if suffix in IMAGE_SUFFIXES:
+            frame = cv2.imread(str(path), cv2.IMREAD_COLOR)
+            if frame is None:
+                print(f"[ERROR]: Failed to read {path.name}", file=sys.stderr)
+                continue
+            fixtures.append((path.name, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), parse_labels(labels[0] if labels else "")))
+            continue
+
+        video = cv2.VideoCapture(str(path))
+        index = 0
+        while index < len(labels):
+            ok, frame = video.read()
+            if not ok:
+                break
+            fixtures.append((f"{path.name}#{index}", cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), parse_labels(labels[index])))
+            index += 1
+        video.release()
+    return fixtures
+
+def synthetic_fixtures(count: int, width: int = 1920, height: int = 1080) -> list[Fixture]:
+    rng = np.random.default_rng(0)
+    left, top, right, bottom = region_bbox((0, 0, width, height), ULT_REGION)
+    box_height, box_width = bottom - top, right - left
+    hsv_box = np.empty((box_height, box_width, 3), dtype=np.uint8)
+
+    fixtures = []
+    for i in range(count):
+        frame = rng.integers(0, 120, (height, width, 3), dtype=np.uint8)
+        kind = i % 4
+        if kind == 0:  # Ready, hue varied across the accepted range
+            hsv_box[:] = (rng.integers(27, 48), rng.integers(170, 255), rng.integers(170, 255))
+        elif kind == 1:  # Charging, dim grey icon
+            hsv_box[:] = (0, 0, rng.integers(40, 120))
+        elif kind == 2:  # Near miss, orange instead of yellow
+            hsv_box[:] = (rng.integers(10, 20), 220, 230)
+        else:  # Near miss, a few yellow pixels below the pixel threshold
+            hsv_box[:] = (0, 0, 60)
+            hsv_box[:5, :5] = (35, 220, 230)
+        frame[top:bottom, left:right] = cv2.cvtColor(hsv_box, cv2.COLOR_HSV2RGB)
+        fixtures.append((f"synthetic-{i}", frame, { "ult_ready" } if kind == 0 else set()))
+    return fixtures
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def run_resolution(fixtures: list[Fixture], width: int, height: int) -> dict[str, Confusion]:
+    frames = [cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA) for _, frame, _ in fixtures]
+    engine = VisionEngine(RegionCapture(ReplaySource(frames, loop=False), CaptureStats()), DETECTORS)
+    confusion = { detector.name: Confusion() for detector in DETECTORS }
+    latencies = []
+
+    tracemalloc.start()
+    for _, _, expected in fixtures:
+        start = time.perf_counter()
+        engine.process((0, 0, width, height))
+        latencies.append(time.perf_counter() - start)
+
+        for name, matrix in confusion.items():
+            matrix.add(engine.active[name], name in expected)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{width}x{height}: {len(frames)} frames, latency p50 {percentile(latencies, 50) * 1000:.3f} ms  "
+        f"p95 {percentile(latencies, 95) * 1000:.3f} ms  p99 {percentile(latencies, 99) * 1000:.3f} ms, "
+        f"peak alloc {peak / 1024:.0f} KiB"
+    )
+    for name, matrix in confusion.items():
+        print(
+            f"  {name}: precision {matrix.precision():.3f}  recall {matrix.recall():.3f}  "
+            f"(tp {matrix.tp}, fp {matrix.fp}, fn {matrix.fn}, tn {matrix.tn})"
+        )
+    return confusion
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay labelled frames through the vision detectors")
+    parser.add_argument("fixtures", type=Path, nargs="?")
+    parser.add_argument("--resolutions", nargs="+", default=["1280x720", "1920x1080", "2560x1440"])
+    parser.add_argument("--synthetic", type=int, default=200, help="Synthetic frames when no fixtures are given")
+    parser.add_argument("--min-precision", type=float, default=0.9)
+    parser.add_argument("--min-recall", type=float, default=0.9)
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else synthetic_fixtures(args.synthetic)
+    if not fixtures:
+        print("[ERROR]: No labelled fixtures found", file=sys.stderr)
+        sys.exit(1)
+
+    failed = False
+    for resolution in args.resolutions:
+        width, height = (int(value) for value in resolution.split("x"))
+        for name, matrix in run_resolution(fixtures, width, height).items():
+            if matrix.precision() < args.min_precision or matrix.recall() < args.min_recall:
+                print(f"[ERROR]: {name} below minimum accuracy at {resolution}", file=sys.stderr)
+                failed = True
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
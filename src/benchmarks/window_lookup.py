@@ -0,0 +1,59 @@
+import argparse
+import statistics
+import time
+
+from tests.fakes.window import FakeWindowSystem
+from utils.rivals_window import WindowTracker, Win32WindowSystem
+
+# Usage (from src/): python -m benchmarks.window_lookup [--windows 300] [--ticks 2000] [--win32]
+# Compares the old per-call window search (EnumWindows + title check every time) with the cached tracker, using
+# the per-tick pattern of the vision loop (foreground check, then geometry). Runs on a fake window list unless
+# --win32 is given, in which case the real desktop is used and a window with "rivals" in its title must exist.
+
+def enumerate_every_call(system, title_match: str) -> tuple[int, int, int, int] | None:
+    for hwnd, title in system.enum_windows():
+        if title_match in title.lower():
+            system.foreground_window()
+            return system.client_rect(hwnd)
+    return None
+
+def time_ticks(tick, ticks: int) -> list[float]:
+    samples = []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        tick()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def report(name: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p99 = ordered[int(0.99 * (len(ordered) - 1))]
+    print(f"{name:>10}: mean {statistics.mean(ordered) * 1e6:8.1f} us  p99 {p99 * 1e6:8.1f} us")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure game window lookup cost per vision tick")
+    parser.add_argument("--windows", type=int, default=300)
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--win32", action="store_true")
+    args = parser.parse_args()
+
+    if args.win32:
+        system = Win32WindowSystem()
+    else:
+        windows = { hwnd: (f"Window {hwnd}", (0, 0, 800, 600)) for hwnd in range(1, args.windows) }
+        windows[args.windows] = ("Marvel Rivals", (0, 0, 1920, 1080))  # Last in z-order, the worst case
+        system = FakeWindowSystem(windows, foreground=args.windows)
+
+    report("uncached", time_ticks(lambda: enumerate_every_call(system, "rivals"), args.ticks))
+
+    tracker = WindowTracker(system)
+
+    def tick() -> None:
+        if tracker.is_active():
+            tracker.client_rect()
+
+    report("tracker", time_ticks(tick, args.ticks))
+    print(f"[SYSTEM]: Tracker: {tracker.summary()}")
+
+if __name__ == "__main__":
+    main()
@@ -1,49 +1,56 @@
 import sys
 
 from core.state import State
+from core.task_manager import task_chain
+from core.tracing import g_tracer
 from commands.base_commands import handle_press, handle_right_click, handle_delay
 from commands.chat_commands import handle_message
 from commands.game_commands import handle_fly, handle_melee, handle_fire_ray, handle_nano_ray, handle_insta_lock
-from commands.obs_commands import handle_start_recording, handle_stop_recording, handle_start_replay, handle_stop_replay, handle_save_clip
-from commands.system_commands import handle_shutdown
+from commands.grammar import Command, CommandParseError, parse_command_chain
+from commands.obs_commands import OBS_COMMANDS, handle_obs_commands, handle_start_recording, handle_stop_recording, handle_start_replay, handle_stop_replay, handle_save_clip
+from commands.system_commands import handle_shutdown, handle_cancel
 
+# Handlers receive the typed, range-clamped args from the grammar (see commands/spec.py)
 COMMANDS = {
-    "press(": (handle_press, len("press(")),
-    "rmb": (handle_right_click, len("rmb")),
-    "delay(": (handle_delay, len("delay(")),
-    "message(": (handle_message, len("message(")),
-    "melee(": (handle_melee, len("melee(")),
-    "fly": (handle_fly, len("fly")),
-    "fire(": (handle_fire_ray, len("fire(")),
-    "nano(": (handle_nano_ray, len("nano(")),
-    "lock": (handle_insta_lock, len("lock")),
-    "start_rec": (handle_start_recording, len("start_rec")),
-    "stop_rec": (handle_stop_recording, len("stop_rec")),
-    "start_replay": (handle_start_replay, len("start_replay")),
-    "stop_replay": (handle_stop_replay, len("stop_replay")),
-    "clip": (handle_save_clip, len("clip")),
-    "shutdown": (handle_shutdown, len("shutdown")),
+    "press": handle_press,
+    "rmb": handle_right_click,
+    "delay": handle_delay,
+    "message": handle_message,
+    "melee": handle_melee,
+    "fly": handle_fly,
+    "fire": handle_fire_ray,
+    "nano": handle_nano_ray,
+    "lock": handle_insta_lock,
+    "start_rec": handle_start_recording,
+    "stop_rec": handle_stop_recording,
+    "start_replay": handle_start_replay,
+    "stop_replay": handle_stop_replay,
+    "clip": handle_save_clip,
+    "shutdown": handle_shutdown,
+    "cancel": handle_cancel,
 }
 
+def execute_commands(state: State, commands: list[Command]) -> None:
+    with task_chain(state):
+        i = 0
+        while i < len(commands):
+            if commands[i].name in OBS_COMMANDS:
+                # Runs of OBS commands are sent as one batch
+                j = i
+                while j < len(commands) and commands[j].name in OBS_COMMANDS:
+                    j += 1
+                handle_obs_commands(state, [command.name for command in commands[i:j]])
+                i = j
+            else:
+                COMMANDS[commands[i].name](state, *commands[i].args)
+                i += 1
+
 def processs_command_string(state: State, command_string: str) -> None:
-    commands = command_string.split(";")
+    try:
+        with g_tracer.span("parse"):
+            commands = parse_command_chain(command_string)
+    except CommandParseError as e:
+        print(f"Warning: Rejected command chain, nothing was queued ({e}): {command_string}", file=sys.stderr)
+        return
     
-    for cmd in commands:
-        cmd = cmd.strip()
-        if not cmd:
-            continue
-        
-        handled = False
-        for prefix, (handler, prefix_len) in COMMANDS.items():
-            if cmd.startswith(prefix):
-                if cmd.endswith(")"):
-                    args_string = cmd[prefix_len:-1]
-                    handler(state, args_string)
-                else:
-                    handler(state)
-                handled = True
-                break
-            
-        if not handled:
-            print(f"Warning: Unknown command or invalid format: {cmd}", file=sys.stderr)
-                    
\ No newline at end of file
+    execute_commands(state, commands)
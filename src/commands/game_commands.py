@@ -1,33 +1,19 @@
-import sys
-
 from core.state import State
-from core.task_manager import add_task
-from game.actions import fly, press_key, melee, fire_ray, nano_ray, insta_lock
+from core.task_manager import add_task, add_timeline, LANE_MOUSE
+from game.actions import insta_lock
+from game.combat_timelines import fly_timeline, press_key_timeline, melee_timeline, fire_ray_timeline, nano_ray_timeline
 
 def handle_fly(state: State) -> None:
-    add_task(state, fly, (state,))
+    add_timeline(state, fly_timeline())
 
-def handle_melee(state: State, n_str: str) -> None:
-    try:
-        n = max(0, min(10, int(n_str)))
-        add_task(state, melee, (state, n))
-    except ValueError:
-        print(f"Warning: Invalid n for melee command: {n_str}", file=sys.stderr)
+def handle_melee(state: State, n: int) -> None:
+    add_timeline(state, melee_timeline(n))
 
-def handle_fire_ray(state: State, n_str: str) -> None:
-    try:
-        n = max(0, min(6, int(n_str)))
-        add_task(state, fire_ray, (n,))
-    except ValueError:
-        print(f"Warning: Invalid n for fire ray command: {n_str}", file=sys.stderr)
+def handle_fire_ray(state: State, n: int) -> None:
+    add_timeline(state, fire_ray_timeline(n))
 
-def handle_nano_ray(state: State, duration_str: str) -> None:
-    try:
-        duration = max(0, min(8, int(duration_str)))
-        add_task(state, press_key, (state, "c",))
-        add_task(state, nano_ray, (duration,))
-    except ValueError:
-        print(f"Warning: Invalid duration for nano ray command: {duration_str}")
+def handle_nano_ray(state: State, duration: int) -> None:
+    add_timeline(state, press_key_timeline("c").then(nano_ray_timeline(duration)))
 
 def handle_insta_lock(state: State) -> None:
-    add_task(state, insta_lock, (state,))
\ No newline at end of file
+    add_task(state, insta_lock, (state,), LANE_MOUSE)
\ No newline at end of file
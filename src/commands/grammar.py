@@ -0,0 +1,91 @@
+import re
+from dataclasses import dataclass
+
+from commands.spec import COMMAND_SPECS, KEY_NAMES, PARAM_INT, PARAM_FLOAT, PARAM_KEY, PARAM_TEXT, PARAM_BOOL, CommandSpec, Param
+
+ArgValue = int | float | str | bool
+
+@dataclass
+class Command:
+    name: str
+    args: tuple[ArgValue, ...] = ()
+
+class CommandParseError(ValueError):
+    def __init__(self, message: str, position: int) -> None:
+        super().__init__(f"{message} at position {position}")
+        self.position = position
+
+ARG_PATTERNS = {
+    PARAM_INT: r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)",  # Decimals are rounded, e.g. nano(4.5) from the LLM
+    PARAM_FLOAT: r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)",
+    PARAM_KEY: r"\w+",
+    PARAM_TEXT: r".*?",  # Lazy, so it ends at the first ", <bool>)" that closes the command
+    PARAM_BOOL: r"(?i:true|false)",
+}
+
+def _command_token(spec: CommandSpec) -> str:
+    if spec.params:
+        args = r"\s*,\s*".join(f"({ARG_PATTERNS[param.kind]})" for param in spec.params)
+        body = rf"\(\s*{args}\s*\)"
+    else:
+        body = r"(?:\(\s*\))?"
+    # The terminator is part of the token, so text args can contain semicolons and a bad tail rejects the command
+    return f"({re.escape(spec.name)}{body})" + r"\s*(?:;|$)"
+
+def _build_scanner() -> tuple[re.Pattern, dict[int, tuple[str, tuple[tuple[Param, int], ...]]]]:
+    # One alternation over every command token, so each command is a single regex match. The outer group of the
+    # alternative that matched is the last one to close, so match.lastindex identifies the command.
+    tokens = []
+    commands = {}
+    group = 0
+    for spec in sorted(COMMAND_SPECS, key=lambda spec: -len(spec.name)):  # Longest first, e.g. stop_replay before stop_rec
+        tokens.append(_command_token(spec))
+        commands[group + 1] = (spec.name, tuple((param, group + 2 + i) for i, param in enumerate(spec.params)))
+        group += 1 + len(spec.params)
+    tokens.append(r"(?:;|$)")  # Empty segment
+    return re.compile(r"\s*(?:" + "|".join(tokens) + ")", re.DOTALL), commands
+
+COMMAND_SCANNER, SCANNER_COMMANDS = _build_scanner()
+
+def _clamp(value: float, param: Param) -> float:
+    if param.low is not None:
+        value = max(param.low, value)
+    if param.high is not None:
+        value = min(param.high, value)
+    return value
+
+def _convert(param: Param, raw: str, position: int) -> ArgValue:
+    if param.kind == PARAM_INT:
+        return int(_clamp(round(float(raw)), param))
+    if param.kind == PARAM_FLOAT:
+        return float(_clamp(float(raw), param))
+    if param.kind == PARAM_KEY:
+        if (len(raw) == 1 and raw.isalnum()) or raw in KEY_NAMES:
+            return raw
+        raise CommandParseError(f"Unknown key '{raw}'", position)
+    if param.kind == PARAM_BOOL:
+        return raw.lower() == "true"
+    return raw.strip().strip("\"'")
+
+def parse_command_chain(text: str) -> list[Command]:
+    # Validates the whole chain before returning, so a malformed chain queues nothing
+    commands = []
+    position = 0
+    while position < len(text):
+        match = COMMAND_SCANNER.match(text, position)
+        if match is None:
+            fragment = text[position:].split(";", 1)[0].strip()
+            raise CommandParseError(f"Unknown command or invalid format '{fragment}'", position)
+
+        if match.lastindex is not None:
+            name, params = SCANNER_COMMANDS[match.lastindex]
+            if params:
+                commands.append(Command(name, tuple([_convert(param, match[i], match.start(i)) for param, i in params])))
+            else:
+                commands.append(Command(name))
+        position = match.end()
+    return commands
+
+def format_command(command: Command) -> str:
+    args = ", ".join(str(arg).lower() if isinstance(arg, bool) else str(arg) for arg in command.args)
+    return f"{command.name}({args})" if command.args else command.name
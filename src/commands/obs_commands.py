@@ -1,18 +1,23 @@
 from core.state import State
-from core.task_manager import add_task
-from game.actions import obs_start_recording, obs_stop_recording, obs_start_replay, obs_stop_replay, obs_save_clip
+from core.task_manager import add_task, LANE_SYSTEM
+from obs.obs_client import OBS_ACTIONS, obs_run
+
+OBS_COMMANDS = frozenset(OBS_ACTIONS)
+
+def handle_obs_commands(state: State, names: list[str]) -> None:
+    add_task(state, obs_run, (state, names), LANE_SYSTEM)
 
 def handle_start_recording(state: State) -> None:
-    add_task(state, obs_start_recording, (state,))
+    handle_obs_commands(state, ["start_rec"])
     
 def handle_stop_recording(state: State) -> None:
-    add_task(state, obs_stop_recording, (state,))
+    handle_obs_commands(state, ["stop_rec"])
     
 def handle_start_replay(state: State) -> None:
-    add_task(state, obs_start_replay, (state,))
+    handle_obs_commands(state, ["start_replay"])
     
 def handle_stop_replay(state: State) -> None:
-    add_task(state, obs_stop_replay, (state,))
+    handle_obs_commands(state, ["stop_replay"])
     
 def handle_save_clip(state: State) -> None:
-    add_task(state, obs_save_clip, (state,))
\ No newline at end of file
+    handle_obs_commands(state, ["clip"])
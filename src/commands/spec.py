@@ -0,0 +1,44 @@
+from dataclasses import dataclass, field
+
+from game.keys import KEY_NAMES
+
+PARAM_INT = "int"
+PARAM_FLOAT = "float"
+PARAM_KEY = "key"
+PARAM_TEXT = "text"  # Free text, may contain ; , and ) (only valid as the first of two params, before a bool)
+PARAM_BOOL = "bool"
+
+@dataclass(frozen=True)
+class Param:
+    name: str
+    kind: str
+    low: float | None = None  # Out-of-range numbers are clamped, not rejected
+    high: float | None = None
+
+@dataclass(frozen=True)
+class CommandSpec:
+    name: str
+    description: str
+    params: tuple[Param, ...] = field(default_factory=tuple)
+
+# Single source of truth for command syntax, shared by the parser and the LLM prompt
+COMMAND_SPECS: tuple[CommandSpec, ...] = (
+    CommandSpec("press", "Press a key", (Param("key", PARAM_KEY),)),
+    CommandSpec("rmb", "Firewall"),
+    CommandSpec("fly", "Dynamic Flight"),
+    CommandSpec("melee", "Melee N times", (Param("N", PARAM_INT, 1, 10),)),
+    CommandSpec("fire", "Fire N shots", (Param("N", PARAM_INT, 1, 6),)),
+    CommandSpec("delay", "Delay T seconds", (Param("T", PARAM_FLOAT, 0.1, 10),)),
+    CommandSpec("nano", "Nano ray T seconds", (Param("T", PARAM_INT, 1, 8),)),
+    CommandSpec("lock", "Insta-lock Ultron"),
+    CommandSpec("message", "Send a chat message, true for team chat, false for match chat", (Param("text", PARAM_TEXT), Param("team", PARAM_BOOL))),
+    CommandSpec("start_rec", "Start OBS recording"),
+    CommandSpec("stop_rec", "Stop OBS recording"),
+    CommandSpec("start_replay", "Start OBS replay buffer"),
+    CommandSpec("stop_replay", "Stop OBS replay buffer"),
+    CommandSpec("clip", "Save clip / replay"),
+    CommandSpec("cancel", "Cancel pending combat actions"),
+    CommandSpec("shutdown", "Initiate program termination"),
+)
+
+SPECS_BY_NAME = { spec.name: spec for spec in COMMAND_SPECS }
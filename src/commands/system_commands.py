@@ -1,6 +1,9 @@
 from core.state import State
-from core.task_manager import add_task
+from core.task_manager import add_task, flush_combat_tasks, LANE_SYSTEM
 from game.actions import shutdown
 
 def handle_shutdown(state: State) -> None:
-    add_task(state, shutdown, (state,))
\ No newline at end of file
+    add_task(state, shutdown, (state,), LANE_SYSTEM)
+
+def handle_cancel(state: State) -> None:
+    flush_combat_tasks(state)  # Runs immediately, not queued behind the actions it cancels
\ No newline at end of file
@@ -3,16 +3,79 @@ from dotenv import load_dotenv
 load_dotenv()
 
 PUSH_TO_TALK = "u"
+LISTEN_MODE = "push_to_talk"  # push_to_talk, or wake (hands-free: say WAKE_PHRASE, then the command)
+WAKE_PHRASE = "ultron"
+WAKE_SPOTTER = "vosk"  # Keyword spotter for wake mode, uses the Vosk model from STT_VOSK_MODEL_PATH (requires vosk)
+WAKE_GATE_RMS = 500  # The spotter only runs on audio louder than this (int16 RMS per 20 ms frame)
+WAKE_GATE_HANGOVER_S = 0.3  # Keep feeding the spotter this long after the last loud frame
+WAKE_END_SILENCE_S = 0.7  # A command ends after this much quiet
+WAKE_MAX_COMMAND_S = 6.0
 
 AUDIO_INPUT_CHANNELS = 1
 AUDIO_INPUT_RATE = 16000
-AUDIO_INPUT_CHUNK_SIZE = 4096
+AUDIO_INPUT_CHUNK_SIZE = 1024  # Frames per capture callback, also how late the last audio before a release can be
+AUDIO_PREROLL_S = 0.3  # Audio from just before push-to-talk is included so the first syllable isn't clipped
+AUDIO_MAX_UTTERANCE_S = 15.0  # Longer holds keep only the most recent part, capture memory is fixed by this
+AUDIO_VAD_ENABLED = True  # Trim leading/trailing silence before STT, skip STT and the LLM when there's no speech
+AUDIO_VAD_FRAME_MS = 20
+AUDIO_VAD_MIN_RMS = 300  # int16 RMS a frame needs to count as speech, whatever the noise floor
+AUDIO_VAD_NOISE_RATIO = 3.0  # ...and how far above the utterance's own quietest frames it must be
+AUDIO_VAD_PAD_MS = 150  # Kept either side of the detected speech
+AUDIO_VAD_MIN_SPEECH_MS = 120  # Less voiced audio than this counts as no speech
+AUDIO_NORMALIZE = False  # Scale trimmed speech to AUDIO_NORMALIZE_PEAK before recognition
+AUDIO_NORMALIZE_PEAK = 0.7  # Fraction of full scale
+
+STT_BACKEND = "google"  # "google" (online) or "vosk" (local CPU, requires vosk)
+STT_STREAMING = False  # Recognize while push-to-talk is held (requires a streaming backend such as vosk)
+STT_VOSK_MODEL_PATH = ""  # Path to an unpacked Vosk model, empty downloads the default en-us model
+
+INPUT_SPIN_S = 0.001  # Busy-wait the last stretch before each input deadline instead of sleeping
+INPUT_BACKEND = "sendinput"  # sendinput (Win32 scan codes, batched) or pynput
+
+WINDOW_ENUM_RETRY_S = 1.0  # While the game window is missing, search for it at most this often
+WINDOW_RECT_REFRESH_S = 1.0  # Re-read the cached window geometry after this long
+
+VISION_CAPTURE = "mss"  # mss (persistent grabber) or pil
+VISION_RATE_HZ = 15  # HUD checks per second while the game is focused
+
+OBS_TIMEOUT_S = 3.0  # Connect and per-request socket timeout
+OBS_RECONNECT_MIN_S = 1.0  # Reconnect backoff doubles from here while OBS is unreachable
+OBS_RECONNECT_MAX_S = 30.0
+OBS_PING_INTERVAL_S = 5.0  # Health check while connected
 
 TTS_VOICE = r"HKEY_LOCAL_MACHINE\SOFTWARE\Microsoft\Speech\Voices\Tokens\TTS_MS_EN-US_DAVID_11.0"  # Must be installed
 TTS_RATE = 170
 TTS_PITCH_MULT = 0.96
 TTS_DELAY_MS = 80
+TTS_ECHO_GAIN_DB = -8
+TTS_GAIN_DB = 2
+TTS_OUTPUT_RATE = 44100
+TTS_STALE_S = 4.0  # Replies still waiting to be spoken after this long are dropped
+TTS_PLAYBACK_CHUNK = 2048  # Samples per write, bounds how quickly an alert can cut in
+TTS_CACHE_ENABLED = True  # Keep processed audio for fixed and repeated lines
+TTS_CACHE_DIR = "tts_cache"
+TTS_CACHE_MAX_MB = 32
 
+AI_INTENT_FAST_PATH = True  # Handle known phrases locally without calling the LLM
 AI_MODEL_NAME = "llama3-8b-8192"
 AI_TEMPERATURE = 0.8
-AI_COMMAND_DELIMITER = " [COMMAND] "
\ No newline at end of file
+AI_HEDGE_MODEL_NAME = "llama-3.1-8b-instant"  # Faster model raced against AI_MODEL_NAME when it is slow ("" = no hedging)
+AI_HEDGE_DELAY_S = 0.6  # Head start for AI_MODEL_NAME before the hedge request is sent, roughly its p95 first token
+AI_DEADLINE_S = 2.0  # No first token by then (whole reply when not streaming) = answer with the local rules instead (0 = wait)
+AI_REQUEST_TIMEOUT_S = 10.0  # Bounds abandoned and slow-streaming requests, well past the deadline
+AI_CONNECT_TIMEOUT_S = 2.0
+AI_KEEPALIVE_S = 300  # Keep the idle API connection open between utterances
+AI_BASE_URL = ""  # Override the API endpoint, e.g. the local stand-in in tests/fakes/llm_server.py
+AI_MAX_TOKENS = 128  # Replies are 1-2 sentences plus commands, caps runaway completions
+AI_HISTORY_TURNS = 0  # Recent exchanges sent as context (0 = stateless, smallest and fastest prompt)
+AI_HISTORY_TOKENS = 400  # Token budget for those exchanges, the oldest are dropped first (cached replies ignore history)
+AI_COMMAND_DELIMITER = " [COMMAND] "
+AI_CACHE_ENABLED = True  # Reuse replies for repeated utterances instead of calling the LLM again
+AI_CACHE_PATH = "response_cache.json"
+AI_CACHE_MAX_ENTRIES = 256
+AI_CACHE_TTL_S = 7 * 24 * 60 * 60
+AI_STREAMING = True  # Dispatch commands and start speaking while the completion is still streaming
+
+TRACE_ENABLED = True  # Per-utterance latency spans, summarized with p50/p95/p99 on shutdown
+TRACE_RING_SIZE = 4096  # Most recent spans kept in memory
+TRACE_JSONL_PATH = ""  # Append the kept spans to this JSONL file on shutdown, empty disables
\ No newline at end of file
@@ -0,0 +1,211 @@
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Tuple
+
+from core.tracing import g_tracer
+
+LANE_KEYBOARD = "keyboard"
+LANE_MOUSE = "mouse"
+LANE_CHAT = "chat"
+LANE_SYSTEM = "system"  # OBS and app lifecycle
+LANES = (LANE_KEYBOARD, LANE_MOUSE, LANE_CHAT, LANE_SYSTEM)
+COMBAT_LANES = (LANE_KEYBOARD, LANE_MOUSE)
+
+@dataclass(eq=False)
+class Task:
+    func: Callable
+    args: Tuple
+    lane: str
+    after: "Task | None" = None  # Previous task in the same command chain, possibly on another lane
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    started_at: float | None = None
+    cancelled: bool = False
+    trace_id: int | None = None  # Utterance that queued it
+    done: threading.Event = field(default_factory=threading.Event)
+    stop: threading.Event = field(default_factory=threading.Event)  # Set on cancel so a running task can end early
+    dependents: list["Task"] = field(default_factory=list)  # Next tasks in the chain, queued once this one is done
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        self.stop.set()
+
+@dataclass
+class LaneMetrics:
+    completed: int = 0
+    cancelled: int = 0
+    failed: int = 0
+    total_wait: float = 0  # Seconds between enqueue and start
+    max_wait: float = 0
+
+    def summary(self, depth: int) -> str:
+        avg_wait_ms = self.total_wait / self.completed * 1000 if self.completed else 0.0
+        return (
+            f"{self.completed} done, {self.cancelled} cancelled, {self.failed} failed, depth {depth}, "
+            f"wait avg {avg_wait_ms:.1f} ms / max {self.max_wait * 1000:.1f} ms"
+        )
+
+class Scheduler:
+    # One FIFO worker per input lane so unrelated actions (e.g. an OBS clip during a nano ray) run in parallel.
+    # Tasks in a chain are parked until the previous task in that chain is done and only then queued on their lane,
+    # so chains keep their order across lanes without a worker sitting idle on another lane's task.
+    def __init__(self) -> None:
+        self.queues: dict[str, queue.Queue] = { lane: queue.Queue() for lane in LANES }
+        self.metrics: dict[str, LaneMetrics] = { lane: LaneMetrics() for lane in LANES }
+        self.metrics_lock = threading.Lock()
+        self.chains = threading.Condition()  # Guards parked tasks, dependents and the unfinished count
+        self.parked: dict[str, set[Task]] = { lane: set() for lane in LANES }  # Waiting on their chain
+        self.unfinished = 0
+        self.running: dict[str, Task | None] = { lane: None for lane in LANES }
+        self.chain_context = threading.local()
+        self.worker_context = threading.local()
+        self.threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        if self.threads:
+            return
+        for lane in LANES:
+            thread = threading.Thread(target=self._worker, args=(lane,), name=f"task-{lane}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, func: Callable, args: Tuple, lane: str | None = None) -> Task:
+        chain_tail = getattr(self.chain_context, "tail", None)
+        if lane is None:
+            # Lane-less tasks (delays) stay on the lane of the action they follow
+            lane = chain_tail.lane if chain_tail else LANE_KEYBOARD
+
+        task = Task(func, args, lane, after=chain_tail, trace_id=g_tracer.current())
+        if getattr(self.chain_context, "depth", 0):
+            self.chain_context.tail = task
+
+        with self.chains:
+            self.unfinished += 1
+            if chain_tail is not None and not chain_tail.done.is_set():
+                chain_tail.dependents.append(task)
+                self.parked[lane].add(task)
+                return task
+        self.queues[lane].put(task)
+        return task
+
+    def begin_chain(self) -> None:
+        depth = getattr(self.chain_context, "depth", 0)
+        if depth == 0:
+            self.chain_context.tail = None
+        self.chain_context.depth = depth + 1
+
+    def in_chain(self) -> bool:
+        return getattr(self.chain_context, "depth", 0) > 0
+
+    def end_chain(self) -> None:
+        self.chain_context.depth -= 1
+        if self.chain_context.depth == 0:
+            self.chain_context.tail = None
+
+    def current_task(self) -> Task | None:
+        # Task being run by the calling worker thread, if any
+        return getattr(self.worker_context, "task", None)
+
+    def join(self, timeout: float | None = None) -> bool:
+        # Waits until every submitted task has run or been dropped, parked ones included
+        with self.chains:
+            return self.chains.wait_for(lambda: self.unfinished == 0, timeout)
+
+    def flush(self, lanes: Tuple[str, ...] = COMBAT_LANES) -> int:
+        flushed = 0
+        with self.chains:
+            for lane in lanes:
+                for task in list(self.parked[lane]):
+                    if task in self.parked[lane]:  # Not already released by an earlier one
+                        self.parked[lane].discard(task)
+                        task.cancel()
+                        self._record(lane, cancelled=True)
+                        self._finish(task)
+                        flushed += 1
+
+                # A running timeline (e.g. a nano ray holding the mouse) sees the stop, releases what it holds and ends
+                running_task = self.running[lane]
+                if running_task is not None and not running_task.done.is_set():
+                    running_task.cancel()
+                    flushed += 1
+
+                while True:
+                    try:
+                        task = self.queues[lane].get_nowait()
+                    except queue.Empty:
+                        break
+                    task.cancel()
+                    self._record(lane, cancelled=True)
+                    self._finish(task)
+                    self.queues[lane].task_done()
+                    flushed += 1
+
+        # Commands after a cancel in the same chain start over instead of being dropped with the cancelled tail
+        chain_tail = getattr(self.chain_context, "tail", None)
+        if chain_tail is not None and chain_tail.cancelled:
+            self.chain_context.tail = None
+        return flushed
+
+    def depth(self, lane: str) -> int:
+        return self.queues[lane].qsize() + len(self.parked[lane])
+
+    def summary(self) -> str:
+        with self.metrics_lock:
+            return "\n".join(f"  {lane}: {self.metrics[lane].summary(self.depth(lane))}" for lane in LANES)
+
+    def _record(self, lane: str, wait: float = 0.0, cancelled: bool = False, failed: bool = False) -> None:
+        with self.metrics_lock:
+            metrics = self.metrics[lane]
+            if cancelled:
+                metrics.cancelled += 1
+                return
+            metrics.completed += 1
+            metrics.failed += failed
+            metrics.total_wait += wait
+            metrics.max_wait = max(metrics.max_wait, wait)
+
+    def _finish(self, task: Task) -> None:
+        # Marks a task done and queues the chain tasks parked on it; they are dropped by their worker if it was cancelled
+        with self.chains:
+            task.done.set()
+            self.unfinished -= 1
+            for dependent in task.dependents:
+                if dependent in self.parked[dependent.lane]:
+                    self.parked[dependent.lane].discard(dependent)
+                    self.queues[dependent.lane].put(dependent)
+            task.dependents.clear()
+            if self.unfinished == 0:
+                self.chains.notify_all()
+
+    def _worker(self, lane: str) -> None:
+        task_queue = self.queues[lane]
+        while True:
+            task = task_queue.get()
+            if task.after is not None and task.after.cancelled:
+                task.cancel()  # The rest of a broken chain is dropped too
+
+            if task.cancelled:
+                self._record(lane, cancelled=True)
+            else:
+                task.started_at = time.perf_counter()
+                g_tracer.record("queue_wait", task.enqueued_at, task.started_at, task.trace_id)
+                g_tracer.milestone("to_action", task.trace_id)
+                failed = False
+                self.running[lane] = self.worker_context.task = task
+                try:
+                    task.func(*task.args)
+                except Exception as e:
+                    failed = True
+                    print(f"Task failed: {e}", file=sys.stderr)
+                finally:
+                    self.running[lane] = self.worker_context.task = None
+                g_tracer.record("action", task.started_at, time.perf_counter(), task.trace_id)
+                if task.cancelled:
+                    self._record(lane, cancelled=True)  # Stopped partway by a flush
+                else:
+                    self._record(lane, task.started_at - task.enqueued_at, failed=failed)
+
+            self._finish(task)
+            task_queue.task_done()
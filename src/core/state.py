@@ -1,14 +1,32 @@
+from __future__ import annotations
+
 import threading
-import queue
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import config
+from ai.conversation import Conversation, LlmStats
+from ai.intents import IntentStats
+from audio.vad import VadStats
+from core.scheduler import Scheduler
+from game.capture import CaptureStats
+from game.timeline import TimelineStats
 
-from groq import Groq
-from obsws_python import ReqClient
-import pyaudio
-from pynput.keyboard import Controller as KeyController
-from pynput.mouse import Controller as MouseController
-import pyttsx3
-import speech_recognition as sr
+if TYPE_CHECKING:
+    # Types only; the modules themselves are imported by the subsystems that create these objects at startup
+    import pyaudio
+    from groq import Groq
+
+    from ai.response_cache import ResponseCache
+    from audio.audio_capture import AudioCapture
+    from audio.phrase_cache import PhraseCache
+    from audio.recognizers import RecognizerBackend, RecognizerStream, StreamingRecognizer
+    from audio.speech_queue import SpeechQueue
+    from audio.wake_word import WakeListener
+    from game.detectors import VisionEngine
+    from game.input_backend import InputBackend
+    from obs.connection import ObsConnection
+    from utils.rivals_window import WindowTracker
 
 @dataclass
 class State:
@@ -17,34 +35,46 @@ class State:
     
     # Audio Input (Speech Recognition)
     listening: bool = False  # Flag to capture mic input
-    recognizer: sr.Recognizer = field(default_factory=sr.Recognizer)  # Speech recognition engine
-    audio_frames: list = field(default_factory=list)  # Buffer for captured audio
-    mic: pyaudio.PyAudio = field(default_factory=pyaudio.PyAudio)  # PyAudio instance
-    stream: pyaudio.Stream | None = None  # Audio stream object
-    audio_frame_lock: threading.Lock = field(default_factory=threading.Lock)  # Lock for thread-safe audio access
-    collect_thread: threading.Thread | None = None  # Thread for audio collection
+    listen_started_at: float = 0.0  # perf_counter when push-to-talk was pressed
+    recognizer: RecognizerBackend | None = None  # Speech recognition backend, loaded once at startup
+    mic: pyaudio.PyAudio | None = None  # PyAudio instance, shared by mic input and speech output
+    stream: pyaudio.Stream | None = None  # Always-open callback-mode input stream
+    capture: AudioCapture | None = None  # Ring buffer the input stream writes into, with pre-roll
+    wake: WakeListener | None = None  # Hands-free listener, replaces push-to-talk when set
+    vad_stats: VadStats = field(default_factory=VadStats)  # Silence trimmed and STT calls skipped
+    stream_recognizer: StreamingRecognizer | None = None  # Fed chunk by chunk while push-to-talk is held
+    recognizer_stream: RecognizerStream | None = None  # Decoder for the utterance being held, handed to its processing thread
+    partial_transcript: str = ""  # Running transcript from the streaming recognizer
     
     # Audio Output (Text-to-Speech)
-    engine: pyttsx3.Engine = field(default_factory=pyttsx3.Engine)  # pyttsx3 engine
+    phrase_cache: PhraseCache | None = None  # Pre-rendered voice lines
+    speech: SpeechQueue | None = None  # Prioritized synthesis/playback threads
     
     # AI Client
     groq_client: Groq | None = None  # GROQ API client
+    intent_stats: IntentStats = field(default_factory=IntentStats)  # Local intent fast-path counters
+    response_cache: ResponseCache | None = None  # Persistent cache of parsed LLM replies
+    conversation: Conversation = field(default_factory=lambda: Conversation(config.AI_HISTORY_TURNS, config.AI_HISTORY_TOKENS))  # Recent turns sent as context
+    llm_stats: LlmStats = field(default_factory=LlmStats)  # Tokens and latency per LLM request
     
     # Task Management & Game Commands
-    task_queue: queue.Queue = field(default_factory=queue.Queue)  # Queue for async tasks
-    keyboard: KeyController = field(default_factory=KeyController)  # Pynput keyboard
-    mouse: MouseController = field(default_factory=MouseController)  # Pynput mouse
+    scheduler: Scheduler = field(default_factory=Scheduler)  # Per-lane task queues and workers
+    input: InputBackend | None = None  # Keyboard/mouse output
+    timeline_stats: TimelineStats = field(default_factory=TimelineStats)  # Input deadline drift
     is_team_chat: bool = True  # Current chat mode (team/match)
     simulating_input: bool = False  # Simulating key presses
     
     # OBS Integration
-    obs_client: ReqClient | None = None  # OBS WebSocket client
+    obs: ObsConnection | None = None  # Background-connected OBS WebSocket
+    
+    # Game Window
+    window: WindowTracker | None = None  # Cached Rivals window handle/geometry
     
     # Game Vision
     vision_thread: threading.Thread | None = None  # Thread for vision processing
     vision_running: bool = True  # Flag for vision lifecycle
-    ult_was_ready: bool = False  # State of ultimate ability
-    last_ult_check: float = 0  # Timestamp of last ult check
+    vision: VisionEngine | None = None  # Detector registry state, edge-triggered HUD events
+    vision_stats: CaptureStats = field(default_factory=CaptureStats)  # Capture rate, skipped frames and CPU use
     
 # Global instance of state
 g_state = State()
\ No newline at end of file
@@ -1,19 +1,57 @@
-import sys
 import threading
-from typing import Callable, Tuple
-
-from core.state import State, g_state
-
-def task_thread(state: State) -> None:
-    while True:
-        func, args = state.task_queue.get()
-        try:
-            func(*args)
-        except Exception as e:
-            print(f"Task failed: {e}", file=sys.stderr)
-        state.task_queue.task_done()
-
-def add_task(state: State, func: Callable, *args: Tuple) -> None:
-    state.task_queue.put((func, *args))
-    
-threading.Thread(target=task_thread, kwargs={ "state": g_state }, daemon=True).start()
\ No newline at end of file
+from contextlib import contextmanager
+from typing import Callable, Iterator, Tuple
+
+from core.scheduler import Task, LANE_KEYBOARD, LANE_MOUSE, LANE_CHAT, LANE_SYSTEM, COMBAT_LANES
+from core.state import State
+from game.actions import play_timeline
+from game.timeline import Timeline
+
+_pending_timeline = threading.local()  # Combat timeline being compiled for the current chain
+
+def _flush_timeline(state: State) -> None:
+    timeline = getattr(_pending_timeline, "timeline", None)
+    if timeline is None:
+        return
+    _pending_timeline.timeline = None
+
+    # Mouse events only ever play on the mouse lane and key events on the keyboard lane, so a merged chain is
+    # submitted as per-device pieces that run back to back. Pure delays stay on the lane of the action they follow.
+    state.scheduler.begin_chain()
+    try:
+        for piece in timeline.split_by_device():
+            lane = None
+            if piece.events:
+                lane = LANE_KEYBOARD if piece.has_key_events() else LANE_MOUSE
+            state.scheduler.submit(play_timeline, (state, piece), lane)
+    finally:
+        state.scheduler.end_chain()
+
+def add_task(state: State, func: Callable, args: Tuple, lane: str | None = None) -> Task:
+    _flush_timeline(state)
+    return state.scheduler.submit(func, args, lane)
+
+def add_timeline(state: State, timeline: Timeline) -> None:
+    # Consecutive combat commands in a chain are merged into one timeline on absolute deadlines
+    pending = getattr(_pending_timeline, "timeline", None)
+    _pending_timeline.timeline = timeline if pending is None else pending.then(timeline)
+
+    if not state.scheduler.in_chain():
+        _flush_timeline(state)
+
+@contextmanager
+def task_chain(state: State) -> Iterator[None]:
+    # Everything queued inside runs in order, even across lanes
+    state.scheduler.begin_chain()
+    try:
+        yield
+    finally:
+        _flush_timeline(state)
+        state.scheduler.end_chain()
+
+def flush_combat_tasks(state: State) -> None:
+    # Combat commands earlier in the same chain are still being compiled, drop them before they are submitted
+    pending = getattr(_pending_timeline, "timeline", None)
+    _pending_timeline.timeline = None
+    flushed = state.scheduler.flush(COMBAT_LANES) + (pending is not None)
+    print(f"[SYSTEM]: Flushed {flushed} pending combat action(s).")
@@ -0,0 +1,123 @@
+import itertools
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple
+
+import config
+
+# Pipeline stages in the order an utterance passes through them, used to order the shutdown summary
+STAGES = (
+    "capture", "join", "vad", "stt", "llm_first_token", "llm", "clean", "parse",
+    "queue_wait", "action", "tts_synth", "playback", "to_action", "to_speech",
+)
+
+class Span(NamedTuple):
+    trace_id: int | None
+    name: str
+    start: float  # perf_counter seconds
+    duration: float
+
+def percentile(ordered: list[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+class Tracer:
+    # Spans are plain tuples appended to a bounded deque, cheap enough to leave on. The trace ID is bound to the
+    # thread handling an utterance and copied onto scheduler tasks and speech lines, so their worker threads
+    # record against the same utterance.
+    def __init__(self, enabled: bool = True, capacity: int = 4096) -> None:
+        self.enabled = enabled
+        self.spans: deque[Span] = deque(maxlen=capacity)
+        self.ids = itertools.count(1)
+        self.local = threading.local()
+        self.origins: OrderedDict[int, float] = OrderedDict()  # Trace ID -> push-to-talk release time
+        self.reached: set[tuple[int, str]] = set()  # Milestones already recorded per trace
+        self.lock = threading.Lock()
+
+    def new_trace(self, origin: float | None = None) -> int:
+        trace_id = next(self.ids)
+        with self.lock:
+            self.origins[trace_id] = time.perf_counter() if origin is None else origin
+            while len(self.origins) > 64:
+                old_id, _ = self.origins.popitem(last=False)
+                self.reached = { key for key in self.reached if key[0] != old_id }
+        return trace_id
+
+    def current(self) -> int | None:
+        return getattr(self.local, "trace_id", None)
+
+    @contextmanager
+    def bind(self, trace_id: int | None) -> Iterator[None]:
+        previous = self.current()
+        self.local.trace_id = trace_id
+        try:
+            yield
+        finally:
+            self.local.trace_id = previous
+
+    def record(self, name: str, start: float, end: float, trace_id: int | None = None) -> None:
+        if self.enabled:
+            self.spans.append(Span(self.current() if trace_id is None else trace_id, name, start, end - start))
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append(Span(self.current(), name, start, time.perf_counter() - start))
+
+    def milestone(self, name: str, trace_id: int | None) -> None:
+        # Time from release to the first time this trace gets here, e.g. the first action or the first audio
+        if not self.enabled or trace_id is None:
+            return
+        now = time.perf_counter()
+        with self.lock:
+            origin = self.origins.get(trace_id)
+            if origin is None or (trace_id, name) in self.reached:
+                return
+            self.reached.add((trace_id, name))
+        self.spans.append(Span(trace_id, name, origin, now - origin))
+
+    def snapshot(self) -> list[Span]:
+        return list(self.spans)
+
+    def dump(self, path: str) -> int:
+        spans = self.snapshot()
+        try:
+            with open(path, "a", encoding="utf-8") as file:
+                for span in spans:
+                    file.write(json.dumps({
+                        "trace": span.trace_id,
+                        "span": span.name,
+                        "start": round(span.start, 6),
+                        "ms": round(span.duration * 1000, 3),
+                    }) + "\n")
+        except OSError as e:
+            print(f"[ERROR]: Could not write trace file '{path}': {e}", file=sys.stderr)
+            return 0
+        return len(spans)
+
+    def summary(self) -> str:
+        durations: dict[str, list[float]] = {}
+        for span in self.snapshot():
+            durations.setdefault(span.name, []).append(span.duration)
+
+        names = [name for name in STAGES if name in durations] + sorted(set(durations) - set(STAGES))
+        lines = []
+        for name in names:
+            ordered = sorted(durations[name])
+            lines.append(
+                f"  {name}: {len(ordered)} spans, p50 {percentile(ordered, 0.5) * 1000:.1f} ms / "
+                f"p95 {percentile(ordered, 0.95) * 1000:.1f} ms / p99 {percentile(ordered, 0.99) * 1000:.1f} ms"
+            )
+        return "\n".join(lines) if lines else "  no spans recorded"
+
+# Global tracer, shared by the scheduler and speech threads
+g_tracer = Tracer(config.TRACE_ENABLED, config.TRACE_RING_SIZE)
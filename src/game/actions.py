@@ -1,71 +1,36 @@
 import random
 import time
-import win32gui
-
-import pyautogui
-from pynput.keyboard import Key, KeyCode
-from pynput.mouse import Button
 
 from core.state import State
-from obs.obs_client import *
-from utils.rivals_window import find_rivals_window
-
-KeyType = Key | KeyCode | str 
-
-def press_key(state: State, key: KeyType) -> None:
-    state.keyboard.press(key)
-    time.sleep(random.uniform(0.1, 0.2))
-    state.keyboard.release(key)
-    
-def right_click() -> None:
-    pyautogui.mouseDown(button='right')
-    pyautogui.mouseUp(button='right')
-    
-def fly(state: State) -> None:
-    press_key(state, Key.shift_l)
-    
-def melee(state: State, n: int) -> None:   
-    for _ in range(n):
-        state.keyboard.press("v")
-        time.sleep(0.01)
-        state.keyboard.release("v")
-        time.sleep(0.8)
-        
-def fire_ray(n: int = 1) -> None:   
-    for _ in range(n):
-        pyautogui.mouseDown(button='left')
-        time.sleep(0.01)
-        pyautogui.mouseUp(button='left')
-        time.sleep(1.58)  # Encephalo-Ray firerate
+from game.combat_timelines import press_key_timeline
+from game.timeline import Timeline, run_timeline, wait_until
 
-def delay(duration: float = 1.0) -> None:
-    time.sleep(duration)
+def play_timeline(state: State, timeline: Timeline) -> None:
+    task = state.scheduler.current_task()
+    drifts = run_timeline(state.input.send, timeline, task.stop if task else None)
+    state.timeline_stats.record(drifts)
 
-def nano_ray(duration: float = 8.0) -> None:
-    pyautogui.mouseDown(button='left')
-    time.sleep(duration)
-    pyautogui.mouseUp(button='left')
+def press_key(state: State, key: str) -> None:
+    play_timeline(state, press_key_timeline(key))
 
 def insta_lock(state: State) -> None:
-    rivals_hwnd = find_rivals_window()
-    if not rivals_hwnd:
+    if state.window.focus() is None:
         return
-    
-    win32gui.SetForegroundWindow(rivals_hwnd)
         
-    left, top, right, bottom = win32gui.GetWindowRect(rivals_hwnd)
+    left, top, right, bottom = state.window.client_rect()
     win_width = right - left
     win_height = bottom - top
     
-    sx, sy = state.mouse.position
+    sx, sy = state.input.position()
     
     # Calculate target position from relative position in-game
-    tx = int(win_width * 0.8333)  # 1600/1920
-    ty = int(win_height * 0.5556)  # 600/1080
+    tx = left + int(win_width * 0.8333)  # 1600/1920
+    ty = top + int(win_height * 0.5556)  # 600/1080
     
     duration = 0.4 + random.uniform(-0.1, 0.1)
     steps = 50
     step_interval = duration / steps
+    start = time.perf_counter()
 
     p1 = (sx + random.randint(-50, 50), sy + random.randint(-50, 50))
     p2 = (tx + random.randint(-50, 50), ty + random.randint(-50, 50))
@@ -83,48 +48,49 @@ def insta_lock(state: State) -> None:
             )
         )
         
-    for point in points:
-        state.mouse.position = point
-        time.sleep(step_interval)
+    for i, point in enumerate(points):
+        wait_until(start + i * step_interval)
+        state.input.move_to(*point)
         
-    for _ in range(20):
-        state.mouse.scroll(0, -1)
-        time.sleep(0.02)
+    scroll_start = start + len(points) * step_interval
+    for i in range(20):
+        wait_until(scroll_start + i * 0.02)
+        state.input.scroll(-1)
         
-    time.sleep(0.05)
-    state.mouse.click(Button.left, 2)
+    wait_until(scroll_start + 20 * 0.02 + 0.05)
+    state.input.click("left", 2)
 
 def type_message(state: State, message: str) -> None:
     for char in message:
-        state.keyboard.press(char)
+        state.input.key_down(char)
         time.sleep(random.uniform(0.02, 0.1))
-        state.keyboard.release(char)
+        state.input.key_up(char)
 
 def chat(state: State, message: str, is_team_chat: bool) -> None:
     state.simulating_input = True
     
     try:
         if is_team_chat and not state.is_team_chat:
-            press_key(state, Key.enter)
+            press_key(state, "enter")
             time.sleep(0.05)
-            press_key(state, Key.tab)
+            press_key(state, "tab")
             type_message(state, message)
             time.sleep(0.05)
-            press_key(state, Key.enter)
+            press_key(state, "enter")
             state.is_team_chat = True
         elif not is_team_chat and state.is_team_chat:
-            press_key(state, Key.enter)
+            press_key(state, "enter")
             time.sleep(0.05)
-            press_key(state, Key.tab)
+            press_key(state, "tab")
             type_message(state, message)
             time.sleep(0.05)
-            press_key(state, Key.enter)
+            press_key(state, "enter")
             state.is_team_chat = False
         else:
-            press_key(state, Key.enter)
+            press_key(state, "enter")
             type_message(state, message)
             time.sleep(0.1)
-            press_key(state, Key.enter)
+            press_key(state, "enter")
     finally:
         state.simulating_input = False
 
@@ -0,0 +1,131 @@
+import sys
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Protocol
+
+import numpy as np
+
+from utils.rivals_window import Rect
+
+class FrameSource(Protocol):
+    name: str
+
+    def grab(self, bbox: Rect, out: np.ndarray) -> None: ...  # Fill out (height, width, 3) RGB in place
+    def close(self) -> None: ...
+
+class MssSource:
+    # Keeps one mss instance (and its device contexts) alive instead of setting up a new grab every frame
+    name = "mss"
+
+    def __init__(self) -> None:
+        import mss
+
+        self.screen = mss.mss()
+
+    def grab(self, bbox: Rect, out: np.ndarray) -> None:
+        left, top, right, bottom = bbox
+        shot = self.screen.grab({ "left": left, "top": top, "width": right - left, "height": bottom - top })
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        np.copyto(out, bgra[:, :, 2::-1])
+
+    def close(self) -> None:
+        self.screen.close()
+
+class PilSource:
+    name = "pil"
+
+    def __init__(self) -> None:
+        from PIL import ImageGrab
+
+        self.image_grab = ImageGrab
+
+    def grab(self, bbox: Rect, out: np.ndarray) -> None:
+        np.copyto(out, np.asarray(self.image_grab.grab(bbox=bbox).convert("RGB")))
+
+    def close(self) -> None:
+        pass
+
+class ReplaySource:
+    # Plays back recorded RGB frames (full screen, window at the origin) instead of grabbing the screen
+    name = "replay"
+
+    def __init__(self, frames: list[np.ndarray], loop: bool = True) -> None:
+        self.frames = frames
+        self.loop = loop
+        self.index = 0
+
+    def grab(self, bbox: Rect, out: np.ndarray) -> None:
+        if self.index >= len(self.frames):
+            if not self.loop:
+                raise EOFError("Replay finished")
+            self.index = 0
+        frame = self.frames[self.index]
+        self.index += 1
+
+        left, top, right, bottom = bbox
+        np.copyto(out, frame[top:bottom, left:right, :3])
+
+    def close(self) -> None:
+        pass
+
+def create_frame_source(name: str) -> FrameSource:
+    if name == "mss":
+        try:
+            return MssSource()
+        except Exception as e:
+            print(f"[ERROR]: mss capture unavailable, falling back to PIL: {e}", file=sys.stderr)
+    elif name != "pil":
+        print(f"[ERROR]: Unknown VISION_CAPTURE '{name}', falling back to PIL", file=sys.stderr)
+
+    return PilSource()
+
+@dataclass
+class CaptureStats:
+    frames: int = 0
+    unchanged: int = 0  # Frames whose checksum matched the previous one, detection skipped
+    grab_time: float = 0
+    process_time: float = 0
+    cpu_time: float = 0  # Thread CPU seconds spent in the vision loop
+    started_at: float = field(default_factory=time.perf_counter)
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.started_at
+        grab_ms = self.grab_time / self.frames * 1000 if self.frames else 0.0
+        process_ms = self.process_time / max(self.frames - self.unchanged, 1) * 1000
+        cpu_ms_per_s = self.cpu_time / elapsed * 1000 if elapsed else 0.0
+        return (
+            f"{self.frames} frames ({self.unchanged} unchanged), grab {grab_ms:.2f} ms, "
+            f"detect {process_ms:.2f} ms, CPU {cpu_ms_per_s:.1f} ms/s"
+        )
+
+class RegionCapture:
+    # Grabs a screen region into a reused buffer and tells the caller whether it changed since the last grab
+    def __init__(self, source: FrameSource, stats: CaptureStats) -> None:
+        self.source = source
+        self.stats = stats
+        self.buffer: np.ndarray | None = None
+        self.checksum: int | None = None
+
+    def grab(self, bbox: Rect) -> tuple[np.ndarray, bool]:
+        left, top, right, bottom = bbox
+        shape = (bottom - top, right - left, 3)
+        if self.buffer is None or self.buffer.shape != shape:
+            self.buffer = np.empty(shape, dtype=np.uint8)  # Only reallocated when the window is resized
+            self.checksum = None
+
+        start = time.perf_counter()
+        self.source.grab(bbox, self.buffer)
+        self.stats.grab_time += time.perf_counter() - start
+        self.stats.frames += 1
+
+        # CRC over the raw buffer is a few microseconds for HUD-sized regions, far cheaper than colour conversion
+        checksum = zlib.crc32(self.buffer.data)
+        changed = checksum != self.checksum
+        self.checksum = checksum
+        if not changed:
+            self.stats.unchanged += 1
+        return self.buffer, changed
+
+    def close(self) -> None:
+        self.source.close()
@@ -0,0 +1,43 @@
+import random
+
+from game.timeline import InputEvent, Timeline, KEY_DOWN, KEY_UP, MOUSE_DOWN, MOUSE_UP
+
+# Input timelines for each in-game action. Keys are characters or pynput Key names so these
+# can be built (and replayed against a fake backend) without an input stack.
+
+RIGHT_CLICK_HOLD = 0.05  # Long enough for the game to register Firewall on the next frame
+RIGHT_CLICK_INTERVAL = 0.15  # Gap before the next action so repeated clicks stay separate
+MELEE_HOLD = 0.01
+MELEE_INTERVAL = 0.81
+FIRE_RAY_HOLD = 0.01
+FIRE_RAY_INTERVAL = 1.59  # Encephalo-Ray firerate
+
+def press_key_timeline(key: str) -> Timeline:
+    hold = random.uniform(0.1, 0.2)
+    return Timeline([InputEvent(0, KEY_DOWN, key), InputEvent(hold, KEY_UP, key)], hold)
+
+def right_click_timeline() -> Timeline:
+    return Timeline([InputEvent(0, MOUSE_DOWN, "right"), InputEvent(RIGHT_CLICK_HOLD, MOUSE_UP, "right")], RIGHT_CLICK_INTERVAL)
+
+def fly_timeline() -> Timeline:
+    return press_key_timeline("shift_l")
+
+def melee_timeline(n: int) -> Timeline:
+    events = []
+    for i in range(n):
+        events.append(InputEvent(i * MELEE_INTERVAL, KEY_DOWN, "v"))
+        events.append(InputEvent(i * MELEE_INTERVAL + MELEE_HOLD, KEY_UP, "v"))
+    return Timeline(events, n * MELEE_INTERVAL)
+
+def fire_ray_timeline(n: int = 1) -> Timeline:
+    events = []
+    for i in range(n):
+        events.append(InputEvent(i * FIRE_RAY_INTERVAL, MOUSE_DOWN, "left"))
+        events.append(InputEvent(i * FIRE_RAY_INTERVAL + FIRE_RAY_HOLD, MOUSE_UP, "left"))
+    return Timeline(events, n * FIRE_RAY_INTERVAL)
+
+def nano_ray_timeline(duration: float = 8.0) -> Timeline:
+    return Timeline([InputEvent(0, MOUSE_DOWN, "left"), InputEvent(duration, MOUSE_UP, "left")], duration)
+
+def delay_timeline(duration: float = 1.0) -> Timeline:
+    return Timeline([], duration)
@@ -0,0 +1,154 @@
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+
+from game.capture import RegionCapture
+from utils.rivals_window import Rect
+
+Region = tuple[float, float, float, float]  # left, top, right, bottom relative to the game window
+Predicate = Callable[[np.ndarray], bool]  # Gets a read-only RGB view of its region, must not keep it
+
+ULT_REGION = (0.9198, 0.8907, 0.9521, 0.9407)
+LOWER_YELLOW = np.array([25, 150, 150], dtype=np.uint8)
+UPPER_YELLOW = np.array([50, 255, 255], dtype=np.uint8)
+ULT_MIN_PIXELS = 50
+
+class UltDetector:
+    # HSV and mask buffers are reused between frames, cv2 writes into them in place
+    def __init__(self) -> None:
+        import cv2  # Imported by the vision thread, not at app startup
+
+        self.cv2 = cv2
+        self.hsv: np.ndarray | None = None
+        self.mask: np.ndarray | None = None
+
+    def __call__(self, img: np.ndarray) -> bool:
+        if self.hsv is None or self.hsv.shape != img.shape:
+            self.hsv = np.empty(img.shape, dtype=np.uint8)
+            self.mask = np.empty(img.shape[:2], dtype=np.uint8)
+
+        self.cv2.cvtColor(img, self.cv2.COLOR_RGB2HSV, dst=self.hsv)
+        self.cv2.inRange(self.hsv, LOWER_YELLOW, UPPER_YELLOW, dst=self.mask)
+        return self.cv2.countNonZero(self.mask) > ULT_MIN_PIXELS
+
+@dataclass
+class Detector:
+    name: str
+    region: Region
+    create: Callable[[], Predicate]  # Builds a fresh predicate with its own scratch buffers
+    alert: str | None = None  # Spoken when the detector turns on
+
+# Each detector runs on its own slice of a single grab covering all regions
+DETECTORS: list[Detector] = [
+    Detector("ult_ready", ULT_REGION, UltDetector, "Ultimate ready."),
+]
+
+def register_detector(detector: Detector) -> None:
+    DETECTORS.append(detector)
+
+def region_bbox(rect: Rect, region: Region) -> Rect:
+    left, top, right, bottom = rect
+    win_width = right - left
+    win_height = bottom - top
+    return (
+        left + int(win_width * region[0]),
+        top + int(win_height * region[1]),
+        left + int(win_width * region[2]),
+        top + int(win_height * region[3]),
+    )
+
+def region_checksum(view: np.ndarray) -> int:
+    # Rows of a slice are contiguous even when the slice isn't, so CRC row by row instead of copying
+    checksum = 0
+    for row in view:
+        checksum = zlib.crc32(row, checksum)
+    return checksum
+
+@dataclass
+class DetectorTiming:
+    runs: int = 0
+    skipped: int = 0  # Region unchanged since the last run
+    total_time: float = 0
+    max_time: float = 0
+
+    def record(self, elapsed: float) -> None:
+        self.runs += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+
+    def summary(self) -> str:
+        avg_ms = self.total_time / self.runs * 1000 if self.runs else 0.0
+        return f"{self.runs} runs, {self.skipped} skipped, avg {avg_ms:.3f} ms / max {self.max_time * 1000:.3f} ms"
+
+@dataclass
+class DetectorEvent:
+    name: str
+    active: bool
+    at: float = field(default_factory=time.perf_counter)
+
+class VisionEngine:
+    def __init__(self, capture: RegionCapture, detectors: list[Detector]) -> None:
+        self.capture = capture
+        self.detectors = list(detectors)
+        self.predicates = { detector.name: detector.create() for detector in self.detectors }
+        self.active = { detector.name: False for detector in self.detectors }
+        self.checksums: dict[str, int | None] = { detector.name: None for detector in self.detectors }
+        self.timings = { detector.name: DetectorTiming() for detector in self.detectors }
+        self.layout_rect: Rect | None = None
+        self.union: Rect = (0, 0, 0, 0)
+        self.slices: dict[str, tuple[slice, slice]] = {}
+
+    def _layout(self, rect: Rect) -> None:
+        # Recomputed only when the window moves or resizes
+        boxes = { detector.name: region_bbox(rect, detector.region) for detector in self.detectors }
+        left = min(box[0] for box in boxes.values())
+        top = min(box[1] for box in boxes.values())
+        right = max(box[2] for box in boxes.values())
+        bottom = max(box[3] for box in boxes.values())
+
+        self.union = (left, top, right, bottom)
+        self.slices = {
+            name: (slice(box[1] - top, box[3] - top), slice(box[0] - left, box[2] - left))
+            for name, box in boxes.items()
+        }
+        self.layout_rect = rect
+
+    def process(self, rect: Rect) -> list[DetectorEvent]:
+        if not self.detectors:
+            return []
+        if rect != self.layout_rect:
+            self._layout(rect)
+
+        frame, changed = self.capture.grab(self.union)
+        if not changed:
+            for timing in self.timings.values():
+                timing.skipped += 1
+            return []
+
+        events = []
+        for detector in self.detectors:
+            name = detector.name
+            view = frame[self.slices[name]]  # No copy
+
+            checksum = region_checksum(view)
+            if checksum == self.checksums[name]:
+                self.timings[name].skipped += 1
+                continue
+            self.checksums[name] = checksum
+
+            start = time.perf_counter()
+            active = bool(self.predicates[name](view))
+            elapsed = time.perf_counter() - start
+            self.timings[name].record(elapsed)
+            self.capture.stats.process_time += elapsed
+
+            if active != self.active[name]:
+                self.active[name] = active
+                events.append(DetectorEvent(name, active))
+        return events
+
+    def summary(self) -> str:
+        return "\n".join(f"  {name}: {timing.summary()}" for name, timing in self.timings.items())
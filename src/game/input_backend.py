@@ -0,0 +1,211 @@
+import ctypes
+import sys
+from typing import Protocol
+
+from game.keys import SPECIAL_KEYS
+from game.timeline import InputEvent, KEY_DOWN, KEY_UP, MOUSE_DOWN, MOUSE_UP
+
+# Keys are single characters or names of special keys (pynput Key attribute names, e.g. "shift_l", "enter").
+# Mouse buttons are "left", "right" or "middle". No backend sleeps between events.
+
+class InputBackend(Protocol):
+    name: str
+
+    def send(self, events: list[InputEvent]) -> None: ...  # Key/mouse button events, dispatched as one batch
+    def key_down(self, key: str) -> None: ...
+    def key_up(self, key: str) -> None: ...
+    def mouse_down(self, button: str) -> None: ...
+    def mouse_up(self, button: str) -> None: ...
+    def click(self, button: str, count: int = 1) -> None: ...
+    def move_to(self, x: int, y: int) -> None: ...
+    def scroll(self, clicks: int) -> None: ...  # Negative scrolls down
+    def position(self) -> tuple[int, int]: ...
+
+def send_events(backend: InputBackend, events: list[InputEvent]) -> None:
+    # Default batch for backends without a native one
+    for event in events:
+        if event.kind == KEY_DOWN:
+            backend.key_down(event.target)
+        elif event.kind == KEY_UP:
+            backend.key_up(event.target)
+        elif event.kind == MOUSE_DOWN:
+            backend.mouse_down(event.target)
+        elif event.kind == MOUSE_UP:
+            backend.mouse_up(event.target)
+
+class PynputBackend:
+    name = "pynput"
+
+    def __init__(self) -> None:
+        from pynput.keyboard import Controller as KeyController, Key
+        from pynput.mouse import Controller as MouseController, Button
+
+        self.keys = Key
+        self.buttons = Button
+        self.keyboard = KeyController()
+        self.mouse = MouseController()
+
+    def _key(self, key: str) -> object:
+        return self.keys[key] if len(key) > 1 else key
+
+    def send(self, events: list[InputEvent]) -> None:
+        send_events(self, events)
+
+    def key_down(self, key: str) -> None:
+        self.keyboard.press(self._key(key))
+
+    def key_up(self, key: str) -> None:
+        self.keyboard.release(self._key(key))
+
+    def mouse_down(self, button: str) -> None:
+        self.mouse.press(self.buttons[button])
+
+    def mouse_up(self, button: str) -> None:
+        self.mouse.release(self.buttons[button])
+
+    def click(self, button: str, count: int = 1) -> None:
+        self.mouse.click(self.buttons[button], count)
+
+    def move_to(self, x: int, y: int) -> None:
+        self.mouse.position = (x, y)
+
+    def scroll(self, clicks: int) -> None:
+        self.mouse.scroll(0, clicks)
+
+    def position(self) -> tuple[int, int]:
+        return self.mouse.position
+
+class SendInputBackend:
+    # Win32 SendInput with scan codes; every batch (e.g. a click's down + up) is a single syscall. Characters that
+    # need shift/ctrl/alt on the current layout get those pressed around them, and characters the layout can't
+    # type at all are sent as Unicode input.
+    name = "sendinput"
+
+    INPUT_MOUSE = 0
+    INPUT_KEYBOARD = 1
+    KEYEVENTF_EXTENDEDKEY = 0x0001
+    KEYEVENTF_KEYUP = 0x0002
+    KEYEVENTF_UNICODE = 0x0004
+    KEYEVENTF_SCANCODE = 0x0008
+    MOUSEEVENTF_WHEEL = 0x0800
+    MOUSE_FLAGS = {
+        ("left", MOUSE_DOWN): 0x0002, ("left", MOUSE_UP): 0x0004,
+        ("right", MOUSE_DOWN): 0x0008, ("right", MOUSE_UP): 0x0010,
+        ("middle", MOUSE_DOWN): 0x0020, ("middle", MOUSE_UP): 0x0040,
+    }
+    EXTENDED_KEYS = { "ctrl_r", "alt_r", "up", "down", "left", "right" }
+    MODIFIERS = ((0x01, "shift"), (0x02, "ctrl"), (0x04, "alt"))  # VkKeyScanW high-byte bits
+
+    def __init__(self) -> None:
+        from ctypes import wintypes
+
+        ULONG_PTR = ctypes.c_size_t
+
+        class MOUSEINPUT(ctypes.Structure):
+            _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD),
+                        ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD), ("dwExtraInfo", ULONG_PTR)]
+
+        class KEYBDINPUT(ctypes.Structure):
+            _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD), ("dwFlags", wintypes.DWORD),
+                        ("time", wintypes.DWORD), ("dwExtraInfo", ULONG_PTR)]
+
+        class HARDWAREINPUT(ctypes.Structure):
+            _fields_ = [("uMsg", wintypes.DWORD), ("wParamL", wintypes.WORD), ("wParamH", wintypes.WORD)]
+
+        class INPUTUNION(ctypes.Union):
+            _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT), ("hi", HARDWAREINPUT)]
+
+        class INPUT(ctypes.Structure):
+            _fields_ = [("type", wintypes.DWORD), ("union", INPUTUNION)]
+
+        self.INPUT = INPUT
+        self.user32 = ctypes.windll.user32
+        self.user32.VkKeyScanW.restype = wintypes.SHORT  # -1 when the layout has no key for the character
+        self.point = wintypes.POINT()
+        self.strokes: dict[str, tuple[tuple[str, ...], tuple[tuple[int, int], ...]]] = {}
+
+    def _strokes(self, key: str) -> tuple[tuple[str, ...], tuple[tuple[int, int], ...]]:
+        # Modifier keys to hold, then (scan code or UTF-16 unit, flags) per keyboard record for the key itself
+        cached = self.strokes.get(key)
+        if cached is None:
+            if len(key) > 1:
+                flags = self.KEYEVENTF_SCANCODE | (self.KEYEVENTF_EXTENDEDKEY if key in self.EXTENDED_KEYS else 0)
+                cached = ((), ((self.user32.MapVirtualKeyW(SPECIAL_KEYS[key], 0), flags),))  # MAPVK_VK_TO_VSC
+            else:
+                scanned = self.user32.VkKeyScanW(ord(key))
+                scan = self.user32.MapVirtualKeyW(scanned & 0xFF, 0) if scanned != -1 else 0
+                if scan and not scanned >> 8 & ~0x07:
+                    modifiers = tuple(name for bit, name in self.MODIFIERS if scanned >> 8 & bit)
+                    cached = (modifiers, ((scan, self.KEYEVENTF_SCANCODE),))
+                else:
+                    units = key.encode("utf-16-le")
+                    cached = ((), tuple(
+                        (int.from_bytes(units[i:i + 2], "little"), self.KEYEVENTF_UNICODE) for i in range(0, len(units), 2)
+                    ))
+            self.strokes[key] = cached
+        return cached
+
+    def _records(self, event: InputEvent) -> list[tuple[int, int, int]]:
+        # (input type, scan code, flags) per INPUT record
+        if event.kind not in (KEY_DOWN, KEY_UP):
+            return [(self.INPUT_MOUSE, 0, self.MOUSE_FLAGS[(event.target, event.kind)])]
+
+        modifiers, strokes = self._strokes(event.target)
+        up = self.KEYEVENTF_KEYUP if event.kind == KEY_UP else 0
+        keys = [(self.INPUT_KEYBOARD, scan, flags | up) for scan, flags in strokes]
+        if not modifiers:
+            return keys
+        held = [(self.INPUT_KEYBOARD, scan, flags | up) for modifier in modifiers for scan, flags in self._strokes(modifier)[1]]
+        return held + keys if event.kind == KEY_DOWN else keys + held[::-1]
+
+    def send(self, events: list[InputEvent]) -> None:
+        entries = [entry for event in events for entry in self._records(event)]
+        records = (self.INPUT * len(entries))()
+        for record, (kind, scan, flags) in zip(records, entries):
+            record.type = kind
+            if kind == self.INPUT_KEYBOARD:
+                record.union.ki.wScan = scan
+                record.union.ki.dwFlags = flags
+            else:
+                record.union.mi.dwFlags = flags
+        self.user32.SendInput(len(entries), records, ctypes.sizeof(self.INPUT))
+
+    def key_down(self, key: str) -> None:
+        self.send([InputEvent(0, KEY_DOWN, key)])
+
+    def key_up(self, key: str) -> None:
+        self.send([InputEvent(0, KEY_UP, key)])
+
+    def mouse_down(self, button: str) -> None:
+        self.send([InputEvent(0, MOUSE_DOWN, button)])
+
+    def mouse_up(self, button: str) -> None:
+        self.send([InputEvent(0, MOUSE_UP, button)])
+
+    def click(self, button: str, count: int = 1) -> None:
+        self.send([InputEvent(0, kind, button) for _ in range(count) for kind in (MOUSE_DOWN, MOUSE_UP)])
+
+    def move_to(self, x: int, y: int) -> None:
+        self.user32.SetCursorPos(x, y)
+
+    def scroll(self, clicks: int) -> None:
+        records = (self.INPUT * 1)()
+        records[0].type = self.INPUT_MOUSE
+        records[0].union.mi.mouseData = (clicks * 120) & 0xFFFFFFFF  # WHEEL_DELTA per notch
+        records[0].union.mi.dwFlags = self.MOUSEEVENTF_WHEEL
+        self.user32.SendInput(1, records, ctypes.sizeof(self.INPUT))
+
+    def position(self) -> tuple[int, int]:
+        self.user32.GetCursorPos(ctypes.byref(self.point))
+        return self.point.x, self.point.y
+
+def create_input_backend(name: str) -> InputBackend:
+    if name == "sendinput":
+        try:
+            return SendInputBackend()
+        except Exception as e:
+            print(f"[ERROR]: SendInput backend unavailable, falling back to pynput: {e}", file=sys.stderr)
+    elif name != "pynput":
+        print(f"[ERROR]: Unknown INPUT_BACKEND '{name}', falling back to pynput", file=sys.stderr)
+
+    return PynputBackend()
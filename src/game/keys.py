@@ -0,0 +1,10 @@
+# Names of special keys accepted by press(key) and the input backends (pynput Key attribute names), with their
+# Win32 virtual-key codes. Single letters/digits are used as-is.
+SPECIAL_KEYS = {
+    "shift": 0x10, "shift_l": 0xA0, "shift_r": 0xA1, "ctrl": 0x11, "ctrl_l": 0xA2, "ctrl_r": 0xA3,
+    "alt": 0x12, "alt_l": 0xA4, "alt_r": 0xA5, "enter": 0x0D, "tab": 0x09, "esc": 0x1B, "space": 0x20,
+    "backspace": 0x08, "up": 0x26, "down": 0x28, "left": 0x25, "right": 0x27,
+    **{ f"f{i}": 0x6F + i for i in range(1, 25) },
+}
+
+KEY_NAMES = frozenset(SPECIAL_KEYS)
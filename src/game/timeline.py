@@ -0,0 +1,117 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+import config
+
+KEY_DOWN = "key_down"
+KEY_UP = "key_up"
+MOUSE_DOWN = "mouse_down"
+MOUSE_UP = "mouse_up"
+KEY_EVENTS = (KEY_DOWN, KEY_UP)
+
+@dataclass
+class InputEvent:
+    at: float  # Seconds from the start of the timeline
+    kind: str
+    target: str  # Key name for key events, button name for mouse events
+
+@dataclass
+class Timeline:
+    events: list[InputEvent] = field(default_factory=list)
+    duration: float = 0  # Includes trailing waits (e.g. fire rate after the last shot)
+
+    def then(self, other: "Timeline") -> "Timeline":
+        shifted = [InputEvent(event.at + self.duration, event.kind, event.target) for event in other.events]
+        return Timeline(self.events + shifted, self.duration + other.duration)
+
+    def has_key_events(self) -> bool:
+        return any(event.kind in KEY_EVENTS for event in self.events)
+
+    def split_by_device(self) -> list["Timeline"]:
+        # Consecutive runs of keyboard or mouse events, each lasting until the next run starts, so the pieces
+        # played back to back reproduce the original timing on one lane per device
+        events = sorted(self.events, key=lambda event: event.at)
+        if not events:
+            return [self]
+
+        runs: list[list[InputEvent]] = []
+        for event in events:
+            if runs and (runs[-1][0].kind in KEY_EVENTS) == (event.kind in KEY_EVENTS):
+                runs[-1].append(event)
+            else:
+                runs.append([event])
+
+        starts = [0.0] + [run[0].at for run in runs[1:]] + [self.duration]
+        return [
+            Timeline([InputEvent(event.at - starts[i], event.kind, event.target) for event in run], starts[i + 1] - starts[i])
+            for i, run in enumerate(runs)
+        ]
+
+@dataclass
+class TimelineStats:
+    events: int = 0
+    total_drift: float = 0  # Sum of absolute lateness in seconds
+    max_drift: float = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record(self, drifts: list[float]) -> None:
+        with self.lock:
+            self.events += len(drifts)
+            self.total_drift += sum(abs(drift) for drift in drifts)
+            self.max_drift = max([self.max_drift, *(abs(drift) for drift in drifts)])
+
+    def summary(self) -> str:
+        mean_us = self.total_drift / self.events * 1e6 if self.events else 0.0
+        return f"{self.events} events, drift mean {mean_us:.0f} us / max {self.max_drift * 1e6:.0f} us"
+
+def wait_until(deadline: float, stop: threading.Event | None = None) -> bool:
+    # Sleep until just before the deadline, then spin the rest so OS sleep granularity doesn't add up.
+    # Returns False if `stop` was set first.
+    remaining = deadline - time.perf_counter()
+    if remaining > config.INPUT_SPIN_S:
+        if stop is None:
+            time.sleep(remaining - config.INPUT_SPIN_S)
+        elif stop.wait(remaining - config.INPUT_SPIN_S):
+            return False
+    while time.perf_counter() < deadline:
+        pass
+    return stop is None or not stop.is_set()
+
+def release_held(events: list[InputEvent], at: float) -> list[InputEvent]:
+    # Key and button releases for everything still pressed after `events`
+    held: dict[tuple[str, str], None] = {}
+    for event in events:
+        if event.kind in (KEY_DOWN, MOUSE_DOWN):
+            held[(event.kind, event.target)] = None
+        else:
+            held.pop((KEY_DOWN if event.kind == KEY_UP else MOUSE_DOWN, event.target), None)
+    return [InputEvent(at, KEY_UP if kind == KEY_DOWN else MOUSE_UP, target) for kind, target in held]
+
+def run_timeline(send: Callable[[list[InputEvent]], None], timeline: Timeline, stop: threading.Event | None = None) -> list[float]:
+    # Every event is scheduled against the absolute start time, so a late event never pushes back the next one.
+    # Events sharing a deadline (e.g. a key release and the next press) are sent as one batch. If `stop` is set
+    # the rest is skipped and anything still held down is released.
+    start = time.perf_counter()
+    events = timeline.events
+    drifts = []
+
+    i = 0
+    while i < len(events):
+        j = i + 1
+        while j < len(events) and events[j].at == events[i].at:
+            j += 1
+
+        deadline = start + events[i].at
+        if not wait_until(deadline, stop):
+            break
+        send(events[i:j])
+        drifts.extend([time.perf_counter() - deadline] * (j - i))
+        i = j
+
+    if i < len(events) or not wait_until(start + timeline.duration, stop):
+        releases = release_held(events[:i], time.perf_counter() - start)
+        if releases:
+            send(releases)
+    return drifts
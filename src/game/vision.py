@@ -1,66 +1,50 @@
 import sys
 import threading
 import time
-import win32gui
 
-import cv2
-from PIL import ImageGrab
-import numpy as np
-
-from core.state import State, g_state
+import config
+from core.state import State
+from audio.speech_queue import PRIORITY_ALERT
 from audio.text_to_speech import speak_ultron
-from utils.rivals_window import is_rivals_window_active, find_rivals_window
+from game.capture import RegionCapture, create_frame_source
+from game.detectors import DETECTORS, VisionEngine
 
 def vision_thread(state: State) -> None:
-    while state.running and state.vision_running:
-        if not is_rivals_window_active():
-            time.sleep(0.5)
-            continue
-        
-        current_time = time.time()
-        
-        if current_time - state.last_ult_check > 2:
-            state.last_ult_check = current_time
-            
+    capture = RegionCapture(create_frame_source(config.VISION_CAPTURE), state.vision_stats)
+    state.vision = VisionEngine(capture, DETECTORS)
+    alerts = { detector.name: detector.alert for detector in DETECTORS if detector.alert }
+    interval = 1 / config.VISION_RATE_HZ
+    next_tick = time.perf_counter()
+    cpu_start = time.thread_time()
+
+    try:
+        while state.running and state.vision_running:
+            if not state.window.is_active():
+                time.sleep(0.5)
+                next_tick = time.perf_counter()
+                continue
+
             try:
-                ult_ready = check_ult_ready()
-                
-                if ult_ready and not state.ult_was_ready:
-                    speak_ultron(state, "Ultimate ready.")
-                    state.ult_was_ready = True
-                elif not ult_ready:
-                    state.ult_was_ready = False
+                rect = state.window.client_rect()
+                if rect is not None:
+                    for event in state.vision.process(rect):
+                        if event.active and event.name in alerts:
+                            speak_ultron(state, alerts[event.name], PRIORITY_ALERT)
             except Exception as e:
-                print(f"[ERROR]: Failed to detect ultimate status: {e}", file=sys.stderr)
-            
-        time.sleep(0.5)
-   
-threading.Thread(target=vision_thread, kwargs={ "state": g_state }, daemon=True).start()   
+                print(f"[ERROR]: Vision detection failed: {e}", file=sys.stderr)
+
+            state.vision_stats.cpu_time = time.thread_time() - cpu_start
 
-def check_ult_ready() -> bool:
-    rivals_hwnd = find_rivals_window()
-    if not rivals_hwnd:
-        return False
-    
-    left, top, right, bottom = win32gui.GetWindowRect(rivals_hwnd)
-    win_width = right - left
-    win_height = bottom - top
+            # Fixed-rate ticks; if a frame overran, skip ahead rather than bursting to catch up
+            next_tick += interval
+            remaining = next_tick - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+            else:
+                next_tick = time.perf_counter()
+    finally:
+        capture.close()
 
-    # Get ult status area from relative in-game bounds
-    ult_area = ImageGrab.grab(bbox=(
-        int(win_width * 0.9198),
-        int(win_height * 0.8907),
-        int(win_width * 0.9521),
-        int(win_height * 0.9407)
-    ))
-    
-    img = np.array(ult_area)
-    hsv = cv2.cvtColor(img, cv2.COLOR_RGB2HSV)
-    
-    lower_yellow = np.array([25, 150, 150])
-    upper_yellow = np.array([50, 255, 255])
-    
-    yellow_mask = cv2.inRange(hsv, lower_yellow, upper_yellow)
-    yellow_pixels = cv2.countNonZero(yellow_mask)
-    
-    return yellow_pixels > 50
\ No newline at end of file
+def start_vision(state: State) -> None:
+    state.vision_thread = threading.Thread(target=vision_thread, args=(state,), daemon=True)
+    state.vision_thread.start()
@@ -1,47 +1,165 @@
+import argparse
 import os
 import sys
+import threading
 import time
 
-from groq import Groq
+import pyaudio
 from pynput.keyboard import Listener
 
 import config
 from core.state import g_state
-from audio.text_to_speech import speak_ultron
-from audio.speech_recognition import setup_audio_input, on_press, on_release
-from obs.obs_client import setup_obs
+from core.tracing import g_tracer
+from ai.intents import INTENTS, CHAIN_LINE
+from ai.response_cache import ResponseCache
+from ai.ultron import create_groq_client
+from audio.phrase_cache import PhraseCache
+from audio.speech_queue import PRIORITY_SYSTEM
+from audio.text_to_speech import speak_ultron, start_speech, stop_speech, warm_phrase_cache
+from audio.speech_recognition import setup_audio_input, start_wake_listening, on_press, on_release
+from game.detectors import DETECTORS
+from game.input_backend import create_input_backend
+from game.vision import start_vision
+from obs.obs_client import OBS_ACTIONS, setup_obs
 from utils.admin_privileges import check_admin_privileges
+from utils.rivals_window import WindowTracker, Win32WindowSystem
+from utils.startup import StartupProfile
 
-def init_app() -> None:
-    check_admin_privileges()
+GREETING = "I am Ultron. I was designed to save the world."
+
+# Lines with fixed text, rendered ahead of time so they play instantly
+FIXED_PHRASES = [
+    GREETING,
+    *(detector.alert for detector in DETECTORS if detector.alert),
+    "Shutting down...",
+    *(action.failure_line for action in OBS_ACTIONS.values()),
+    CHAIN_LINE,
+    *dict.fromkeys(intent.line for intent in INTENTS),
+]
+
+def setup_audio(profile: StartupProfile) -> None:
+    # Output first so the greeting starts while the mic and STT backend are still loading
+    with profile.phase("audio device"):
+        g_state.mic = pyaudio.PyAudio()
+    with profile.phase("speech output"):
+        start_speech(g_state)
+        speak_ultron(g_state, GREETING, PRIORITY_SYSTEM)
+    profile.mark("greeting queued")
     
-    setup_obs(g_state)
+    if g_state.phrase_cache:
+        threading.Thread(target=warm_phrase_cache, args=(g_state, FIXED_PHRASES), daemon=True).start()
     
-    g_state.groq_client = Groq(api_key=os.getenv("GROQ_API_KEY")) 
-    if not g_state.groq_client:
+    with profile.phase("speech input"):
+        setup_audio_input(g_state)
+        if config.LISTEN_MODE == "wake":
+            start_wake_listening(g_state)
+
+def setup_groq() -> None:
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
         print("[ERROR]: GROQ_API_KEY not found or invalid. Command features are disabled.")
+        return
+    
+    g_state.groq_client = create_groq_client(api_key, config.AI_BASE_URL)
+    try:
+        g_state.groq_client.models.list()  # Opens the connection now instead of on the first utterance
+    except Exception as e:
+        print(f"[ERROR]: Could not reach the Groq API, requests will connect on demand: {e}", file=sys.stderr)
+
+def setup_response_cache() -> None:
+    if config.AI_CACHE_ENABLED:
+        g_state.response_cache = ResponseCache(config.AI_CACHE_PATH, config.AI_CACHE_MAX_ENTRIES, config.AI_CACHE_TTL_S)
+        g_state.response_cache.load()
+
+def setup_input() -> None:
+    g_state.input = create_input_backend(config.INPUT_BACKEND)
+
+def init_app(profile: StartupProfile) -> None:
+    with profile.phase("admin check"):
+        check_admin_privileges()
     
-    setup_audio_input(g_state)
+    if config.TTS_CACHE_ENABLED:
+        g_state.phrase_cache = PhraseCache(config.TTS_CACHE_DIR, config.TTS_CACHE_MAX_MB * 1024 * 1024)
+    g_state.window = WindowTracker(Win32WindowSystem())  # Cheap, the window is looked up on first use
     
-    speak_ultron(g_state, "I am Ultron. I was designed to save the world.")     
+    # Independent subsystems, each on its own thread
+    profile.run_parallel({
+        "audio": lambda: setup_audio(profile),
+        "obs": lambda: setup_obs(g_state),
+        "groq": setup_groq,
+        "response cache": setup_response_cache,
+        "input": setup_input,
+    })
+    
+    # Needs the input backend, and the vision thread is only worth starting once everything else is up
+    with profile.phase("workers"):
+        g_state.scheduler.start()
+        start_vision(g_state)
     print("[ULTRON]: *Ready for action.*")
 
 def shutdown_app(listener: Listener) -> None:
     print("[ULTRON]: Shutting down...")
-    speak_ultron(g_state, "Shutting down...")
+    shutdown_line = speak_ultron(g_state, "Shutting down...", PRIORITY_SYSTEM)
+    shutdown_line.wait(timeout=5)
+    stop_speech(g_state)
         
     listener.stop()
     
     if g_state.stream:
         g_state.stream.stop_stream()
         g_state.stream.close()
+    if g_state.capture:
+        g_state.capture.stop()
+        print(f"[SYSTEM]: Audio capture: {g_state.capture.summary()}")
+    if g_state.wake:
+        print(f"[SYSTEM]: Wake listener: {g_state.wake.stats.summary()}")
+    if config.AUDIO_VAD_ENABLED:
+        print(f"[SYSTEM]: Voice activity: {g_state.vad_stats.summary()}")
         
-    g_state.mic.terminate()
+    if g_state.mic:
+        g_state.mic.terminate()
+    
+    if g_state.obs:
+        g_state.obs.stop()
+        print(f"[SYSTEM]: OBS requests:\n{g_state.obs.summary()}")
+    
+    print(f"[SYSTEM]: Task lanes:\n{g_state.scheduler.summary()}")
+    print(f"[SYSTEM]: Input timing: {g_state.timeline_stats.summary()}")
+    if g_state.window:
+        print(f"[SYSTEM]: Game window: {g_state.window.summary()}")
+    print(f"[SYSTEM]: Vision: {g_state.vision_stats.summary()}")
+    if g_state.vision:
+        print(f"[SYSTEM]: Detectors:\n{g_state.vision.summary()}")
+    
+    if config.AI_INTENT_FAST_PATH:
+        print(f"[SYSTEM]: Intent fast-path: {g_state.intent_stats.summary()}")
+    
+    if g_state.response_cache:
+        g_state.response_cache.save()
+        print(f"[SYSTEM]: Response cache: {g_state.response_cache.stats.summary()}")
+    
+    print(f"[SYSTEM]: LLM requests: {g_state.llm_stats.summary()}")
+    
+    if g_state.phrase_cache:
+        print(f"[SYSTEM]: Phrase cache: {g_state.phrase_cache.summary()}")
+    
+    if g_tracer.enabled:
+        print(f"[SYSTEM]: Latency (per utterance):\n{g_tracer.summary()}")
+        if config.TRACE_JSONL_PATH:
+            written = g_tracer.dump(config.TRACE_JSONL_PATH)
+            print(f"[SYSTEM]: Wrote {written} span(s) to {config.TRACE_JSONL_PATH}")
     
     print("[SYSTEM]: Shutdown complete.")
 
 def main() -> None:
-    init_app()
+    parser = argparse.ArgumentParser(description="Ultron voice assistant for Marvel Rivals")
+    parser.add_argument("--profile-startup", action="store_true", help="Print how long each startup phase took")
+    args = parser.parse_args()
+    
+    profile = StartupProfile()
+    init_app(profile)
+    if args.profile_startup:
+        print(f"[SYSTEM]: Startup profile:\n{profile.report()}")
     
     listener = Listener(on_press, on_release)
     listener.start()
@@ -0,0 +1,190 @@
+import itertools
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Protocol
+
+from obsws_python.error import OBSSDKRequestError
+
+import config
+
+class ObsRequestClient(Protocol):
+    base_client: object  # obsws_python ObsClient, its ws is used directly for RequestBatch
+
+    def send(self, param: str, data: dict | None = None, raw: bool = False) -> object: ...
+    def disconnect(self) -> None: ...
+
+class ObsUnavailableError(ConnectionError):
+    pass
+
+@dataclass
+class RequestStats:
+    count: int = 0
+    failed: int = 0
+    total_time: float = 0
+    max_time: float = 0
+
+    def summary(self) -> str:
+        avg_ms = self.total_time / self.count * 1000 if self.count else 0.0
+        return f"{self.count} sent, {self.failed} failed, avg {avg_ms:.1f} ms / max {self.max_time * 1000:.1f} ms"
+
+@dataclass
+class BatchResult:
+    request_type: str
+    ok: bool
+    comment: str = ""
+    data: dict = field(default_factory=dict)
+
+class ObsConnection:
+    # Owns the OBS websocket: connects in the background, reconnects with backoff and pings to notice a dead link.
+    # Requests never wait for a connection, they fail fast with ObsUnavailableError while OBS is down.
+    def __init__(self, connect: Callable[[], ObsRequestClient]) -> None:
+        self.connect = connect
+        self.client: ObsRequestClient | None = None
+        self.lock = threading.Lock()  # One request in flight on the socket at a time
+        self.wake = threading.Event()
+        self.running = False
+        self.thread: threading.Thread | None = None
+        self.batch_ids = itertools.count(1)
+        self.stats: dict[str, RequestStats] = {}
+        self.stats_lock = threading.Lock()
+        self.connects = 0
+        self.connected_once = threading.Event()
+
+    @property
+    def connected(self) -> bool:
+        return self.client is not None
+
+    def start(self) -> None:
+        if self.thread is not None:
+            return
+        logging.getLogger("obsws_python").setLevel(logging.CRITICAL)  # It logs a traceback for every failed attempt
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="obs-connection", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.running = False
+        self.wake.set()
+        with self.lock:
+            self._drop()
+
+    def _record(self, request_type: str, elapsed: float, failed: bool) -> None:
+        with self.stats_lock:
+            stats = self.stats.setdefault(request_type, RequestStats())
+            stats.count += 1
+            stats.failed += failed
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+
+    def _drop(self) -> None:
+        # Caller holds the lock
+        if self.client is not None:
+            try:
+                self.client.disconnect()
+            except Exception:
+                pass
+            self.client = None
+            self.wake.set()
+
+    def request(self, request_type: str, data: dict | None = None) -> object:
+        with self.lock:
+            if self.client is None:
+                raise ObsUnavailableError("OBS is not connected")
+
+            start = time.perf_counter()
+            try:
+                response = self.client.send(request_type, data, raw=True)
+            except OBSSDKRequestError:
+                self._record(request_type, time.perf_counter() - start, failed=True)
+                raise  # OBS answered, the connection is fine
+            except Exception:
+                self._record(request_type, time.perf_counter() - start, failed=True)
+                self._drop()
+                raise
+            self._record(request_type, time.perf_counter() - start, failed=False)
+            return response
+
+    def batch(self, requests: list[tuple[str, dict | None]], halt_on_failure: bool = False) -> list[BatchResult]:
+        # One RequestBatch (op 8) round trip instead of one per request, executed in order by OBS
+        payload = {
+            "op": 8,
+            "d": {
+                "requestId": f"batch-{next(self.batch_ids)}",
+                "haltOnFailure": halt_on_failure,
+                "executionType": 0,  # SerialRealtime
+                "requests": [
+                    { "requestType": request_type, **({ "requestData": data } if data else {}) }
+                    for request_type, data in requests
+                ],
+            },
+        }
+
+        with self.lock:
+            if self.client is None:
+                raise ObsUnavailableError("OBS is not connected")
+
+            start = time.perf_counter()
+            try:
+                ws = self.client.base_client.ws
+                ws.send(json.dumps(payload))
+                while True:
+                    response = json.loads(ws.recv())
+                    if response.get("op") == 9 and response["d"].get("requestId") == payload["d"]["requestId"]:
+                        break
+            except Exception:
+                self._record("RequestBatch", time.perf_counter() - start, failed=True)
+                self._drop()
+                raise
+
+            results = [
+                BatchResult(
+                    result["requestType"],
+                    result["requestStatus"]["result"],
+                    result["requestStatus"].get("comment", ""),
+                    result.get("responseData", {}),
+                )
+                for result in response["d"]["results"]
+            ]
+            self._record("RequestBatch", time.perf_counter() - start, failed=not all(result.ok for result in results))
+            return results
+
+    def _run(self) -> None:
+        backoff = config.OBS_RECONNECT_MIN_S
+        while self.running:
+            if self.client is None:
+                try:
+                    client = self.connect()
+                except Exception as e:
+                    if self.connects == 0 and backoff == config.OBS_RECONNECT_MIN_S:
+                        print(f"[ERROR]: Could not connect to OBS WebSocket, retrying in the background: {e}", file=sys.stderr)
+                    self.wake.wait(backoff * random.uniform(0.8, 1.2))
+                    self.wake.clear()
+                    backoff = min(backoff * 2, config.OBS_RECONNECT_MAX_S)
+                    continue
+
+                with self.lock:
+                    self.client = client
+                self.connects += 1
+                self.connected_once.set()
+                backoff = config.OBS_RECONNECT_MIN_S
+                print(f"[OBS]: *Connected{' again' if self.connects > 1 else ''}.*")
+
+            self.wake.wait(config.OBS_PING_INTERVAL_S)
+            self.wake.clear()
+            if not self.running or self.client is None:
+                continue
+
+            try:
+                self.request("GetVersion")  # Health ping, drops the client if the socket is dead
+            except Exception as e:
+                print(f"[ERROR]: Lost connection to OBS, reconnecting: {e}", file=sys.stderr)
+
+    def summary(self) -> str:
+        with self.stats_lock:
+            lines = [f"  {request_type}: {stats.summary()}" for request_type, stats in sorted(self.stats.items())]
+        return "\n".join([f"  connects: {self.connects}", *lines])
@@ -1,65 +1,62 @@
 import os
 import sys
+from dataclasses import dataclass
 
 from obsws_python import ReqClient
 
+import config
 from core.state import State
+from audio.speech_queue import PRIORITY_SYSTEM
 from audio.text_to_speech import speak_ultron
+from obs.connection import ObsConnection
+
+@dataclass(frozen=True)
+class ObsAction:
+    request_type: str
+    done_message: str
+    failure_line: str  # Spoken when the request fails
+
+OBS_ACTIONS = {
+    "start_rec": ObsAction("StartRecord", "*Video recording started.*", "Failed to start recording"),
+    "stop_rec": ObsAction("StopRecord", "*Video recording stopped.*", "Failed to stop recording"),
+    "start_replay": ObsAction("StartReplayBuffer", "*Replay buffer started.*", "Failed to start replay buffer"),
+    "stop_replay": ObsAction("StopReplayBuffer", "*Replay buffer stopped.*", "Failed to stop replay buffer"),
+    "clip": ObsAction("SaveReplayBuffer", "*Replay buffer saved as clip.*", "Failed to save clip"),
+}
 
 def setup_obs(state: State) -> None:
     obs_host = os.getenv("OBS_HOST", "localhost")
     obs_port = os.getenv("OBS_PORT", 4455)
     obs_password = os.getenv("OBS_PASSWORD", "")
-    
-    try:
-        print(f"[SYSTEM]: Connecting to OBS WebSocket at {obs_host}:{obs_port}...")
-        state.obs_client = ReqClient(host=obs_host, port=obs_port, password=obs_password)
-    except Exception as e:
-        print(f"[ERROR]: Could not connect to OBS WebSocket: {e}", file=sys.stderr)
-        print("[SYSTEM]: Please ensure OBS Studio is running and the WebSocket Server is enabled and credentials are valid.", file=sys.stderr)
-        state.obs_client = None
-        
-def obs_start_recording(state: State) -> None:
-    if state.obs_client:
-        try:
-            state.obs_client.start_record()
-            print("[OBS]: *Video recording started.*")
-        except Exception as e:
-            print(f"[ERROR]: Failed to start OBS recording: {e}", file=sys.stderr)
-            speak_ultron(state, "Failed to start recording")
-            
-def obs_stop_recording(state: State) -> None:
-    if state.obs_client:
-        try:
-            state.obs_client.stop_record()
-            print("[OBS]: *Video recording stopped.*")
-        except Exception as e:
-            print(f"[ERROR]: Failed to stop OBS recording: {e}", file=sys.stderr)
-            speak_ultron(state, "Failed to stop recording")
 
-def obs_start_replay(state: State) -> None:
-    if state.obs_client:
-        try:
-            state.obs_client.start_replay_buffer()
-            print("[OBS]: *Replay buffer started.*")
-        except Exception as e:
-            print(f"[ERROR: Failed to start OBS replay buffer: {e}", file=sys.stderr)
-            speak_ultron(state, "Failed to start replay buffer")
-            
-def obs_stop_replay(state: State) -> None:
-    if state.obs_client:
-        try:
-            state.obs_client.stop_replay_buffer()
-            print("[OBS]: *Replay buffer stopped.*")
-        except Exception as e:
-            print(f"[ERROR: Failed to stop OBS replay buffer: {e}", file=sys.stderr)
-            speak_ultron(state, "Failed to stop replay buffer")
+    print(f"[SYSTEM]: Connecting to OBS WebSocket at {obs_host}:{obs_port} in the background...")
+    state.obs = ObsConnection(
+        lambda: ReqClient(host=obs_host, port=obs_port, password=obs_password, timeout=config.OBS_TIMEOUT_S)
+    )
+    state.obs.start()
+
+def _report(state: State, action: ObsAction, ok: bool, error: object = None) -> None:
+    if ok:
+        print(f"[OBS]: {action.done_message}")
+    else:
+        print(f"[ERROR]: OBS {action.request_type} failed: {error}", file=sys.stderr)
+        speak_ultron(state, action.failure_line, PRIORITY_SYSTEM)
 
-def obs_save_clip(state: State) -> None:
-    if state.obs_client:
-        try:
-            state.obs_client.save_replay_buffer()
-            print("[OBS]: *Replay buffer saved as clip.*")
-        except Exception as e:
-            print(f"[ERROR]: Failed to save OBS replay buffer clip: {e}", file=sys.stderr)
-            speak_ultron(state, "Failed to save clip")
\ No newline at end of file
+def obs_run(state: State, names: list[str]) -> None:
+    # Consecutive OBS commands from one chain (e.g. clip; stop_replay;) go out as a single RequestBatch
+    if state.obs is None:
+        return
+    actions = [OBS_ACTIONS[name] for name in names]
+
+    try:
+        if len(actions) == 1:
+            state.obs.request(actions[0].request_type)
+            _report(state, actions[0], True)
+            return
+
+        results = state.obs.batch([(action.request_type, None) for action in actions])
+        for action, result in zip(actions, results):
+            _report(state, action, result.ok, result.comment)
+    except Exception as e:
+        for action in actions:
+            _report(state, action, False, e)
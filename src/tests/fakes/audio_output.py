@@ -0,0 +1,18 @@
+import time
+
+import config
+
+class FakeAudioOutput:
+    # Offline stand-in for the speaker: blocks for as long as the samples would take to play
+    def __init__(self, sample_rate: int = config.TTS_OUTPUT_RATE, realtime: bool = True) -> None:
+        self.sample_rate = sample_rate
+        self.realtime = realtime
+        self.bytes_written = 0
+
+    def write(self, frames: bytes) -> None:
+        self.bytes_written += len(frames)
+        if self.realtime:
+            time.sleep(len(frames) / 2 / self.sample_rate)
+
+    def close(self) -> None:
+        pass
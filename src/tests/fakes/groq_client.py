@@ -0,0 +1,58 @@
+import time
+from types import SimpleNamespace
+from typing import Callable, Iterator
+
+from ai.conversation import estimate_tokens
+
+# Offline stand-in for the Groq client, mirrors the parts of
+# client.chat.completions.create(...) that ai/ultron.py uses (streamed and non-streamed)
+
+class FakeCompletions:
+    def __init__(self, client: "FakeGroqClient") -> None:
+        self.client = client
+
+    def create(self, model: str, messages: list[dict], temperature: float = 1.0, stream: bool = False, **kwargs) -> object:
+        self.client.calls.append({ "model": model, "messages": messages, "temperature": temperature, "stream": stream })
+        response = self.client.respond(messages[-1]["content"])
+        tokens = self.client.tokenize(response)
+        usage = SimpleNamespace(
+            prompt_tokens=sum(estimate_tokens(message["content"]) for message in messages),
+            completion_tokens=len(tokens)
+        )
+        # Prefill grows with the prompt, so longer system prompts and history delay the first token
+        first_token_latency = self.client.first_token_latency + self.client.prompt_token_latency * usage.prompt_tokens
+
+        if stream:
+            return self._stream(tokens, usage, first_token_latency)
+
+        time.sleep(first_token_latency + self.client.token_latency * len(tokens))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=response))], usage=usage)
+
+    def _stream(self, tokens: list[str], usage: object, first_token_latency: float) -> Iterator[object]:
+        time.sleep(first_token_latency)
+        for token in tokens:
+            time.sleep(self.client.token_latency)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+        # Like Groq, usage arrives on a final empty chunk
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=None))], x_groq=SimpleNamespace(usage=usage))
+
+class FakeGroqClient:
+    def __init__(
+        self,
+        respond: Callable[[str], str] | str,
+        first_token_latency: float = 0.0,
+        token_latency: float = 0.0,
+        token_size: int = 4,
+        prompt_token_latency: float = 0.0
+    ) -> None:
+        self.respond = respond if callable(respond) else (lambda _message: respond)
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.token_size = token_size
+        self.prompt_token_latency = prompt_token_latency
+        self.calls: list[dict] = []
+        self.chat = SimpleNamespace(completions=FakeCompletions(self))
+
+    def tokenize(self, response: str) -> list[str]:
+        # Roughly LLM-sized pieces, small enough that delimiters and commands straddle chunk boundaries
+        return [response[i:i + self.token_size] for i in range(0, len(response), self.token_size)]
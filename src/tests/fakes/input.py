@@ -0,0 +1,43 @@
+import time
+
+from game.input_backend import send_events
+from game.timeline import InputEvent, KEY_DOWN, KEY_UP, MOUSE_DOWN, MOUSE_UP
+
+class RecordingBackend:
+    # Offline stand-in: records every call with a perf_counter timestamp instead of touching real input
+    name = "recording"
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[float, str, tuple]] = []
+        self.cursor = (0, 0)
+
+    def _record(self, op: str, *args: object) -> None:
+        self.calls.append((time.perf_counter(), op, args))
+
+    def send(self, events: list[InputEvent]) -> None:
+        send_events(self, events)
+
+    def key_down(self, key: str) -> None:
+        self._record(KEY_DOWN, key)
+
+    def key_up(self, key: str) -> None:
+        self._record(KEY_UP, key)
+
+    def mouse_down(self, button: str) -> None:
+        self._record(MOUSE_DOWN, button)
+
+    def mouse_up(self, button: str) -> None:
+        self._record(MOUSE_UP, button)
+
+    def click(self, button: str, count: int = 1) -> None:
+        self._record("click", button, count)
+
+    def move_to(self, x: int, y: int) -> None:
+        self.cursor = (x, y)
+        self._record("move_to", x, y)
+
+    def scroll(self, clicks: int) -> None:
+        self._record("scroll", clicks)
+
+    def position(self) -> tuple[int, int]:
+        return self.cursor
@@ -0,0 +1,152 @@
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+from ai.conversation import estimate_tokens
+
+Latency = float | Callable[[], float]  # Seconds, or drawn per request for tail behaviour
+
+class FakeLlmServer:
+    # Minimal OpenAI-compatible chat completions endpoint (the API the Groq SDK talks to) for benchmarks. Point
+    # the client at it with base_url / AI_BASE_URL. Each model gets an injectable time to first token, replies
+    # stream in token-sized SSE chunks with usage on the last one, and models in `failing` answer with a 500.
+    def __init__(
+        self,
+        respond: Callable[[str], str] | str,
+        latency: dict[str, Latency] | None = None,
+        default_latency: Latency = 0.0,
+        token_latency: float = 0.0,
+        token_size: int = 4,
+        failing: set[str] | None = None,
+        port: int = 0
+    ) -> None:
+        self.respond = respond if callable(respond) else (lambda _message: respond)
+        self.latency = latency or {}
+        self.default_latency = default_latency
+        self.token_latency = token_latency
+        self.token_size = token_size
+        self.failing = failing or set()
+        self.host = "127.0.0.1"
+        self.port = port
+        self.received: list[tuple[str, bool]] = []  # (model, stream) in arrival order
+        self.connections = 0  # TCP connections accepted, stays low when the client keeps them alive
+        self.cancelled = 0  # Streams the client closed before the end (seen when a later write fails)
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.server: ThreadingHTTPServer | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "FakeLlmServer":
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive
+
+            def setup(self) -> None:
+                super().setup()
+                with server.lock:
+                    server.connections += 1
+
+            def handle(self) -> None:
+                try:
+                    super().handle()
+                except ConnectionError:
+                    pass  # Client closed a kept-alive or cancelled connection
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                # models.list(), used by the client to open its connection at startup
+                self._send_json(200, { "object": "list", "data": [{ "id": model, "object": "model" } for model in server.latency] })
+
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                server.handle(self, body)
+
+            def _send_json(self, status: int, payload: dict) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def handle(self, handler: BaseHTTPRequestHandler, body: dict) -> None:
+        model = body.get("model", "")
+        stream = bool(body.get("stream"))
+        with self.lock:
+            self.received.append((model, stream))
+
+        latency = self.latency.get(model, self.default_latency)
+        time.sleep(latency() if callable(latency) else latency)
+        if model in self.failing:
+            handler._send_json(500, { "error": { "message": f"{model} is unavailable", "type": "internal_server_error" } })
+            return
+
+        messages = body.get("messages", [])
+        reply = self.respond(messages[-1]["content"] if messages else "")
+        tokens = [reply[i:i + self.token_size] for i in range(0, len(reply), self.token_size)]
+        usage = {
+            "prompt_tokens": sum(estimate_tokens(message.get("content", "")) for message in messages),
+            "completion_tokens": len(tokens),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        completion_id = f"chatcmpl-{next(self.ids)}"
+
+        if not stream:
+            time.sleep(self.token_latency * len(tokens))
+            handler._send_json(200, {
+                "id": completion_id, "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{ "index": 0, "message": { "role": "assistant", "content": reply }, "finish_reason": "stop" }],
+                "usage": usage,
+            })
+            return
+
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+
+        def chunk(delta: dict, finish_reason: str | None = None, **extra: object) -> dict:
+            return {
+                "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                "choices": [{ "index": 0, "delta": delta, "finish_reason": finish_reason }], **extra,
+            }
+
+        events = [chunk({ "role": "assistant", "content": token }) for token in tokens]
+        events.append(chunk({}, "stop", x_groq={ "id": completion_id, "usage": usage }))
+        try:
+            for i, event in enumerate(events):
+                if i:
+                    time.sleep(self.token_latency)
+                self._write_chunk(handler, f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            self._write_chunk(handler, b"data: [DONE]\n\n")
+            self._write_chunk(handler, b"")
+        except (BrokenPipeError, ConnectionResetError):
+            with self.lock:
+                self.cancelled += 1
+            handler.close_connection = True
+
+    @staticmethod
+    def _write_chunk(handler: BaseHTTPRequestHandler, data: bytes) -> None:
+        handler.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        handler.wfile.flush()
\ No newline at end of file
@@ -0,0 +1,163 @@
+import base64
+import hashlib
+import json
+import socket
+import struct
+import threading
+import time
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+class FakeObsServer:
+    # Minimal obs-websocket v5 server (no auth) for tests and benchmarks. Answers requests (op 6) and
+    # request batches (op 8) after an injectable latency; request types in `failing` return an error status.
+    def __init__(self, port: int = 0, latency: float = 0.0, failing: set[str] | None = None) -> None:
+        self.host = "127.0.0.1"
+        self.port = port
+        self.latency = latency
+        self.failing = failing or set()
+        self.received: list[str] = []  # Request types in arrival order, batches as "RequestBatch"
+        self.listener: socket.socket | None = None
+        self.connections: list[socket.socket] = []
+        self.lock = threading.Lock()
+
+    def start(self) -> "FakeObsServer":
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind((self.host, self.port))
+        self.port = self.listener.getsockname()[1]  # Kept, so a restart comes back on the same port
+        self.listener.listen()
+        threading.Thread(target=self._accept_loop, args=(self.listener,), daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        # Simulates OBS quitting: drops the listener and every open connection
+        if self.listener is not None:
+            try:
+                self.listener.shutdown(socket.SHUT_RDWR)  # Wakes the blocked accept()
+            except OSError:
+                pass
+            self.listener.close()
+            self.listener = None
+        with self.lock:
+            for connection in self.connections:
+                try:
+                    connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+                connection.close()
+            self.connections.clear()
+
+    def _accept_loop(self, listener: socket.socket) -> None:
+        while True:
+            try:
+                connection, _ = listener.accept()
+            except OSError:
+                return
+            with self.lock:
+                self.connections.append(connection)
+            threading.Thread(target=self._serve, args=(connection,), daemon=True).start()
+
+    def _handshake(self, connection: socket.socket) -> None:
+        request = b""
+        while b"\r\n\r\n" not in request:
+            chunk = connection.recv(4096)
+            if not chunk:
+                raise ConnectionError("Closed during handshake")
+            request += chunk
+
+        headers = {}
+        for line in request.decode("latin-1").split("\r\n")[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        accept = base64.b64encode(hashlib.sha1((headers["sec-websocket-key"] + WS_GUID).encode()).digest()).decode()
+        connection.sendall(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+            ).encode()
+        )
+
+    def _recv_exact(self, connection: socket.socket, size: int) -> bytes:
+        data = b""
+        while len(data) < size:
+            chunk = connection.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Connection closed")
+            data += chunk
+        return data
+
+    def _recv_frame(self, connection: socket.socket) -> tuple[int, bytes]:
+        first, second = self._recv_exact(connection, 2)
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", self._recv_exact(connection, 2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", self._recv_exact(connection, 8))[0]
+        mask = self._recv_exact(connection, 4) if second & 0x80 else b"\0\0\0\0"
+        payload = self._recv_exact(connection, length)
+        return first & 0x0F, bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+
+    def _send_frame(self, connection: socket.socket, payload: bytes, opcode: int = 0x1) -> None:
+        header = bytes([0x80 | opcode])
+        if len(payload) < 126:
+            header += bytes([len(payload)])
+        elif len(payload) < 1 << 16:
+            header += bytes([126]) + struct.pack("!H", len(payload))
+        else:
+            header += bytes([127]) + struct.pack("!Q", len(payload))
+        connection.sendall(header + payload)
+
+    def _send(self, connection: socket.socket, message: dict) -> None:
+        self._send_frame(connection, json.dumps(message).encode())
+
+    def _result(self, request: dict) -> dict:
+        request_type = request["requestType"]
+        ok = request_type not in self.failing
+        result = {
+            "requestType": request_type,
+            "requestStatus": { "result": ok, "code": 100 if ok else 501, **({} if ok else { "comment": "Fake failure" }) },
+        }
+        if ok and request_type == "GetVersion":
+            result["responseData"] = { "obsVersion": "fake", "obsWebSocketVersion": "5.0.0", "rpcVersion": 1 }
+        return result
+
+    def _serve(self, connection: socket.socket) -> None:
+        try:
+            self._handshake(connection)
+            self._send(connection, { "op": 0, "d": { "obsWebSocketVersion": "5.0.0", "rpcVersion": 1 } })
+
+            while True:
+                opcode, payload = self._recv_frame(connection)
+                if opcode == 0x8:  # Close
+                    return
+                if opcode == 0x9:  # Ping
+                    self._send_frame(connection, payload, 0xA)
+                    continue
+
+                message = json.loads(payload)
+                op, data = message["op"], message["d"]
+                if op == 1:
+                    self._send(connection, { "op": 2, "d": { "negotiatedRpcVersion": 1 } })
+                elif op == 6:
+                    self.received.append(data["requestType"])
+                    time.sleep(self.latency)
+                    self._send(connection, { "op": 7, "d": { **self._result(data), "requestId": data["requestId"] } })
+                elif op == 8:
+                    self.received.append("RequestBatch")
+                    time.sleep(self.latency)
+                    results = []
+                    for request in data["requests"]:
+                        results.append(self._result(request))
+                        if data.get("haltOnFailure") and not results[-1]["requestStatus"]["result"]:
+                            break
+                    self._send(connection, { "op": 9, "d": { "requestId": data["requestId"], "results": results } })
+        except (ConnectionError, OSError, ValueError, KeyError):
+            pass
+        finally:
+            with self.lock:
+                if connection in self.connections:
+                    self.connections.remove(connection)
+            connection.close()
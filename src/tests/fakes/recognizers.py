@@ -0,0 +1,71 @@
+import time
+
+import speech_recognition as sr
+
+class ScriptedStream:
+    def __init__(self, recognizer: "ScriptedRecognizer") -> None:
+        self.recognizer = recognizer
+        self.chunks_received = 0
+        self.finished = False
+
+    def accept_chunk(self, chunk: bytes) -> str:
+        if self.recognizer.chunk_latency:
+            time.sleep(self.recognizer.chunk_latency)
+        self.chunks_received += 1
+
+        partials = self.recognizer.partials
+        if not partials:
+            return ""
+        return partials[min(self.chunks_received, len(partials)) - 1]
+
+    def finish(self) -> str:
+        if self.recognizer.finish_latency:
+            time.sleep(self.recognizer.finish_latency)
+        self.finished = True
+        return self.recognizer.final
+
+class ScriptedRecognizer:
+    # Offline stand-in: replays scripted partials chunk by chunk, then the final transcript
+    name = "scripted"
+    supports_streaming = True
+
+    def __init__(self, partials: list[str], final: str, chunk_latency: float = 0.0, finish_latency: float = 0.0) -> None:
+        self.partials = partials
+        self.final = final
+        self.chunk_latency = chunk_latency
+        self.finish_latency = finish_latency
+        self.streams: list[ScriptedStream] = []  # One per utterance, in press order
+
+    def warm_up(self) -> None:
+        pass
+
+    def recognize(self, audio_data: bytes) -> str:
+        if not self.final:
+            raise sr.UnknownValueError()
+        return self.final
+
+    def start(self) -> ScriptedStream:
+        stream = ScriptedStream(self)
+        self.streams.append(stream)
+        return stream
+
+class EchoRecognizer:
+    # Offline stand-in for a non-streaming backend: the "audio" is the UTF-8 transcript itself, returned after a fixed latency
+    name = "echo"
+    supports_streaming = False
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.calls = 0
+
+    def warm_up(self) -> None:
+        pass
+
+    def recognize(self, audio_data: bytes) -> str:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        text = audio_data.decode("utf-8", errors="ignore").strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
@@ -0,0 +1,21 @@
+import time
+
+class ScriptedSpotter:
+    # Offline stand-in: fires on the given (0-based) chunks it is fed, optionally burning CPU per chunk like a decoder
+    name = "scripted"
+
+    def __init__(self, fire_on: set[int] | None = None, cost_s: float = 0.0) -> None:
+        self.fire_on = fire_on or set()
+        self.cost_s = cost_s
+        self.chunks = 0
+
+    def accept(self, chunk: bytes) -> bool:
+        if self.cost_s:
+            end = time.thread_time() + self.cost_s
+            while time.thread_time() < end:
+                pass
+        self.chunks += 1
+        return self.chunks - 1 in self.fire_on
+
+    def reset(self) -> None:
+        pass
@@ -0,0 +1,29 @@
+from utils.rivals_window import Rect
+
+class FakeWindowSystem:
+    # Offline stand-in for tests and benchmarks, counts the calls the tracker is meant to avoid
+    def __init__(self, windows: dict[int, tuple[str, Rect]] | None = None, foreground: int = 0) -> None:
+        self.windows = windows or {}
+        self.foreground = foreground
+        self.enum_calls = 0
+        self.rect_calls = 0
+
+    def enum_windows(self) -> list[tuple[int, str]]:
+        self.enum_calls += 1
+        return [(hwnd, title) for hwnd, (title, _) in self.windows.items()]
+
+    def is_window(self, hwnd: int) -> bool:
+        return hwnd in self.windows
+
+    def window_text(self, hwnd: int) -> str:
+        return self.windows[hwnd][0] if hwnd in self.windows else ""
+
+    def foreground_window(self) -> int:
+        return self.foreground
+
+    def set_foreground_window(self, hwnd: int) -> None:
+        self.foreground = hwnd
+
+    def client_rect(self, hwnd: int) -> Rect:
+        self.rect_calls += 1
+        return self.windows[hwnd][1]
@@ -0,0 +1,18 @@
+from commands.command_parser import processs_command_string
+from core.state import State
+from game.combat_timelines import RIGHT_CLICK_HOLD, RIGHT_CLICK_INTERVAL
+from game.timeline import MOUSE_DOWN, MOUSE_UP
+from tests.fakes.input import RecordingBackend
+
+def test_repeated_right_clicks_are_held_and_spaced_apart() -> None:
+    state = State()
+    state.input = RecordingBackend()
+    state.scheduler.start()
+    processs_command_string(state, "rmb; rmb;")
+    assert state.scheduler.join(5)
+
+    calls = state.input.calls
+    assert [(op, args) for _, op, args in calls] == [(MOUSE_DOWN, ("right",)), (MOUSE_UP, ("right",))] * 2
+    times = [at for at, _, _ in calls]
+    assert times[1] - times[0] >= RIGHT_CLICK_HOLD
+    assert times[2] - times[0] >= RIGHT_CLICK_INTERVAL
@@ -0,0 +1,31 @@
+import pytest
+
+from commands.grammar import Command, CommandParseError, parse_command_chain
+
+def test_valid_chain() -> None:
+    assert parse_command_chain("press(e); delay(0.5); rmb;") == [
+        Command("press", ("e",)), Command("delay", (0.5,)), Command("rmb")
+    ]
+
+def test_one_bad_command_rejects_the_whole_chain() -> None:
+    with pytest.raises(CommandParseError) as error:
+        parse_command_chain("fly; bogus(1); melee(2);")
+    assert "bogus(1)" in str(error.value)
+
+@pytest.mark.parametrize("chain", ["fly; melee(two);", "press(banana);", "fire(3) fly;", "message(hi, maybe);"])
+def test_malformed_chains_are_rejected(chain: str) -> None:
+    with pytest.raises(CommandParseError):
+        parse_command_chain(chain)
+
+def test_numbers_are_clamped_to_the_spec_limits() -> None:
+    assert parse_command_chain("melee(50); fire(0); delay(20); delay(0); nano(-3);") == [
+        Command("melee", (10,)), Command("fire", (1,)), Command("delay", (10.0,)), Command("delay", (0.1,)), Command("nano", (1,))
+    ]
+
+def test_decimal_int_arguments_are_rounded() -> None:
+    assert parse_command_chain("nano(4.5); melee(2.7);") == [Command("nano", (4,)), Command("melee", (3,))]
+
+def test_message_text_may_contain_separators() -> None:
+    assert parse_command_chain("message(gg, all; wp), false); fly;") == [
+        Command("message", ("gg, all; wp)", False)), Command("fly")
+    ]
@@ -0,0 +1,53 @@
+import threading
+
+from ai.hedging import OUTCOME_DEADLINE, OUTCOME_FAILED, OUTCOME_HEDGE, OUTCOME_PRIMARY, Emit, race
+
+MODELS = ["primary", "hedge"]
+
+def answers(model: str, emit: Emit, cancelled: threading.Event) -> object:
+    emit(f"{model} reply")
+    return { "model": model }
+
+def stalls_primary(model: str, emit: Emit, cancelled: threading.Event) -> object:
+    if model == "primary":
+        cancelled.wait(5)
+        return None
+    return answers(model, emit, cancelled)
+
+def fails(model: str, emit: Emit, cancelled: threading.Event) -> object:
+    raise ConnectionError(f"{model} is down")
+
+def stalls(model: str, emit: Emit, cancelled: threading.Event) -> object:
+    cancelled.wait(5)
+    return None
+
+def test_primary_wins_without_hedging() -> None:
+    deltas = []
+    result = race(MODELS, answers, deltas.append, hedge_delay=1, deadline=2)
+    assert result.outcome == OUTCOME_PRIMARY and result.answered
+    assert result.model == "primary" and not result.hedged
+    assert deltas == ["primary reply"] and result.usage == { "model": "primary" }
+
+def test_hedge_wins_when_the_primary_stalls() -> None:
+    deltas = []
+    result = race(MODELS, stalls_primary, deltas.append, hedge_delay=0.05, deadline=2)
+    assert result.outcome == OUTCOME_HEDGE and result.hedged
+    assert result.model == "hedge" and deltas == ["hedge reply"]
+
+def test_both_failing_is_reported_with_the_error() -> None:
+    deltas = []
+    result = race(MODELS, fails, deltas.append, hedge_delay=1, deadline=2)
+    assert result.outcome == OUTCOME_FAILED and not result.answered
+    assert result.hedged  # Failed over to the hedge without waiting out the delay
+    assert isinstance(result.error, ConnectionError) and deltas == []
+
+def test_deadline_cancels_every_attempt() -> None:
+    cancels = []
+
+    def attempt(model: str, emit: Emit, cancelled: threading.Event) -> object:
+        cancels.append(cancelled)
+        return stalls(model, emit, cancelled)
+
+    result = race(MODELS, attempt, lambda _delta: None, hedge_delay=0.02, deadline=0.1)
+    assert result.outcome == OUTCOME_DEADLINE
+    assert len(cancels) == 2 and all(cancel.is_set() for cancel in cancels)
@@ -0,0 +1,21 @@
+import pytest
+
+from ai.intents import parse_intents
+
+@pytest.mark.parametrize("text, commands", [
+    ("wait half a second then firewall", "delay(0.5); rmb;"),
+    ("firewall then wait 2 seconds then fly", "rmb; delay(2); fly;"),
+    ("reload then drone", "press(r); delay(0.5); press(e);"),
+])
+def test_then_adds_one_delay_unless_a_wait_is_spoken(text: str, commands: str) -> None:
+    assert parse_intents(text)[1] == commands
+
+@pytest.mark.parametrize("text, commands", [
+    ("fire 2.5 times", "fire(2);"),  # round() like the grammar, ties to even
+    ("fire 2.6 times", "fire(3);"),
+    ("melee 3.7 times", "melee(4);"),
+    ("nano 9.4 seconds", "nano(8);"),
+    ("fire half times", "fire(1);"),
+])
+def test_counts_are_rounded_then_clamped_like_the_grammar(text: str, commands: str) -> None:
+    assert parse_intents(text)[1] == commands
@@ -0,0 +1,62 @@
+import time
+from typing import Callable
+
+import pytest
+from obsws_python import ReqClient
+
+import config
+from obs.connection import ObsConnection, ObsUnavailableError
+from tests.fakes.obs_server import FakeObsServer
+
+def wait_for(condition: Callable[[], bool], timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+@pytest.fixture
+def fast_reconnect(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config, "OBS_RECONNECT_MIN_S", 0.05)
+    monkeypatch.setattr(config, "OBS_RECONNECT_MAX_S", 0.2)
+    monkeypatch.setattr(config, "OBS_PING_INTERVAL_S", 0.05)
+
+def test_reconnects_after_obs_restarts(fast_reconnect: None) -> None:
+    server = FakeObsServer().start()
+    port = server.port
+    connection = ObsConnection(lambda: ReqClient(host="127.0.0.1", port=port, password="", timeout=1))
+    connection.start()
+    try:
+        assert wait_for(lambda: connection.connected)
+        connection.request("SaveReplayBuffer")
+        assert [result.ok for result in connection.batch([("StopReplayBuffer", None), ("StartRecord", None)])] == [True, True]
+
+        server.stop()
+        assert wait_for(lambda: not connection.connected)
+        with pytest.raises(ObsUnavailableError):
+            connection.request("SaveReplayBuffer")  # Fails fast while OBS is down
+
+        server = FakeObsServer(port=port).start()
+        assert wait_for(lambda: connection.connected)
+        connection.request("SaveReplayBuffer")
+        assert connection.connects == 2
+        assert server.received.count("SaveReplayBuffer") == 1
+    finally:
+        connection.stop()
+        server.stop()
+
+def test_start_does_not_wait_for_obs(fast_reconnect: None) -> None:
+    server = FakeObsServer().start()
+    port = server.port
+    server.stop()
+
+    connection = ObsConnection(lambda: ReqClient(host="127.0.0.1", port=port, password="", timeout=1))
+    start = time.perf_counter()
+    connection.start()
+    try:
+        assert time.perf_counter() - start < 0.1
+        with pytest.raises(ObsUnavailableError):
+            connection.batch([("SaveReplayBuffer", None)])
+    finally:
+        connection.stop()
@@ -0,0 +1,38 @@
+from ai.ultron import ResponseStreamParser
+
+def make_parser() -> tuple[ResponseStreamParser, list[str], list[str]]:
+    spoken: list[str] = []
+    commands: list[str] = []
+    return ResponseStreamParser(spoken.append, commands.append), spoken, commands
+
+def test_delimiter_split_across_chunks() -> None:
+    parser, spoken, commands = make_parser()
+    parser.feed("Engaging. [COM")
+    assert spoken == []
+    parser.feed("MAND] fly; mel")
+    assert spoken == ["Engaging."] and commands == ["fly"]
+    parser.feed("ee(2);")
+    parser.close()
+    assert spoken == ["Engaging."] and commands == ["fly", "melee(2)"]
+
+def test_semicolon_inside_message_stays_in_the_command() -> None:
+    parser, spoken, commands = make_parser()
+    for char in "Sent. [COMMAND] message(gg; wp, true); fly;":
+        parser.feed(char)
+    parser.close()
+    assert spoken == ["Sent."]
+    assert commands == ["message(gg; wp, true)", "fly"]
+
+def test_unterminated_last_command_is_dispatched_on_close() -> None:
+    parser, _, commands = make_parser()
+    parser.feed("Firing. [COMMAND] fire(3)")
+    assert commands == []
+    parser.close()
+    assert commands == ["fire(3)"]
+
+def test_reply_without_commands_is_all_spoken() -> None:
+    parser, spoken, commands = make_parser()
+    parser.feed("Insufficient ")
+    parser.feed("data.")
+    parser.close()
+    assert spoken == ["Insufficient data."] and commands == []
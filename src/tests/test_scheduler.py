@@ -0,0 +1,88 @@
+import threading
+import time
+
+from core.scheduler import LANE_CHAT, LANE_KEYBOARD, LANE_MOUSE, LANE_SYSTEM, Scheduler
+
+def make_scheduler() -> Scheduler:
+    scheduler = Scheduler()
+    scheduler.start()
+    return scheduler
+
+def test_chained_task_does_not_block_its_lane() -> None:
+    # "nano(8); clip;": the clip waits for the nano ray, other system work doesn't wait for either
+    scheduler = make_scheduler()
+    release = threading.Event()
+    ran = []
+    scheduler.begin_chain()
+    scheduler.submit(release.wait, (), LANE_MOUSE)
+    clip = scheduler.submit(ran.append, ("clip",), LANE_SYSTEM)
+    scheduler.end_chain()
+    other = scheduler.submit(ran.append, ("other",), LANE_SYSTEM)
+
+    assert other.done.wait(1)
+    assert ran == ["other"] and not clip.done.is_set()
+    release.set()
+    assert scheduler.join(1)
+    assert ran == ["other", "clip"]
+
+def test_flush_releases_parked_tasks_immediately() -> None:
+    scheduler = make_scheduler()
+    release = threading.Event()
+    ran = []
+    scheduler.begin_chain()
+    scheduler.submit(release.wait, (), LANE_SYSTEM)
+    parked = scheduler.submit(ran.append, ("fire",), LANE_MOUSE)
+    scheduler.end_chain()
+    time.sleep(0.01)
+
+    start = time.perf_counter()
+    assert scheduler.flush((LANE_KEYBOARD, LANE_MOUSE)) == 1
+    assert parked.done.wait(1) and parked.cancelled
+    assert time.perf_counter() - start < 0.5
+    assert scheduler.submit(ran.append, ("melee",), LANE_MOUSE).done.wait(1)
+    release.set()
+    assert scheduler.join(1)
+    assert ran == ["melee"]
+
+def test_each_lane_runs_in_submission_order() -> None:
+    scheduler = make_scheduler()
+    ran = []
+    for i in range(20):
+        scheduler.submit(ran.append, (i,), LANE_KEYBOARD)
+    assert scheduler.join(1)
+    assert ran == list(range(20))
+
+def test_chain_keeps_its_order_across_lanes() -> None:
+    scheduler = make_scheduler()
+    ran = []
+    scheduler.begin_chain()
+    scheduler.submit(lambda: (time.sleep(0.05), ran.append("mouse")), (), LANE_MOUSE)
+    scheduler.submit(ran.append, ("keyboard",), LANE_KEYBOARD)
+    delay = scheduler.submit(ran.append, ("delay",))  # Lane-less, follows the keyboard task
+    scheduler.submit(ran.append, ("system",), LANE_SYSTEM)
+    scheduler.end_chain()
+    assert scheduler.join(1)
+    assert ran == ["mouse", "keyboard", "delay", "system"]
+    assert delay.lane == LANE_KEYBOARD
+
+def test_flush_drops_queued_tasks_and_the_rest_of_their_chain() -> None:
+    scheduler = make_scheduler()
+    release = threading.Event()
+    ran = []
+    running = scheduler.submit(release.wait, (), LANE_MOUSE)
+    queued = scheduler.submit(ran.append, ("queued",), LANE_MOUSE)
+    scheduler.begin_chain()
+    chained = scheduler.submit(ran.append, ("fire",), LANE_MOUSE)
+    follow_up = scheduler.submit(ran.append, ("clip",), LANE_SYSTEM)
+    scheduler.end_chain()
+    kept = scheduler.submit(ran.append, ("chat",), LANE_CHAT)
+
+    while running.started_at is None:
+        time.sleep(0.001)
+
+    assert scheduler.flush() == 3  # The running task is stopped as well; the system lane isn't flushed
+    assert running.stop.is_set()
+    release.set()
+    assert scheduler.join(1)
+    assert ran == ["chat"]
+    assert queued.cancelled and chained.cancelled and follow_up.cancelled and not kept.cancelled
@@ -0,0 +1,22 @@
+from commands.command_parser import processs_command_string
+from core.state import State
+from game.timeline import KEY_EVENTS
+from tests.fakes.input import RecordingBackend
+
+def make_state() -> State:
+    state = State()
+    state.input = RecordingBackend()
+    state.scheduler.start()
+    return state
+
+def test_cancel_drops_combat_queued_earlier_in_the_chain() -> None:
+    state = make_state()
+    processs_command_string(state, "fire(3); cancel;")
+    assert state.scheduler.join(5)
+    assert state.input.calls == []
+
+def test_commands_after_cancel_still_run() -> None:
+    state = make_state()
+    processs_command_string(state, "fire(3); cancel; fly;")
+    assert state.scheduler.join(5)
+    assert [op for _, op, _ in state.input.calls] and all(op in KEY_EVENTS for _, op, _ in state.input.calls)
@@ -0,0 +1,52 @@
+import pytest
+
+import config
+from tests.fakes.window import FakeWindowSystem
+from utils.rivals_window import WindowTracker
+
+GAME = 100
+RECT = (0, 0, 1920, 1080)
+
+def make_tracker() -> tuple[WindowTracker, FakeWindowSystem]:
+    system = FakeWindowSystem({ 1: ("Discord", (0, 0, 800, 600)), GAME: ("Marvel Rivals", RECT) }, foreground=GAME)
+    return WindowTracker(system), system
+
+def test_window_is_found_once_and_remembered() -> None:
+    tracker, system = make_tracker()
+    for _ in range(50):
+        assert tracker.find() == GAME
+    assert system.enum_calls == 1
+    assert tracker.is_active()
+
+def test_client_rect_is_cached() -> None:
+    tracker, system = make_tracker()
+    for _ in range(50):
+        assert tracker.client_rect() == RECT
+    assert system.rect_calls == 1
+
+def test_missing_game_is_not_searched_for_on_every_call() -> None:
+    tracker, system = make_tracker()
+    del system.windows[GAME]
+    for _ in range(50):
+        assert tracker.find() is None
+    assert system.enum_calls == 1
+
+def test_closed_window_is_found_again_under_a_new_handle(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config, "WINDOW_ENUM_RETRY_S", 0)
+    tracker, system = make_tracker()
+    assert tracker.find() == GAME
+
+    # The old handle is reused by another window, the game comes back as a new one
+    system.windows[GAME] = ("Notepad", (0, 0, 10, 10))
+    system.windows[200] = ("Marvel Rivals", RECT)
+    assert tracker.find() == 200
+    assert tracker.focus() == 200 and system.foreground == 200
+
+def test_invalidate_allows_an_immediate_search() -> None:
+    tracker, system = make_tracker()
+    del system.windows[GAME]
+    assert tracker.find() is None
+    system.windows[GAME] = ("Marvel Rivals", RECT)
+    assert tracker.find() is None  # Still inside the retry interval
+    tracker.invalidate()
+    assert tracker.find() == GAME
@@ -1,20 +1,113 @@
-import win32gui
-
-def find_rivals_window() -> int | None:
-    def callback(hwnd, windows) -> None:
-        if win32gui.IsWindowVisible(hwnd):
-            window_text = win32gui.GetWindowText(hwnd)
-            if "rivals" in window_text.lower():
-                windows.append((hwnd, window_text))
-
-    windows = []
-    win32gui.EnumWindows(callback, windows)
-    return windows[0][0] if windows else None
-
-def is_rivals_window_active() -> bool:
-    hwnd = find_rivals_window()
-    if not hwnd:
-        return False
-    
-    forground_hwnd = win32gui.GetForegroundWindow()
-    return hwnd == forground_hwnd
\ No newline at end of file
+import time
+from typing import Protocol
+
+import config
+
+Rect = tuple[int, int, int, int]  # left, top, right, bottom in screen coordinates
+
+class WindowSystem(Protocol):
+    def enum_windows(self) -> list[tuple[int, str]]: ...  # Visible top-level windows as (hwnd, title)
+    def is_window(self, hwnd: int) -> bool: ...
+    def window_text(self, hwnd: int) -> str: ...
+    def foreground_window(self) -> int: ...
+    def set_foreground_window(self, hwnd: int) -> None: ...
+    def client_rect(self, hwnd: int) -> Rect: ...
+
+class Win32WindowSystem:
+    def __init__(self) -> None:
+        import win32gui
+
+        self.win32gui = win32gui
+
+    def enum_windows(self) -> list[tuple[int, str]]:
+        def callback(hwnd, windows) -> None:
+            if self.win32gui.IsWindowVisible(hwnd):
+                windows.append((hwnd, self.win32gui.GetWindowText(hwnd)))
+
+        windows = []
+        self.win32gui.EnumWindows(callback, windows)
+        return windows
+
+    def is_window(self, hwnd: int) -> bool:
+        return bool(self.win32gui.IsWindow(hwnd))
+
+    def window_text(self, hwnd: int) -> str:
+        return self.win32gui.GetWindowText(hwnd)
+
+    def foreground_window(self) -> int:
+        return self.win32gui.GetForegroundWindow()
+
+    def set_foreground_window(self, hwnd: int) -> None:
+        self.win32gui.SetForegroundWindow(hwnd)
+
+    def client_rect(self, hwnd: int) -> Rect:
+        _, _, width, height = self.win32gui.GetClientRect(hwnd)
+        left, top = self.win32gui.ClientToScreen(hwnd, (0, 0))
+        return left, top, left + width, top + height
+
+class WindowTracker:
+    # Remembers the game window between calls and only walks every top-level window when the handle goes stale
+    def __init__(self, system: WindowSystem, title_match: str = "rivals") -> None:
+        self.system = system
+        self.title_match = title_match
+        self.hwnd: int | None = None
+        self.rect: Rect | None = None
+        self.rect_checked_at = 0.0
+        self.last_enum = float("-inf")
+        self.enumerations = 0
+        self.lookups = 0
+
+    def _matches(self, title: str) -> bool:
+        return self.title_match in title.lower()
+
+    def _valid(self, hwnd: int) -> bool:
+        # HWNDs are reused after a window closes, so the title is checked as well
+        return self.system.is_window(hwnd) and self._matches(self.system.window_text(hwnd))
+
+    def find(self) -> int | None:
+        self.lookups += 1
+        if self.hwnd is not None and self._valid(self.hwnd):
+            return self.hwnd
+
+        self.hwnd = None
+        self.rect = None
+        now = time.monotonic()
+        if now - self.last_enum < config.WINDOW_ENUM_RETRY_S:
+            return None  # Game isn't running, don't walk every window on every tick
+        self.last_enum = now
+        self.enumerations += 1
+
+        for hwnd, title in self.system.enum_windows():
+            if self._matches(title):
+                self.hwnd = hwnd
+                break
+        return self.hwnd
+
+    def is_active(self) -> bool:
+        hwnd = self.find()
+        return hwnd is not None and self.system.foreground_window() == hwnd
+
+    def focus(self) -> int | None:
+        hwnd = self.find()
+        if hwnd is not None:
+            self.system.set_foreground_window(hwnd)
+        return hwnd
+
+    def client_rect(self) -> Rect | None:
+        hwnd = self.find()
+        if hwnd is None:
+            return None
+
+        now = time.monotonic()
+        if self.rect is None or now - self.rect_checked_at > config.WINDOW_RECT_REFRESH_S:
+            self.rect = self.system.client_rect(hwnd)
+            self.rect_checked_at = now
+        return self.rect
+
+    def invalidate(self) -> None:
+        self.hwnd = None
+        self.rect = None
+        self.last_enum = float("-inf")  # Allow an immediate re-enumeration
+
+    def summary(self) -> str:
+        return f"{self.lookups} lookups, {self.enumerations} window enumerations"
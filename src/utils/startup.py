@@ -0,0 +1,62 @@
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+@dataclass
+class StartupPhase:
+    name: str
+    thread: str
+    start: float  # Seconds since the profile started
+    duration: float
+
+class StartupProfile:
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.phases: list[StartupPhase] = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self.lock:
+                self.phases.append(StartupPhase(name, threading.current_thread().name, start - self.started_at, end - start))
+
+    def mark(self, name: str) -> None:
+        # Zero-length phase for milestones like "greeting queued"
+        with self.lock:
+            self.phases.append(StartupPhase(name, threading.current_thread().name, time.perf_counter() - self.started_at, 0.0))
+
+    def run_parallel(self, steps: dict[str, Callable[[], None]]) -> None:
+        # Each step gets its own thread, a failing step is reported and doesn't stop the others
+        def run(name: str, step: Callable[[], None]) -> None:
+            try:
+                with self.phase(name):
+                    step()
+            except Exception as e:
+                print(f"[ERROR]: Startup step '{name}' failed: {e}", file=sys.stderr)
+
+        threads = [
+            threading.Thread(target=run, args=(name, step), name=f"startup-{name}", daemon=True)
+            for name, step in steps.items()
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def report(self) -> str:
+        total = time.perf_counter() - self.started_at
+        with self.lock:
+            phases = sorted(self.phases, key=lambda phase: phase.start)
+        lines = [
+            f"  {phase.name:<22} +{phase.start * 1000:7.1f} ms  {phase.duration * 1000:7.1f} ms  [{phase.thread}]"
+            for phase in phases
+        ]
+        return "\n".join([*lines, f"  {'total':<22} {total * 1000:8.1f} ms"])